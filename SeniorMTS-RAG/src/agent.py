@@ -30,5 +30,6 @@ def setup_agent(llm, tools, prompt):
     에이전트와 실행기 생성
     """
     agent = create_tool_calling_agent(llm, tools, prompt)
-    agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=False)
+    # 답변 캐시가 사용된 도구를 알 수 있도록 중간 단계도 반환
+    agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=False, return_intermediate_steps=True)
     return agent_executor
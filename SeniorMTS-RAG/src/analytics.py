@@ -0,0 +1,215 @@
+import os
+
+import numpy as np
+
+
+def _spoken_date(date):
+    date = str(date)
+    return f"{int(date[4:6])}월 {int(date[6:8])}일"
+
+
+def summarize_prices(prices, ma_windows=(5, 20)):
+    """
+    일봉 구조화 배열에서 기간 수익률, 이동평균, 최고/최저가, 변동성, 거래량 변화를 계산합니다.
+    :param prices: (np.ndarray) date, high, low, close, volume 컬럼을 가진 구조화 배열 (날짜 오름차순)
+    :param ma_windows: (tuple) 계산할 이동평균 기간
+    :return: (dict) 계산 결과 (데이터가 없으면 None)
+    """
+    if len(prices) == 0:
+        return None
+
+    dates = prices["date"]
+    close = prices["close"].astype(np.float64)
+    volume = prices["volume"].astype(np.float64)
+
+    result = {
+        "start_date": int(dates[0]),
+        "end_date": int(dates[-1]),
+        "start_close": close[0],
+        "end_close": close[-1],
+        "period_return": close[-1] / close[0] - 1,
+        "high": float(prices["high"].max()),
+        "high_date": int(dates[prices["high"].argmax()]),
+        "low": float(prices["low"].min()),
+        "low_date": int(dates[prices["low"].argmin()]),
+        "moving_averages": {
+            window: float(close[-window:].mean()) for window in ma_windows if len(close) >= window
+        },
+        "daily_volatility": None,
+        "annual_volatility": None,
+        "volume_change": None,
+    }
+
+    if len(close) >= 3:
+        daily_returns = np.diff(close) / close[:-1]
+        result["daily_volatility"] = float(daily_returns.std(ddof=1))
+        result["annual_volatility"] = result["daily_volatility"] * np.sqrt(252)
+
+    # 최근 5거래일 평균 거래량과 그 이전 기간 평균 비교
+    if len(volume) >= 10:
+        recent, earlier = volume[-5:].mean(), volume[:-5].mean()
+        if earlier > 0:
+            result["volume_change"] = recent / earlier - 1
+
+    return result
+
+
+def describe_prices(name, prices):
+    """
+    summarize_prices 결과를 음성 응답에 바로 쓸 수 있는 짧은 문장으로 만듭니다.
+    """
+    summary = summarize_prices(prices)
+    if summary is None:
+        return f"{name}의 해당 기간 주가 정보가 없습니다."
+
+    change = summary["period_return"] * 100
+    if change == 0:
+        movement = "변동이 없었습니다"
+    else:
+        movement = f"{abs(change):.1f}% {'상승' if change > 0 else '하락'}했습니다"
+    sentences = [
+        f"{name}의 주가는 {_spoken_date(summary['start_date'])}부터 {_spoken_date(summary['end_date'])}까지 "
+        f"종가 기준 {summary['start_close']:,.0f}원에서 {summary['end_close']:,.0f}원으로 {movement}.",
+        f"기간 최고가는 {_spoken_date(summary['high_date'])} {summary['high']:,.0f}원, "
+        f"최저가는 {_spoken_date(summary['low_date'])} {summary['low']:,.0f}원입니다.",
+    ]
+    if summary["moving_averages"]:
+        averages = ", ".join(
+            f"{window}일 이동평균 {value:,.0f}원" for window, value in summary["moving_averages"].items()
+        )
+        sentences.append(f"{averages}입니다.")
+    if summary["daily_volatility"] is not None:
+        sentences.append(
+            f"일간 변동성은 {summary['daily_volatility'] * 100:.1f}%, "
+            f"연환산 변동성은 {summary['annual_volatility'] * 100:.0f}%입니다."
+        )
+    if summary["volume_change"] is not None:
+        more_or_less = "많습니다" if summary["volume_change"] >= 0 else "적습니다"
+        sentences.append(
+            f"최근 5거래일 평균 거래량은 그 이전보다 {abs(summary['volume_change']) * 100:.0f}% {more_or_less}."
+        )
+    return " ".join(sentences)
+
+
+# 주봉/월봉 요약과 응답 길이 제한에 쓰는 설정
+PRICE_COLUMNS = {
+    "date": "날짜",
+    "open": "시가",
+    "high": "고가",
+    "low": "저가",
+    "close": "종가",
+    "volume": "거래량",
+    "foreign_ratio": "외국인소진율",
+}
+COLUMN_ALIASES = {
+    "시가": "open", "고가": "high", "저가": "low", "종가": "close", "가격": "close", "price": "close",
+    "거래량": "volume", "외국인": "foreign_ratio", "외국인소진율": "foreign_ratio",
+}
+DEFAULT_COLUMNS = ("close", "volume")
+PERIOD_ORDER = ("day", "week", "month")
+PERIOD_NAMES = {"day": "일봉", "week": "주봉", "month": "월봉"}
+
+
+def _period_keys(dates, period):
+    """
+    YYYYMMDD 정수 날짜를 주(월요일 기준) 또는 월 단위 그룹 키로 변환합니다.
+    """
+    if period == "month":
+        return dates // 100
+    years, months, days = dates // 10000, dates // 100 % 100, dates % 100
+    epoch_days = (
+        (years - 1970).astype("datetime64[Y]").astype("datetime64[M]")
+        + (months - 1).astype("timedelta64[M]")
+    ).astype("datetime64[D]") + (days - 1).astype("timedelta64[D]")
+    # 1970-01-01 은 목요일이므로 3일을 더해 월요일 시작 주 번호로 맞춤
+    return (epoch_days.astype(np.int64) + 3) // 7
+
+
+def resample_prices(prices, period):
+    """
+    일봉 구조화 배열을 주봉 또는 월봉으로 집계합니다.
+    시가는 첫 거래일, 종가/외국인소진율/날짜는 마지막 거래일, 고가는 최대, 저가는 최소, 거래량은 합계입니다.
+    :param prices: (np.ndarray) PRICE_DTYPE 구조화 배열 (날짜 오름차순)
+    :param period: (str) 'week' 또는 'month'
+    :return: (np.ndarray) 같은 dtype 의 집계 배열
+    """
+    if len(prices) == 0:
+        return prices
+
+    keys = _period_keys(prices["date"].astype(np.int64), period)
+    boundaries = np.flatnonzero(np.diff(keys)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(prices)])) - 1
+
+    result = np.empty(len(starts), dtype=prices.dtype)
+    result["date"] = prices["date"][ends]
+    result["open"] = prices["open"][starts]
+    result["high"] = np.maximum.reduceat(prices["high"], starts)
+    result["low"] = np.minimum.reduceat(prices["low"], starts)
+    result["close"] = prices["close"][ends]
+    result["volume"] = np.add.reduceat(prices["volume"], starts)
+    result["foreign_ratio"] = prices["foreign_ratio"][ends]
+    return result
+
+
+def parse_columns(columns):
+    """
+    'close,volume' 또는 '종가, 거래량' 형태의 컬럼 지정을 내부 컬럼 이름 목록으로 변환합니다.
+    알 수 없는 이름은 무시하고, 지정이 없으면 DEFAULT_COLUMNS 를 사용합니다.
+    """
+    if not columns:
+        return list(DEFAULT_COLUMNS)
+    if isinstance(columns, str):
+        columns = columns.split(",")
+    selected = []
+    for column in columns:
+        column = column.strip()
+        column = COLUMN_ALIASES.get(column, column.lower())
+        if column in PRICE_COLUMNS and column != "date" and column not in selected:
+            selected.append(column)
+    return selected or list(DEFAULT_COLUMNS)
+
+
+def format_price_table(prices, columns=None, max_rows=None, period="day"):
+    """
+    주가 배열을 에이전트에 넘길 간결한 표 문자열로 만듭니다.
+
+    1. 행 수가 max_rows 를 넘으면 일봉 -> 주봉 -> 월봉 순으로 자동 집계합니다.
+    2. 그래도 넘으면 가장 최근 max_rows 행만 남깁니다.
+    3. 질문에 필요한 컬럼만 출력합니다.
+    :param prices: (np.ndarray) PRICE_DTYPE 구조화 배열 (날짜 오름차순)
+    :param columns: (str | list) 출력할 컬럼 (기본값: 종가, 거래량)
+    :param max_rows: (int) 최대 출력 행 수 (기본값: PRICE_MAX_ROWS 환경 변수 또는 30)
+    :param period: (str) 입력 배열의 간격 ('day', 'week', 'month')
+    :return: (str) 표 문자열
+    """
+    max_rows = max_rows or int(os.getenv("PRICE_MAX_ROWS", "30"))
+    total, original_period = len(prices), period
+
+    # 1. 긴 기간은 주봉/월봉으로 집계
+    for coarser in ("week", "month"):
+        if len(prices) <= max_rows or PERIOD_ORDER.index(period) >= PERIOD_ORDER.index(coarser):
+            continue
+        prices = resample_prices(prices, coarser)
+        period = coarser
+
+    # 2. 행 수 상한 적용
+    truncated = len(prices) > max_rows
+    if truncated:
+        prices = prices[-max_rows:]
+
+    # 3. 필요한 컬럼만 출력
+    columns = parse_columns(columns)
+    title = f"# {PERIOD_NAMES[period]} 기준"
+    if period != original_period:
+        title += f" ({PERIOD_NAMES[original_period]} {total}개를 집계)"
+    if truncated:
+        title += f", 최근 {len(prices)}개만 표시"
+    lines = [title, ", ".join(PRICE_COLUMNS[column] for column in ["date"] + columns)]
+    for row in prices:
+        values = [str(row["date"])]
+        for column in columns:
+            value = row[column]
+            values.append(f"{float(value):.2f}" if column == "foreign_ratio" else str(int(value)))
+        lines.append(", ".join(values))
+    return "\n".join(lines)
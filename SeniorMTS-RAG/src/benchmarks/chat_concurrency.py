@@ -0,0 +1,162 @@
+"""
+/chat 동시성 벤치마크: LLM, 검색기, 네이버 시세를 지연 시간만 흉내 내는 대체 구현으로 바꾸고
+동시 세션 수에 따른 초당 처리 요청 수(requests/sec)를 측정합니다.
+
+- async: 에이전트가 LLM 은 await 로 기다리고, 블로킹 검색/시세 호출은 run_blocking 으로 스레드 풀에 넘김
+- blocking: 예전 경로처럼 이벤트 루프 안에서 동기 invoke (time.sleep) 로 기다림
+
+    cd SeniorMTS-RAG/src
+    python -m benchmarks.chat_concurrency --sessions 1 8 32 128 --turns 3
+"""
+import argparse
+import asyncio
+import importlib.util
+import time
+from pathlib import Path
+
+import httpx
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from benchmarks.common import print_table, summarize
+from utils import session
+from utils.concurrency import run_blocking
+from utils.history import HistoryManager
+from utils.session import InMemorySessionStore
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_app_module():
+    """
+    fastapi-app.py 는 파일 이름에 '-' 가 있어 import 문으로 불러올 수 없으므로 경로로 로드합니다.
+    """
+    spec = importlib.util.spec_from_file_location("fastapi_app", SRC_DIR / "fastapi-app.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StubAgent:
+    """
+    AgentExecutor 대체 구현: 검색기 1회, 시세 1회, LLM 1회 호출에 해당하는 지연만 발생시킵니다.
+    """
+
+    def __init__(self, llm_latency, retriever_latency, naver_latency, blocking):
+        self.llm_latency = llm_latency
+        self.retriever_latency = retriever_latency
+        self.naver_latency = naver_latency
+        self.blocking = blocking
+
+    async def ainvoke(self, inputs):
+        if self.blocking:
+            # 동기 invoke 와 같이 이벤트 루프를 그대로 막음
+            time.sleep(self.retriever_latency + self.naver_latency + self.llm_latency)
+        else:
+            await run_blocking(time.sleep, self.retriever_latency)
+            await run_blocking(time.sleep, self.naver_latency)
+            await asyncio.sleep(self.llm_latency)
+        return {"output": f"{inputs['input']}에 대한 답변입니다.", "intermediate_steps": []}
+
+
+class StubAnswerCache:
+    """
+    항상 적중하지 않는 답변 캐시 (에이전트 경로만 측정)
+    """
+
+    async def alookup(self, query, scope):
+        return None
+
+    async def astore(self, query, scope, answer, tools_used, elapsed):
+        pass
+
+
+class StubRouteStats:
+    def record(self, route, seconds):
+        pass
+
+
+class StubRouter:
+    """
+    모든 질문을 에이전트로 보내는 라우터
+    """
+
+    route_stats = StubRouteStats()
+
+    @staticmethod
+    def route_query(user_input):
+        return "agent", None, None
+
+
+def install_components(app_module, agent):
+    """
+    lifespan 초기화 대신 대체 구성 요소를 넣고 준비 완료 상태로 만듭니다.
+    """
+    summarizer = RunnableLambda(lambda _: AIMessage(content="이전 대화 요약"))
+    app_module.state.components = {
+        "tools": [],
+        "agent_executor": agent,
+        "history_manager": HistoryManager(summarizer),
+        "answer_cache": StubAnswerCache(),
+        "router": StubRouter,
+    }
+    app_module.state.ready = True
+
+
+async def run_load(app, sessions, turns):
+    """
+    sessions 개의 세션이 동시에 turns 턴씩 대화하고 (경과 시간, 요청별 지연 시간 목록)을 반환합니다.
+    """
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def conversation(i):
+            for turn in range(turns):
+                started = time.perf_counter()
+                response = await client.post("/chat", json={
+                    "session_id": f"bench-{i}",
+                    "user_input": f"삼성전자 전망 알려줘 ({turn})",
+                })
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(conversation(i) for i in range(sessions)))
+        return time.perf_counter() - started, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--retriever-latency", type=float, default=0.05)
+    parser.add_argument("--naver-latency", type=float, default=0.03)
+    args = parser.parse_args()
+
+    app_module = load_app_module()
+
+    rows = []
+    for mode in ("blocking", "async"):
+        agent = StubAgent(args.llm_latency, args.retriever_latency, args.naver_latency, blocking=mode == "blocking")
+        install_components(app_module, agent)
+        for sessions in args.sessions:
+            session.store = InMemorySessionStore(max_sessions=max(args.sessions))
+            elapsed, latencies = asyncio.run(run_load(app_module.app, sessions, args.turns))
+            stats = summarize(latencies)
+            rows.append({
+                "mode": mode,
+                "sessions": sessions,
+                "requests": len(latencies),
+                "elapsed_s": round(elapsed, 2),
+                "req_per_s": round(len(latencies) / elapsed, 1),
+                "p50_ms": round(stats["p50_ms"], 1),
+                "p99_ms": round(stats["p99_ms"], 1),
+            })
+
+    print_table(rows, list(rows[0]))
+
+
+if __name__ == "__main__":
+    main()
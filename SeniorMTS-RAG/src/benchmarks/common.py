@@ -0,0 +1,117 @@
+import fnmatch
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+
+def rss_mb():
+    """
+    현재 프로세스의 RSS(MB)를 반환합니다. (/proc 가 없으면 최대 RSS 로 대체)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    """
+    프로세스 시작 이후 최대 RSS(MB)를 반환합니다. (Linux 는 KB, macOS 는 byte 단위)
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def summarize(latencies):
+    """
+    지연 시간(초) 목록의 평균과 백분위수를 ms 단위로 반환합니다.
+    """
+    latencies = np.asarray(latencies) * 1000
+    return {
+        "count": int(latencies.size),
+        "mean_ms": round(float(latencies.mean()), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 4),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 4),
+    }
+
+
+def timed(func, *args, repeat=1, **kwargs):
+    """
+    func 를 repeat 번 실행하고 (마지막 결과, 1회 평균 소요 시간(초))를 반환합니다.
+    """
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args, **kwargs)
+    return result, (time.perf_counter() - started) / repeat
+
+
+def print_table(rows, columns):
+    """
+    dict 리스트를 고정 폭 표로 출력합니다.
+    """
+    widths = [max(len(str(column)), *(len(str(row.get(column, ""))) for row in rows)) for column in columns]
+    print("  ".join(str(column).ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row.get(column, "")).ljust(width) for column, width in zip(columns, widths)))
+
+
+class LocalRedis:
+    """
+    RedisSessionStore 가 사용하는 명령(lrange/rpush/expire/delete/set/eval/keys)만 구현한 프로세스 내부 대체 구현입니다.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+
+    def _alive(self, key):
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def lrange(self, key, start, end):
+        if not self._alive(key):
+            return []
+        items = self._data[key]
+        return items[start:] if end == -1 else items[start:end + 1]
+
+    def rpush(self, key, *values):
+        self._alive(key)
+        self._data.setdefault(key, []).extend(value.encode("utf-8") for value in values)
+        return len(self._data[key])
+
+    def expire(self, key, seconds):
+        if self._alive(key):
+            self._expires[key] = time.monotonic() + seconds
+        return True
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += self._data.pop(key, None) is not None
+            self._expires.pop(key, None)
+        return removed
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and self._alive(key):
+            return None
+        self._data[key] = value
+        self._expires.pop(key, None)
+        if px is not None:
+            self._expires[key] = time.monotonic() + px / 1000
+        return True
+
+    def eval(self, script, numkeys, key, owner):
+        # utils.session._RELEASE_SCRIPT (compare-and-delete) 만 지원
+        if self._alive(key) and self._data[key] == owner:
+            return self.delete(key)
+        return 0
+
+    def keys(self, pattern="*"):
+        return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatch(key, pattern)]
@@ -0,0 +1,78 @@
+"""
+대화 기록 토큰 예산 측정: 100턴 대화에서 턴마다 프롬프트에 들어가는 대화 기록의 토큰 수를
+전체 기록을 넣는 기존 방식과 HistoryManager(최근 턴 + 누적 요약)로 비교합니다. (tiktoken, gpt-4o 기준)
+
+요약 LLM 은 고정 길이 요약을 돌려주는 대체 구현을 사용하며, 요약 호출 횟수도 함께 셉니다.
+
+    cd SeniorMTS-RAG/src
+    python -m benchmarks.history_budget --turns 100
+"""
+import argparse
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from benchmarks.common import print_table
+from utils.history import HistoryManager, count_tokens
+
+QUESTIONS = [
+    "삼성전자 주가 알려줘",
+    "요즘 반도체 경기는 어때?",
+    "SK하이닉스 최근 한 달 동안 거래량은?",
+    "현대차 전망 리포트 있어?",
+    "카카오 뉴스 찾아줘",
+]
+
+
+def make_turn(turn):
+    """
+    turn 번째 사용자 질문과 음성 비서 응답을 만듭니다.
+    """
+    question = f"{QUESTIONS[turn % len(QUESTIONS)]} ({turn}번째 질문)"
+    answer = (
+        f"{turn}번째 질문에 답변드릴게요. 최근 거래일 종가는 {70000 + turn * 100:,}원이고 "
+        "전일보다 조금 올랐어요. 증권사 리포트에서는 메모리 가격 반등과 재고 조정 마무리를 이유로 "
+        "하반기 실적 개선을 예상하고 있어요. 더 궁금한 점이 있으면 말씀해 주세요."
+    )
+    return HumanMessage(content=question), AIMessage(content=answer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--max-turns", type=int, default=6)
+    parser.add_argument("--token-budget", type=int, default=2000)
+    parser.add_argument("--every", type=int, default=10, help="표에 출력할 턴 간격")
+    args = parser.parse_args()
+
+    summary_calls = 0
+
+    def summarize(inputs):
+        nonlocal summary_calls
+        summary_calls += 1
+        return AIMessage(content="사용자는 삼성전자, SK하이닉스, 현대차, 카카오의 주가와 전망을 물었고 "
+                                 "반도체 업황 개선 답변을 들었습니다. " * 3)
+
+    manager = HistoryManager(RunnableLambda(summarize), max_turns=args.max_turns, token_budget=args.token_budget)
+
+    rows = []
+    messages = []
+    for turn in range(1, args.turns + 1):
+        question, answer = make_turn(turn)
+        # 프롬프트에는 이전 기록 + 이번 질문이 들어감
+        full_tokens = count_tokens(messages) + count_tokens([question])
+        managed_tokens = count_tokens(manager.build("bench", messages)) + count_tokens([question])
+        if turn == 1 or turn % args.every == 0:
+            rows.append({
+                "turn": turn,
+                "full_history_tokens": full_tokens,
+                "managed_tokens": managed_tokens,
+                "summary_calls": summary_calls,
+            })
+        messages.extend([question, answer])
+
+    print_table(rows, list(rows[0]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+fastapi-app import 시간 회귀 벤치마크: `python -X importtime` 으로 앱 모듈을 불러오는 새 프로세스를 실행하고
+전체 import 시간과 누적 시간이 큰 모듈을 출력합니다.
+
+무거운 패키지(LangChain, Pinecone, Kiwi, pandas, FAISS, Tavily)는 lifespan 초기화에서 import 해야 하므로
+앱 모듈 import 단계에서 불러오면 실패로 처리하고, --max-ms 를 넘어도 실패(종료 코드 1)로 처리합니다.
+
+    cd SeniorMTS-RAG/src
+    python -m benchmarks.import_time --top 15 --max-ms 1500
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.common import print_table
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+# 앱 모듈 import 시점에 불러오면 안 되는 최상위 패키지 (세션 저장소가 쓰는 langchain_core/langchain_community 는 제외)
+DEFERRED_PACKAGES = (
+    "langchain", "langchain_openai", "langchain_upstage", "langchain_teddynote",
+    "pinecone", "kiwipiepy", "pandas", "faiss", "tavily",
+)
+
+IMPORT_SCRIPT = (
+    "import importlib.util; "
+    "spec = importlib.util.spec_from_file_location('fastapi_app', 'fastapi-app.py'); "
+    "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+)
+
+# "import time:      1234 |       5678 |   package.module"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_imports():
+    """
+    새 인터프리터에서 앱 모듈을 import 하고 (모듈, self_us, cumulative_us, depth) 목록을 반환합니다.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT],
+        cwd=SRC_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"앱 모듈 import 실패:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="출력할 모듈 수 (누적 시간 순)")
+    parser.add_argument("--max-ms", type=float, default=None, help="전체 import 시간 상한(ms), 넘으면 종료 코드 1")
+    args = parser.parse_args()
+
+    entries = profile_imports()
+    # 최상위(depth 0) 모듈의 누적 시간 합이 전체 import 시간
+    total_ms = sum(cumulative for _, _, cumulative, depth in entries if depth == 0) / 1000
+    loaded = {module.split(".")[0] for module, _, _, _ in entries}
+    eager = sorted(loaded.intersection(DEFERRED_PACKAGES))
+
+    rows = [
+        {"module": module, "depth": depth, "self_ms": round(self_us / 1000, 2), "cumulative_ms": round(cumulative_us / 1000, 2)}
+        for module, self_us, cumulative_us, depth in sorted(entries, key=lambda entry: entry[2], reverse=True)[:args.top]
+    ]
+    print_table(rows, ["module", "depth", "self_ms", "cumulative_ms"])
+    print()
+    print(f"modules imported: {len(entries)}")
+    print(f"total import time: {total_ms:.1f} ms")
+    print(f"deferred packages imported eagerly: {eager or 'none'}")
+
+    failed = bool(eager)
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"[FAIL] import time {total_ms:.1f} ms > {args.max_ms:.1f} ms")
+        failed = True
+    if eager:
+        print(f"[FAIL] lifespan 에서 불러와야 할 패키지가 import 시점에 로드됨: {eager}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+임베딩/업로드 단계 벤치마크: 가짜 임베딩 모델과 가짜 인덱스로 최대 RSS 와 초당 처리 청크 수를 측정합니다.
+
+- materialized: 기존처럼 청크와 4096차원 벡터(Python float 리스트)를 모두 메모리에 만든 뒤 업로드
+- stream: stream_upsert 로 제너레이터에서 배치 단위로 읽어 임베딩/업로드 (진행 중 배치 수 제한)
+
+최대 RSS 는 프로세스 단위로만 측정되므로 방식마다 별도 프로세스에서 실행합니다.
+
+    cd SeniorMTS-RAG/src
+    python -m benchmarks.ingest_stream --chunks 3000
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from benchmarks.common import peak_rss_mb, print_table
+from utils.upsert import iter_batches, stream_upsert
+
+
+class StubEmbedder:
+    """
+    Upstage 임베딩 API 처럼 배치마다 지연 후 Python float 리스트 벡터를 반환합니다.
+    """
+
+    def __init__(self, dim, latency):
+        self.dim = dim
+        self.latency = latency
+
+    def embed_documents(self, texts):
+        time.sleep(self.latency)
+        return [[(len(text) + i) / self.dim for i in range(self.dim)] for text in texts]
+
+
+class StubSparseEncoder:
+    def encode_documents(self, texts):
+        return [{"indices": [len(text) % 1000], "values": [1.0]} for text in texts]
+
+
+class StubIndex:
+    """
+    업로드된 벡터 수만 세는 인덱스 (업로드 API 지연 포함)
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.count = 0
+
+    def upsert(self, vectors, namespace=None):
+        time.sleep(self.latency)
+        self.count += len(vectors)
+
+
+def generate_records(chunks):
+    """
+    (id, content, metadata) 청크 레코드를 하나씩 생성합니다.
+    """
+    for i in range(chunks):
+        content = f"[{i}] 반도체 업황은 메모리 가격 반등과 재고 조정 마무리로 개선되고 있습니다. " * 8
+        yield f"chunk-{i}", content, {"source": f"report-{i // 50}.pdf", "page": i % 50}
+
+
+def run_materialized(records, index, sparse_encoder, embedder, batch_size):
+    """
+    모든 청크와 벡터를 메모리에 만든 뒤 배치로 업로드합니다. (변경 전 방식)
+    """
+    records = list(records)
+    contents = [record[1] for record in records]
+    dense_embeds = []
+    for batch in iter_batches(contents, batch_size):
+        dense_embeds.extend(embedder.embed_documents(batch))
+    sparse_embeds = sparse_encoder.encode_documents(contents)
+    vectors = [
+        {"id": _id, "values": dense, "sparse_values": sparse, "metadata": {"context": content, **metadata}}
+        for (_id, content, metadata), dense, sparse in zip(records, dense_embeds, sparse_embeds)
+    ]
+    for batch in iter_batches(vectors, batch_size):
+        index.upsert(vectors=batch, namespace="bench")
+    return len(vectors)
+
+
+def run_once(args):
+    """
+    한 가지 방식을 실행하고 결과를 dict 로 반환합니다. (자식 프로세스에서 호출)
+    """
+    index = StubIndex(args.index_latency)
+    embedder = StubEmbedder(args.dim, args.embed_latency)
+    records = generate_records(args.chunks)
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    if args.mode == "materialized":
+        count = run_materialized(records, index, StubSparseEncoder(), embedder, args.batch_size)
+    else:
+        count = stream_upsert(index, "bench", records, StubSparseEncoder(), embedder,
+                              batch_size=args.batch_size, max_workers=args.max_workers)
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": args.mode,
+        "chunks": count,
+        "elapsed_s": round(elapsed, 2),
+        "chunks_per_s": round(count / elapsed, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "peak_rss_delta_mb": round(peak_rss_mb() - rss_before, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=3000)
+    parser.add_argument("--dim", type=int, default=4096)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--embed-latency", type=float, default=0.05, help="배치당 임베딩 API 지연(초)")
+    parser.add_argument("--index-latency", type=float, default=0.02, help="배치당 업로드 API 지연(초)")
+    parser.add_argument("--mode", choices=("materialized", "stream"), help="지정하면 해당 방식만 실행하고 JSON 출력")
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_once(args)))
+        return
+
+    rows = []
+    for mode in ("materialized", "stream"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.ingest_stream", *sys.argv[1:], "--mode", mode],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        rows.append(json.loads(output.strip().splitlines()[-1]))
+
+    print_table(rows, list(rows[0]))
+
+
+if __name__ == "__main__":
+    main()
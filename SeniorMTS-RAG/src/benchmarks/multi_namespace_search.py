@@ -0,0 +1,149 @@
+"""
+다중 네임스페이스 검색 벤치마크: 프로세스 내부 가짜 인덱스(LocalHybridIndex + 네트워크 지연)로
+네임스페이스별 순차 검색과 MultiNamespaceRetriever 의 병렬 조회 + RRF 병합을 비교합니다.
+
+- sequential: 기존처럼 네임스페이스마다 질의를 임베딩하고 차례로 조회
+- parallel: 질의를 한 번만 임베딩하고 세 네임스페이스를 동시에 조회한 뒤 RRF 로 병합
+
+    cd SeniorMTS-RAG/src
+    python -m benchmarks.multi_namespace_search --docs 2000 --queries 50
+"""
+import argparse
+import time
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks.common import print_table, summarize
+from retrievers import RETRIEVER_CONFIGS, query_namespace, reciprocal_rank_fusion, setup_multi_retriever
+from utils.local_index import LocalHybridIndex
+
+VOCAB_SIZE = 50000
+
+
+def _seed(text):
+    return zlib.crc32(text.encode("utf-8"))
+
+
+class StubEmbeddings:
+    """
+    질의마다 고정된 난수 벡터를 반환하고, 임베딩 API 왕복 시간만큼 기다립니다.
+    """
+
+    def __init__(self, dim, latency):
+        self.dim = dim
+        self.latency = latency
+
+    def embed_query(self, text):
+        time.sleep(self.latency)
+        vector = np.random.default_rng(_seed(text)).standard_normal(self.dim).astype(np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+
+class StubSparseEncoder:
+    """
+    공백 단위 토큰을 해시해 BM25 형식의 sparse 벡터를 만듭니다.
+    """
+
+    def encode_queries(self, text):
+        indices = sorted({_seed(token) % VOCAB_SIZE for token in text.split()})
+        return {"indices": indices, "values": [1.0] * len(indices)}
+
+
+class RemoteIndex:
+    """
+    LocalHybridIndex 조회 앞에 Pinecone 왕복 시간만큼의 지연을 추가합니다.
+    """
+
+    def __init__(self, index, latency):
+        self.index = index
+        self.latency = latency
+
+    def query(self, **kwargs):
+        time.sleep(self.latency)
+        return self.index.query(**kwargs)
+
+
+def build_index(namespaces, docs, dim):
+    """
+    네임스페이스마다 docs 개의 무작위 dense/sparse 벡터를 넣은 로컬 인덱스를 만듭니다.
+    """
+    rng = np.random.default_rng(0)
+    index = LocalHybridIndex()
+    for namespace in namespaces:
+        dense = rng.standard_normal((docs, dim)).astype(np.float32)
+        dense /= np.linalg.norm(dense, axis=1, keepdims=True)
+        vectors = []
+        for i in range(docs):
+            indices = sorted(set(rng.integers(0, VOCAB_SIZE, 20).tolist()))
+            vectors.append({
+                "id": f"{namespace}-{i}",
+                "values": dense[i],
+                "sparse_values": {"indices": indices, "values": rng.random(len(indices)).tolist()},
+                "metadata": {"context": f"{namespace} 문서 {i}"},
+            })
+        index.upsert(vectors, namespace=namespace)
+    return index
+
+
+def sequential_search(retrievers, query):
+    """
+    네임스페이스별 검색 도구를 차례로 호출하는 기존 방식 (도구마다 질의 임베딩)
+    """
+    results = []
+    for retriever in retrievers:
+        dense_vec = retriever.embeddings.embed_query(query)
+        results.append(query_namespace(retriever, query, dense_vec))
+    return reciprocal_rank_fusion(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000, help="네임스페이스별 문서 수")
+    parser.add_argument("--dim", type=int, default=4096)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--embed-latency", type=float, default=0.08, help="질의 임베딩 API 왕복 시간(초)")
+    parser.add_argument("--index-latency", type=float, default=0.05, help="인덱스 조회 왕복 시간(초)")
+    args = parser.parse_args()
+
+    index = RemoteIndex(build_index([config[0] for config in RETRIEVER_CONFIGS], args.docs, args.dim),
+                        args.index_latency)
+    embeddings = StubEmbeddings(args.dim, args.embed_latency)
+    retrievers = [
+        SimpleNamespace(index=index, namespace=namespace, sparse_encoder=StubSparseEncoder(),
+                        embeddings=embeddings, top_k=top_k, alpha=alpha)
+        for namespace, top_k, alpha in RETRIEVER_CONFIGS
+    ]
+    multi_retriever = setup_multi_retriever(*retrievers)
+    expected_docs = sum(config[1] for config in RETRIEVER_CONFIGS)
+
+    queries = [f"반도체 업황 전망 {i} 삼성전자 실적" for i in range(args.queries)]
+    modes = {
+        "sequential": lambda query: sequential_search(retrievers, query),
+        "parallel": multi_retriever.invoke,
+    }
+
+    rows = []
+    for mode, search in modes.items():
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            documents = search(query)
+            latencies.append(time.perf_counter() - started)
+            assert len(documents) == expected_docs
+        stats = summarize(latencies)
+        rows.append({
+            "mode": mode,
+            "queries": len(queries),
+            "docs_per_query": expected_docs,
+            "mean_ms": round(stats["mean_ms"], 1),
+            "p50_ms": round(stats["p50_ms"], 1),
+            "p99_ms": round(stats["p99_ms"], 1),
+        })
+
+    print_table(rows, list(rows[0]))
+
+
+if __name__ == "__main__":
+    main()
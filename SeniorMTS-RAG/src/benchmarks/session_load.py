@@ -0,0 +1,111 @@
+"""
+세션 저장소 부하 테스트: 수천 개 세션을 만든 뒤 백엔드별 RSS 증가량과 조회 지연 시간을 측정합니다.
+
+    cd SeniorMTS-RAG/src
+    python -m benchmarks.session_load --sessions 5000 --turns 3
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from benchmarks.common import LocalRedis, print_table, rss_mb, summarize
+from utils import session
+from utils.session import InMemorySessionStore, RedisSessionStore, SQLiteSessionStore, session_lock
+
+
+def fill(store, sessions, turns):
+    """
+    세션마다 turns 턴의 대화를 저장하고 소요 시간(초)을 반환합니다.
+    """
+    started = time.perf_counter()
+    for i in range(sessions):
+        history = store.get(f"session-{i}")
+        for turn in range(turns):
+            history.add_messages([
+                HumanMessage(content=f"삼성전자 주가 알려줘 ({turn})"),
+                AIMessage(content=f"삼성전자의 현재 주가는 {70000 + turn * 100}원입니다. " * 4),
+            ])
+    return time.perf_counter() - started
+
+
+def lookup(store, sessions, samples):
+    """
+    무작위 세션의 기록을 조회(get + messages)하고 지연 시간 목록을 반환합니다.
+    """
+    rng = random.Random(0)
+    latencies = []
+    for _ in range(samples):
+        session_id = f"session-{rng.randrange(sessions)}"
+        started = time.perf_counter()
+        store.get(session_id).messages
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def lock_contention(store, requests, sessions):
+    """
+    같은 세션으로 몰린 동시 요청을 session_lock 으로 직렬화하고 턴이 섞이지 않았는지 확인합니다.
+    """
+    session.store = store
+
+    async def turn(i):
+        session_id = f"locked-{i % sessions}"
+        async with session_lock(session_id):
+            history = store.get(session_id)
+            history.add_message(HumanMessage(content=f"q{i}"))
+            await asyncio.sleep(0)
+            history.add_message(AIMessage(content=f"a{i}"))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(turn(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    interleaved = 0
+    for i in range(sessions):
+        contents = [message.content for message in store.get(f"locked-{i}").messages]
+        interleaved += sum(a[1:] != b[1:] for a, b in zip(contents[::2], contents[1::2]))
+    return elapsed, interleaved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--samples", type=int, default=5000)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    backends = {
+        "memory": lambda: InMemorySessionStore(max_sessions=args.sessions),
+        "sqlite": lambda: SQLiteSessionStore(os.path.join(tmp_dir, "sessions.db"), idle_ttl=3600),
+        "redis(local)": lambda: RedisSessionStore(LocalRedis()),
+    }
+
+    rows = []
+    for name, factory in backends.items():
+        rss_before = rss_mb()
+        store = factory()
+        fill_seconds = fill(store, args.sessions, args.turns)
+        stats = summarize(lookup(store, args.sessions, args.samples))
+        lock_seconds, interleaved = asyncio.run(lock_contention(store, requests=400, sessions=20))
+        rows.append({
+            "backend": name,
+            "sessions": args.sessions,
+            "fill_s": round(fill_seconds, 2),
+            "rss_delta_mb": round(rss_mb() - rss_before, 1),
+            "lookup_p50_ms": stats["p50_ms"],
+            "lookup_p99_ms": stats["p99_ms"],
+            "locked_turns_s": round(lock_seconds, 2),
+            "interleaved": interleaved,
+        })
+
+    print_table(rows, list(rows[0]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+siseJson 파서 마이크로 벤치마크: parse_sise 와 기존 ast.literal_eval 을 1일, 1년, 10년 분량의
+합성 응답으로 비교합니다. (1회 평균 소요 시간, tracemalloc 최대 할당량)
+
+    cd SeniorMTS-RAG/src
+    python -m benchmarks.sise_parser --repeat 200
+"""
+import argparse
+import tracemalloc
+from ast import literal_eval
+from datetime import date, timedelta
+
+from benchmarks.common import print_table, timed
+from tools import parse_sise
+
+# 거래일 수 기준 응답 크기
+PAYLOADS = {"1d": 1, "1y": 250, "10y": 2500}
+
+
+def make_payload(trading_days, end=date(2024, 12, 30)):
+    """
+    네이버 siseJson 과 같은 형식(줄바꿈, 작은따옴표 헤더, 큰따옴표 날짜)의 응답 본문을 만듭니다.
+    """
+    rows = []
+    day = end
+    while len(rows) < trading_days:
+        if day.weekday() < 5:
+            close = 50000 + (day.toordinal() * 37) % 20000
+            rows.append(f'["{day:%Y%m%d}", {close - 300}, {close + 700}, {close - 900}, {close}, '
+                        f'{(day.toordinal() * 7919) % 20000000}, {50 + (day.toordinal() % 100) / 10}]')
+        day -= timedelta(days=1)
+    header = "[['날짜', '시가', '고가', '저가', '종가', '거래량', '외국인소진율']"
+    return "\n" + ",\n".join([header] + rows[::-1]) + "]\n"
+
+
+def old_parse(text):
+    # 변경 전 fetch_sise 의 파싱 방식
+    return literal_eval(text.strip())
+
+
+def peak_kb(func, text):
+    """
+    func(text) 실행 중 tracemalloc 최대 할당량(KB)을 반환합니다.
+    """
+    tracemalloc.start()
+    try:
+        func(text)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = []
+    for name, trading_days in PAYLOADS.items():
+        text = make_payload(trading_days)
+        repeat = max(1, args.repeat // max(1, trading_days // 250))
+        expected, literal_seconds = timed(old_parse, text, repeat=repeat)
+        result, parse_seconds = timed(parse_sise, text, repeat=repeat)
+        rows.append({
+            "payload": name,
+            "rows": trading_days,
+            "kb": round(len(text.encode("utf-8")) / 1024, 1),
+            "literal_eval_ms": round(literal_seconds * 1000, 3),
+            "parse_sise_ms": round(parse_seconds * 1000, 3),
+            "speedup": round(literal_seconds / parse_seconds, 1),
+            "literal_eval_peak_kb": round(peak_kb(old_parse, text), 1),
+            "parse_sise_peak_kb": round(peak_kb(parse_sise, text), 1),
+            "same_result": result == expected,
+        })
+
+    print_table(rows, list(rows[0]))
+
+
+if __name__ == "__main__":
+    main()
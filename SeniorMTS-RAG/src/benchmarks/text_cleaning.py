@@ -0,0 +1,137 @@
+"""
+청크 정리/필터 벤치마크: 합성 증권사 리포트 청크로 변경 전 구현과 utils.text_cleaning 의 처리량을 비교합니다.
+(stockreports 필터 설정 기준, 약 10% 청크에 제외 문구 포함)
+
+    cd SeniorMTS-RAG/src
+    python -m benchmarks.text_cleaning --chunks 20000
+"""
+import argparse
+import random
+import re
+from types import SimpleNamespace
+
+from benchmarks.common import print_table, timed
+from ingest import NAMESPACE_CONFIGS
+from utils import text_cleaning
+
+SENTENCES = [
+    "3분기 영업이익은 1조 2,345억원으로 시장 컨센서스를 8.5% 상회했습니다.",
+    "메모리 가격 반등과 재고 조정 마무리로 하반기 실적 개선이 예상됩니다.",
+    "목표주가 95,000원과 투자의견 매수를 유지합니다.",
+    "HBM 출하 비중 확대에 따라 평균판매단가(ASP)가 전분기 대비 12% 상승했습니다.",
+    "원/달러 환율 1,380원 가정 시 2025년 EPS 는 6,120원으로 추정됩니다.",
+    "파운드리 가동률은 70% 후반으로 회복되었으나 수익성 개선은 제한적입니다.",
+]
+
+
+def make_corpus(chunks, excluded_words, seed=0):
+    """
+    PDF 에서 추출한 것처럼 줄바꿈/공백이 섞인 리포트 청크를 만듭니다.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(chunks):
+        parts = []
+        for _ in range(rng.randint(4, 9)):
+            parts.append(rng.choice(SENTENCES))
+            parts.append(rng.choice([" ", "  ", "\n", " \n ", "\n\n\n\n", "\n   \n", "\t "]))
+        if rng.random() < 0.3:
+            # 표에서 추출된 숫자 위주 줄
+            parts.append("\n" + " ".join(str(rng.randint(100, 99999)) for _ in range(rng.randint(5, 40))))
+        if rng.random() < 0.1:
+            parts.append(f"\n{rng.choice(excluded_words)} 사항을 확인하시기 바랍니다.")
+        corpus.append("".join(parts))
+    return corpus
+
+
+def old_clean_and_filter_text(content):
+    # 변경 전 clean_and_filter_text
+    def replacer(match):
+        remainder = match.group(0).split("\n", 3)[-1]
+        return "\n\n\n" + re.sub(r"^\n+", "", remainder)
+
+    content = re.sub(r"(?:\n){3,}", replacer, content)
+    content = re.sub(r" *\n+ *", "\n", content)
+    content = re.sub(r"\s{2,}", " ", content)
+    return content.strip()
+
+
+def old_is_alpha_dominant(content, threshold=0.85):
+    # 변경 전 is_alpha_dominant
+    if not content:
+        return False
+    return sum(1 for c in content if not c.isdigit()) / len(content) >= threshold
+
+
+def old_filter_chunk(doc, min_length=200, excluded_words=(), min_alpha_ratio=None, replace_content=True):
+    # 변경 전 filter_chunk
+    content = old_clean_and_filter_text(doc.page_content)
+    if len(content) - content.count("\n") < min_length:
+        return None
+    if any(word in content for word in excluded_words):
+        return None
+    if min_alpha_ratio is not None and not old_is_alpha_dominant(content, threshold=min_alpha_ratio):
+        return None
+    if replace_content:
+        doc.page_content = content
+    return doc
+
+
+def run_filter(filter_chunk, corpus, settings):
+    """
+    청크마다 filter_chunk 를 적용하고 남은 청크 텍스트 목록을 반환합니다.
+    """
+    kept = []
+    for text in corpus:
+        doc = filter_chunk(SimpleNamespace(page_content=text), **settings)
+        if doc is not None:
+            kept.append(doc.page_content)
+    return kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    settings = NAMESPACE_CONFIGS["stockreports"]["filter"]
+    corpus = make_corpus(args.chunks, settings["excluded_words"])
+
+    # 숫자 비율 테이블 생성은 첫 호출에만 발생하므로 측정에서 제외
+    text_cleaning.digit_ratio("0")
+
+    stages = {
+        "clean": (
+            lambda: [old_clean_and_filter_text(text) for text in corpus],
+            lambda: [text_cleaning.clean_and_filter_text(text) for text in corpus],
+        ),
+        "alpha_ratio": (
+            lambda: [old_is_alpha_dominant(text, settings["min_alpha_ratio"]) for text in corpus],
+            lambda: [text_cleaning.is_alpha_dominant(text, settings["min_alpha_ratio"]) for text in corpus],
+        ),
+        "filter_chunk": (
+            lambda: run_filter(old_filter_chunk, corpus, settings),
+            lambda: run_filter(text_cleaning.filter_chunk, corpus, settings),
+        ),
+    }
+
+    rows = []
+    for stage, (old, new) in stages.items():
+        old_result, old_seconds = timed(old, repeat=args.repeat)
+        new_result, new_seconds = timed(new, repeat=args.repeat)
+        rows.append({
+            "stage": stage,
+            "chunks": len(corpus),
+            "old_chunks_per_s": round(len(corpus) / old_seconds),
+            "new_chunks_per_s": round(len(corpus) / new_seconds),
+            "speedup": round(old_seconds / new_seconds, 2),
+            "same_result": old_result == new_result,
+        })
+    rows[-1]["kept"] = len(new_result)
+
+    print_table(rows, ["stage", "chunks", "old_chunks_per_s", "new_chunks_per_s", "speedup", "same_result", "kept"])
+
+
+if __name__ == "__main__":
+    main()
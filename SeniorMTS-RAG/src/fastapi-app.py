@@ -1,32 +1,123 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from datetime import datetime
-from langchain.schema import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage
 from utils.config import load_environment
-from utils.session import get_session_history
-from retrievers import setup_retrievers
-from tools import setup_tools, real_time_stock_tool
-from llm import setup_llm
-from agent import setup_agent
+from utils.session import get_session_history, session_lock
+from parsers import format_sse, parse_agent_event
+from utils.concurrency import run_blocking, shutdown_executor
+
+
+class AppState:
+    """
+    lifespan 에서 초기화되는 구성 요소와 준비 상태를 보관합니다.
+    무거운 모듈(LangChain, Pinecone, Kiwi 등)은 초기화 단계에서 import 하므로
+    서버는 바로 떠서 liveness 에 응답하고, 준비가 끝나면 readiness 가 200 이 됩니다.
+    """
+
+    def __init__(self):
+        self.components = {}
+        self.timings = {}
+        self.error = None
+        self.ready = False
+        self.started_at = None
+
+    def load(self):
+        """
+        구성 요소를 순서대로 초기화하고 단계별 소요 시간을 기록합니다. (블로킹, 스레드 풀에서 실행)
+        """
+        def step(name, func):
+            started = time.perf_counter()
+            result = func()
+            self.timings[name] = round(time.perf_counter() - started, 3)
+            return result
+
+        # 1. 환경 변수 로드
+        load_environment()
+
+        # 2. 검색기 (세 네임스페이스 동시 초기화)
+        from retrievers import setup_retrievers
+        cycle_retriever, stock_retriever, news_retriever = step("retrievers", setup_retrievers)
+
+        # 3. 도구, LLM 및 에이전트
+        from tools import setup_tools
+        from llm import setup_llm
+        from agent import setup_agent
+        tools = step("tools", lambda: setup_tools(cycle_retriever, stock_retriever, news_retriever))
+        llm, prompt = step("llm", setup_llm)
+        self.components["tools"] = tools
+        self.components["agent_executor"] = step("agent", lambda: setup_agent(llm, tools, prompt))
+
+        # 4. 대화 기록 관리자, 답변 캐시 (검색기와 같은 질의 임베딩 캐시를 공유), 라우터
+        from utils.history import setup_history_manager
+        from utils.answer_cache import SemanticAnswerCache
+        import router
+        self.components["history_manager"] = step("history_manager", setup_history_manager)
+        self.components["answer_cache"] = SemanticAnswerCache(cycle_retriever.embeddings)
+        self.components["router"] = router
+
+        self.ready = True
+
+    def status(self):
+        """
+        준비 상태와 초기화된 구성 요소, 단계별 소요 시간을 반환합니다.
+        """
+        return {
+            "ready": self.ready,
+            "components": sorted(self.components),
+            "timings": self.timings,
+            "error": self.error,
+        }
+
+    def require(self):
+        """
+        구성 요소를 반환합니다. 아직 준비되지 않았으면 503 을 발생시킵니다.
+        """
+        if not self.ready:
+            detail = f"Initialization failed: {self.error}" if self.error else "Server is warming up."
+            raise HTTPException(status_code=503, detail=detail)
+        return self.components
+
+
+state = AppState()
+
+
+async def warm_up():
+    """
+    구성 요소를 백그라운드에서 초기화합니다. 실패해도 서버는 유지하고 readiness 로 오류를 알립니다.
+    """
+    state.started_at = time.perf_counter()
+    try:
+        await run_blocking(state.load)
+        state.timings["total"] = round(time.perf_counter() - state.started_at, 3)
+    except Exception as e:
+        state.error = str(e)
+        print(f"[ERROR] Initialization failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    서버 시작 시 초기화를 시작하고, 종료 시 블로킹 작업용 스레드 풀을 정리합니다.
+    """
+    task = asyncio.create_task(warm_up())
+    yield
+    task.cancel()
+    shutdown_executor()
+
 
 # FastAPI 인스턴스 생성
 app = FastAPI(
     title="AI Agent and Tools API",
-    description="Provides AI agent responses and tools for stock analysis and information retrieval."
+    description="Provides AI agent responses and tools for stock analysis and information retrieval.",
+    lifespan=lifespan,
 )
 
-# 환경 변수 로드
-load_environment()
-
-# 검색기, 도구, LLM 및 에이전트 설정
-try:
-    cycle_retriever, stock_retriever, news_retriever = setup_retrievers()
-    tools = setup_tools(cycle_retriever, stock_retriever, news_retriever)
-    llm, prompt = setup_llm()
-    agent_executor = setup_agent(llm, tools, prompt)
-except Exception as e:
-    raise RuntimeError(f"Initialization failed: {e}")
-
 # 요청 및 응답 모델 정의
 class ChatRequest(BaseModel):
     session_id: str
@@ -42,69 +133,180 @@ async def chat(request: ChatRequest):
     AI Agent API 엔드포인트: 사용자 입력과 세션 ID를 받아 AI 응답을 반환합니다.
     Tools의 기능도 함께 사용 가능합니다.
     """
-    try:
-        # 세션 기록 가져오기
-        session_history = get_session_history(request.session_id)
-        chat_history = session_history.messages
+    components = state.require()
+    router = components["router"]
+    history_manager = components["history_manager"]
+    answer_cache = components["answer_cache"]
+
+    # 같은 세션의 동시 요청은 순서대로 처리 (대화 기록이 섞이지 않도록, 워커 간 포함)
+    async with session_lock(request.session_id):
+        try:
+            # 세션 기록 가져오기 (sqlite/redis 저장소는 블로킹 I/O 이므로 스레드 풀에서 실행)
+            session_history = await run_blocking(get_session_history, request.session_id)
+
+            # 현재 시간 계산
+            current_time = datetime.utcnow().isoformat()
+
+            # 답변 캐시 범위: 같은 시간대(1시간 단위)
+            cache_scope = current_time[:13]
+
+            # 단순 주가 질문은 에이전트 없이 바로 응답
+            started = time.perf_counter()
+            route, stock_code, stock_name = router.route_query(request.user_input)
+            if route == "price":
+                agent_output = await run_blocking(router.answer_price, stock_code, stock_name)
+            else:
+                # 같은 시간대에 비슷한 질문이 있었으면 캐시된 답변 사용
+                agent_output = await answer_cache.alookup(request.user_input, cache_scope)
+                if agent_output is not None:
+                    route = "cache"
 
-        # 현재 시간 계산
-        current_time = datetime.utcnow().isoformat()
+            if agent_output is None:
+                # 최근 턴 + 이전 대화 요약 (토큰 예산 적용)
+                messages = await run_blocking(lambda: session_history.messages)
+                chat_history = await history_manager.abuild(request.session_id, messages)
 
-        # 에이전트 실행
-        response = agent_executor.invoke({
+                # 에이전트 실행 (이벤트 루프를 막지 않도록 비동기 호출)
+                response = await components["agent_executor"].ainvoke({
+                    "input": request.user_input,
+                    "chat_history": chat_history,
+                    "current_time": current_time,
+                })
+
+                # 에이전트 응답 처리
+                agent_output = response.get("output", str(response))
+
+                # 사용한 도구에 따라 유효 시간을 정해 캐시에 저장
+                tools_used = [action.tool for action, _ in response.get("intermediate_steps", [])]
+                await answer_cache.astore(
+                    request.user_input, cache_scope, agent_output, tools_used, time.perf_counter() - started
+                )
+
+            # 사용자 요청이 특정 도구와 관련된 경우 직접 호출
+            if route == "agent" and "인터넷 검색" in request.user_input:
+                try:
+                    # TavilySearchResults 도구 호출
+                    search_results = await components["tools"][1].arun(request.user_input)  # internet_search_tool
+                    agent_output += f"\n인터넷 검색 결과:\n{search_results}"
+                except Exception as e:
+                    agent_output += f"\n인터넷 검색 도중 오류가 발생했습니다: {e}"
+
+            # 경로별 지연 시간 기록
+            router.route_stats.record(route, time.perf_counter() - started)
+
+            # 세션 기록 갱신
+            await run_blocking(session_history.add_messages, [
+                HumanMessage(content=request.user_input),
+                AIMessage(content=agent_output),
+            ])
+
+            # 응답 반환
+            return ChatResponse(output=agent_output)
+
+        except Exception as e:
+            print(f"[ERROR] {e}")
+            raise HTTPException(status_code=500, detail=f"An error occurred: {e}")
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    스트리밍 AI Agent API 엔드포인트: 에이전트 실행 과정을 Server-Sent Events 로 전달합니다.
+    도구 시작/종료 이벤트와 LLM 토큰을 생성되는 즉시 보내고, 마지막에 전체 응답을 보냅니다.
+    """
+    components = state.require()
+
+    async def event_generator():
+        # 같은 세션의 동시 요청은 순서대로 처리 (스트림이 끝날 때까지 잠금 유지)
+        async with session_lock(request.session_id):
+            async for message in stream_agent_events(request, components):
+                yield message
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
+async def stream_agent_events(request: ChatRequest, components):
+    """
+    에이전트 이벤트를 SSE 메시지로 변환해 반환하고, 스트림이 끝나면 세션 기록을 갱신합니다.
+    :param components: (dict) 초기화된 앱 구성 요소
+    """
+    # 세션 기록 가져오기 (sqlite/redis 저장소는 블로킹 I/O 이므로 스레드 풀에서 실행)
+    session_history = await run_blocking(get_session_history, request.session_id)
+    messages = await run_blocking(lambda: session_history.messages)
+    # 최근 턴 + 이전 대화 요약 (토큰 예산 적용)
+    chat_history = await components["history_manager"].abuild(request.session_id, messages)
+
+    # 현재 시간 계산
+    current_time = datetime.utcnow().isoformat()
+
+    tokens = []
+    agent_output = None
+
+    try:
+        async for event in components["agent_executor"].astream_events({
             "input": request.user_input,
             "chat_history": chat_history,
             "current_time": current_time,
-        })
-
-        # 에이전트 응답 처리
-        agent_output = response.get("output", str(response))
-
-        # 사용자 요청이 특정 도구와 관련된 경우 직접 호출
-        if "주가" in request.user_input:
-            try:
-                # 주식 코드 추출 및 real_time_stock_tool 호출
-                stock_code = extract_stock_code(request.user_input)
-                stock_data = real_time_stock_tool(code=stock_code)
-                agent_output += f"\n추가 주가 정보:\n{stock_data}"
-            except Exception as e:
-                agent_output += f"\n추가 주가 정보를 가져오는 중 오류가 발생했습니다: {e}"
-
-        elif "인터넷 검색" in request.user_input:
-            try:
-                # TavilySearchResults 도구 호출
-                search_results = tools[1].run(request.user_input)  # internet_search_tool
-                agent_output += f"\n인터넷 검색 결과:\n{search_results}"
-            except Exception as e:
-                agent_output += f"\n인터넷 검색 도중 오류가 발생했습니다: {e}"
-
-        # 세션 기록 갱신
-        session_history.add_message(HumanMessage(content=request.user_input))
-        session_history.add_message(AIMessage(content=agent_output))
-
-        # 응답 반환
-        return ChatResponse(output=agent_output)
+        }, version="v2"):
+            # 최종 응답은 AgentExecutor 종료 이벤트에서 가져옴
+            if event["event"] == "on_chain_end" and event["name"] == "AgentExecutor":
+                output = event["data"].get("output")
+                if isinstance(output, dict):
+                    agent_output = output.get("output")
+            elif event["event"] == "on_chat_model_stream" and event["data"]["chunk"].content:
+                tokens.append(event["data"]["chunk"].content)
 
+            message = parse_agent_event(event)
+            if message:
+                yield message
     except Exception as e:
         print(f"[ERROR] {e}")
-        raise HTTPException(status_code=500, detail=f"An error occurred: {e}")
+        yield format_sse("error", {"detail": f"An error occurred: {e}"})
+        return
+
+    if agent_output is None:
+        agent_output = "".join(tokens)
+
+    # 스트림이 끝난 뒤 세션 기록 갱신
+    await run_blocking(session_history.add_messages, [
+        HumanMessage(content=request.user_input),
+        AIMessage(content=agent_output),
+    ])
+
+    yield format_sse("end", {"output": agent_output})
+
+
+@app.get("/router/stats")
+async def router_stats():
+    """
+    경로별(price, cache, agent) 요청 비율과 평균 지연 시간을 반환합니다.
+    """
+    return state.require()["router"].route_stats.stats()
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """
+    답변 캐시 적중률(hit_rate)과 절약한 지연 시간(saved_seconds)을 반환합니다.
+    """
+    return state.require()["answer_cache"].stats()
+
+
+@app.get("/health/live")
+async def liveness():
+    """
+    Liveness 엔드포인트: 프로세스가 요청을 받을 수 있는지만 확인합니다.
+    """
+    return {"status": "alive"}
 
 
-def extract_stock_code(user_input: str) -> str:
+@app.get("/health/ready")
+async def readiness():
     """
-    사용자 입력에서 종목 코드를 추출합니다.
+    Readiness 엔드포인트: 구성 요소 초기화가 끝났는지와 단계별 초기화 시간을 반환합니다.
+    준비 중이거나 초기화에 실패했으면 503 을 반환합니다.
     """
-    # 간단한 예시: 사용자 입력에서 특정 키워드를 기반으로 종목 코드 매핑
-    stock_mapping = {
-        "삼성전자": "005930",
-        "SK하이닉스": "000660",
-        "LG에너지솔루션": "373220",
-        "현대차": "005380",
-    }
-    for stock_name, stock_code in stock_mapping.items():
-        if stock_name in user_input:
-            return stock_code
-    raise ValueError("사용자 입력에서 종목 코드를 찾을 수 없습니다.")
+    return JSONResponse(state.status(), status_code=200 if state.ready else 503)
 
 
 @app.get("/")
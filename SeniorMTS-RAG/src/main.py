@@ -26,6 +26,7 @@ from parsers import setup_parser
 from utils.config import load_environment
 from utils.session import get_session_history
 from langchain.schema import HumanMessage, AIMessage
+from utils.history import setup_history_manager
 from datetime import datetime
 
 
@@ -40,6 +41,7 @@ def main():
     # LLM 및 에이전트 설정
     llm, prompt = setup_llm()
     agent_executor = setup_agent(llm, tools, prompt)
+    history_manager = setup_history_manager()
 
     # 세션 ID
     session_id = input("세션 ID를 입력하세요 (기본값: 'default_session'): ").strip() or "default_session"
@@ -57,8 +59,8 @@ def main():
             # 현재 시간을 계산
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            # 대화 기록 전달
-            chat_history = [{"type": message.type, "content": message.content} for message in session_history.messages]
+            # 대화 기록 전달 (최근 턴 + 이전 대화 요약)
+            chat_history = history_manager.build(session_id, session_history.messages)
 
             # 에이전트 실행
             response = agent_executor.invoke({
@@ -1,7 +1,43 @@
-from langchain_teddynote.messages import AgentStreamParser
+import json
+
 
 def setup_parser():
     """
     스트림 파서 생성
     """
+    from langchain_teddynote.messages import AgentStreamParser
+
     return AgentStreamParser()
+
+
+def format_sse(event, data):
+    """
+    Server-Sent Events 형식의 메시지를 생성합니다.
+    :param event: (str) 이벤트 이름
+    :param data: (dict) 전송할 데이터
+    :return: (str) SSE 메시지
+    """
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def parse_agent_event(event):
+    """
+    astream_events 이벤트를 SSE 메시지로 변환합니다.
+    토큰, 도구 시작/종료 이벤트만 전달하고 나머지는 None 을 반환합니다.
+    """
+    kind = event["event"]
+
+    # LLM 토큰 (도구 호출 청크는 content 가 비어 있으므로 제외)
+    if kind == "on_chat_model_stream":
+        content = event["data"]["chunk"].content
+        if content:
+            return format_sse("token", {"content": content})
+
+    elif kind == "on_tool_start":
+        return format_sse("tool_start", {"tool": event["name"], "input": event["data"].get("input")})
+
+    elif kind == "on_tool_end":
+        return format_sse("tool_end", {"tool": event["name"], "output": str(event["data"].get("output"))})
+
+    return None
@@ -1,7 +1,23 @@
 from dotenv import load_dotenv
-from langchain_teddynote.community.pinecone import init_pinecone_index, PineconeKiwiHybridRetriever
+from langchain_teddynote.community.pinecone import (
+    PineconeKiwiHybridRetriever,
+    KiwiBM25Tokenizer,
+)
 from langchain_upstage import UpstageEmbeddings
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+from utils.embedding_cache import CachedEmbeddings
+from utils.config import get_vector_backend, get_local_index_dir
+from utils.local_index import LocalHybridIndex
+from utils.sparse_store import SPARSE_ENCODER_SUFFIX, load_bm25_encoder
+from utils.sise_cache import KST
 import os
+import pickle
+import threading
+import time
+from datetime import datetime
 
 # .env 파일 로드
 load_dotenv()
@@ -26,52 +42,323 @@ def stopwords():
     with local_path.open("r", encoding="utf-8") as file:
         return [word.strip() for word in file.readlines()]
 
+def load_sparse_encoder(sparse_encoder_path, stopwords, tokenizer="kiwi"):
+    """
+    저장된 BM25 sparse encoder 를 불러오고 토크나이저를 설정합니다.
+    같은 이름의 .bm25 파일이 있으면 문서 빈도 테이블을 메모리 맵으로 열고(워커 간 공유),
+    없으면 기존 pickle 파일을 읽습니다.
+    """
+    bm25_path = os.path.splitext(sparse_encoder_path)[0] + SPARSE_ENCODER_SUFFIX
+    if os.path.exists(bm25_path):
+        if tokenizer != "kiwi":
+            raise ValueError(f"'{bm25_path}' 형식은 kiwi 토크나이저만 지원합니다.")
+        sparse_encoder = load_bm25_encoder(bm25_path)
+    else:
+        with open(sparse_encoder_path, "rb") as f:
+            sparse_encoder = pickle.load(f)
+    if tokenizer == "kiwi":
+        sparse_encoder._tokenizer = KiwiBM25Tokenizer(stop_words=stopwords)
+    return sparse_encoder
+
+
+# Pinecone 인덱스 연결은 프로세스 안에서 하나만 만들어 모든 네임스페이스가 공유
+_pinecone_index = None
+_pinecone_index_lock = threading.Lock()
+
+
+def get_pinecone_index(index_name="seniormts"):
+    """
+    Pinecone 인덱스 연결을 반환합니다. (처음 호출 시 연결)
+    """
+    global _pinecone_index
+    with _pinecone_index_lock:
+        if _pinecone_index is None:
+            from pinecone.grpc import PineconeGRPC as Pinecone
+
+            _pinecone_index = Pinecone(api_key=os.environ["PINECONE_API_KEY"]).Index(index_name)
+    return _pinecone_index
+
+
+def init_pinecone_params(namespace, sparse_encoder_path, stopwords, tokenizer, embeddings, top_k, alpha):
+    """
+    init_pinecone_index 와 같은 형식의 검색기 파라미터를 구성합니다.
+    sparse encoder 는 load_sparse_encoder 로 불러오므로 .bm25 형식을 사용할 수 있습니다.
+    """
+    index = get_pinecone_index()
+    namespace_keys = index.describe_index_stats()["namespaces"].keys()
+    if namespace not in namespace_keys:
+        raise ValueError(f"`{namespace}` 를 `{list(namespace_keys)}` 에서 찾지 못했습니다.")
+    return {
+        "index": index,
+        "namespace": namespace,
+        "sparse_encoder": load_sparse_encoder(sparse_encoder_path, stopwords, tokenizer),
+        "embeddings": embeddings,
+        "top_k": top_k,
+        "alpha": alpha,
+    }
+
+
+# 로컬 인덱스는 프로세스 안에서 하나만 열어 모든 네임스페이스가 공유
+_local_index = None
+_local_index_lock = threading.Lock()
+
+
+def get_local_index():
+    """
+    로컬 하이브리드 인덱스를 반환합니다. (처음 호출 시 디스크에서 로드)
+    """
+    global _local_index
+    with _local_index_lock:
+        if _local_index is None:
+            _local_index = LocalHybridIndex(get_local_index_dir())
+    return _local_index
+
+
+def init_local_index(namespace, sparse_encoder_path, stopwords, tokenizer, embeddings, top_k, alpha):
+    """
+    init_pinecone_index 와 같은 형식의 검색기 파라미터를 로컬 인덱스로 구성합니다.
+    """
+    index = get_local_index()
+    if namespace not in index.describe_index_stats()["namespaces"]:
+        raise ValueError(f"로컬 인덱스에 '{namespace}' 네임스페이스가 없습니다.")
+    return {
+        "index": index,
+        "namespace": namespace,
+        "sparse_encoder": load_sparse_encoder(sparse_encoder_path, stopwords, tokenizer),
+        "embeddings": embeddings,
+        "top_k": top_k,
+        "alpha": alpha,
+    }
+
+
+def init_index(namespace, sparse_encoder_path, stopwords, embeddings, top_k, alpha, tokenizer="kiwi"):
+    """
+    VECTOR_BACKEND 설정에 따라 Pinecone 또는 로컬 인덱스로 검색기 파라미터를 생성합니다.
+    """
+    if get_vector_backend() == "local":
+        return init_local_index(
+            namespace=namespace,
+            sparse_encoder_path=sparse_encoder_path,
+            stopwords=stopwords,
+            tokenizer=tokenizer,
+            embeddings=embeddings,
+            top_k=top_k,
+            alpha=alpha,
+        )
+    return init_pinecone_params(
+        namespace=namespace,
+        sparse_encoder_path=sparse_encoder_path,
+        stopwords=stopwords,
+        tokenizer=tokenizer,
+        embeddings=embeddings,
+        top_k=top_k,
+        alpha=alpha,
+    )
+
+
+# 네임스페이스별 검색기 설정 (namespace, top_k, alpha)
+RETRIEVER_CONFIGS = [
+    ("cyclereports", 5, 0.5),
+    ("stockreports", 4, 0.5),
+    ("stocknews", 3, 0.5),
+]
+
+
 def setup_retrievers():
     """
     검색기 생성 및 설정
+    세 네임스페이스의 인덱스 연결과 sparse encoder 로딩은 서로 독립적이므로 동시에 수행합니다.
+    :return: (tuple) cycle, stock, news 검색기
     """
     stopwords_list = stopwords()  # 로컬 파일에서 불용어 리스트 로드
 
-    # Cycle 검색기 설정
-    cycle_params = init_pinecone_index(
-        index_name="seniormts",
-        namespace="cyclereports",
-        api_key=os.environ["PINECONE_API_KEY"],
-        sparse_encoder_path=str(BASE_DIR / "cyclereports_sparse_encoder.pkl"),
-        stopwords=stopwords_list,
-        tokenizer="kiwi",
-        embeddings=UpstageEmbeddings(model="solar-embedding-1-large-query"),
-        top_k=5,
-        alpha=0.5,
-    )
-    cycle_retriever = PineconeKiwiHybridRetriever(**cycle_params)
-
-    # Stock 검색기 설정
-    stock_params = init_pinecone_index(
-        index_name="seniormts",
-        namespace="stockreports",
-        api_key=os.environ["PINECONE_API_KEY"],
-        sparse_encoder_path=str(BASE_DIR / "stockreports_sparse_encoder.pkl"),
-        stopwords=stopwords_list,
-        tokenizer="kiwi",
-        embeddings=UpstageEmbeddings(model="solar-embedding-1-large-query"),
-        top_k=4,
-        alpha=0.5,
+    # 세 검색기가 공유하는 질의 임베딩 (캐시 적용)
+    query_embeddings = CachedEmbeddings(
+        UpstageEmbeddings(model="solar-embedding-1-large-query"),
+        store_path=os.getenv("EMBEDDING_CACHE_PATH"),
     )
-    stock_retriever = PineconeKiwiHybridRetriever(**stock_params)
-
-    # News 검색기 설정
-    news_params = init_pinecone_index(
-        index_name="seniormts",
-        namespace="stocknews",
-        api_key=os.environ["PINECONE_API_KEY"],
-        sparse_encoder_path=str(BASE_DIR / "stocknews_sparse_encoder.pkl"),
-        stopwords=stopwords_list,
-        tokenizer="kiwi",
-        embeddings=UpstageEmbeddings(model="solar-embedding-1-large-query"),
-        top_k=3,
-        alpha=0.5,
-    )
-    news_retriever = PineconeKiwiHybridRetriever(**news_params)
+
+    def build(namespace, top_k, alpha):
+        params = init_index(
+            namespace=namespace,
+            sparse_encoder_path=str(BASE_DIR / f"{namespace}_sparse_encoder.pkl"),
+            stopwords=stopwords_list,
+            embeddings=query_embeddings,
+            top_k=top_k,
+            alpha=alpha,
+        )
+        return PineconeKiwiHybridRetriever(**params)
+
+    with ThreadPoolExecutor(max_workers=len(RETRIEVER_CONFIGS), thread_name_prefix="retriever-init") as executor:
+        futures = [executor.submit(build, *config) for config in RETRIEVER_CONFIGS]
+        cycle_retriever, stock_retriever, news_retriever = [future.result() for future in futures]
 
     return cycle_retriever, stock_retriever, news_retriever
+
+
+# 네임스페이스 병렬 검색용 스레드 풀
+_search_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="namespace-search")
+
+
+def hybrid_convex_scale(dense_vec, sparse_vec, alpha):
+    """
+    dense/sparse 벡터에 alpha 가중치를 적용합니다. (alpha=1 이면 dense 만 사용)
+    """
+    scaled_sparse = {
+        "indices": sparse_vec["indices"],
+        "values": [value * (1 - alpha) for value in sparse_vec["values"]],
+    }
+    scaled_dense = [value * alpha for value in dense_vec]
+    return scaled_dense, scaled_sparse
+
+
+def query_namespace(retriever, query, dense_vec, top_k=None, filter=None):
+    """
+    이미 계산된 dense 벡터로 검색기 하나의 네임스페이스를 조회합니다.
+    sparse 벡터는 네임스페이스마다 학습된 인코더가 다르므로 검색기별로 계산합니다.
+    :param top_k: (int) 가져올 결과 수 (기본값: 검색기의 top_k)
+    :param filter: (dict) 인덱스에서 적용할 메타데이터 필터
+    """
+    sparse_vec = retriever.sparse_encoder.encode_queries(query)
+    dense, sparse = hybrid_convex_scale(dense_vec, sparse_vec, retriever.alpha)
+    response = retriever.index.query(
+        vector=dense,
+        sparse_vector=sparse,
+        top_k=top_k or retriever.top_k,
+        include_metadata=True,
+        namespace=retriever.namespace,
+        filter=filter or None,
+    )
+    return [
+        Document(
+            page_content=match["metadata"]["context"],
+            metadata={**match["metadata"], "namespace": retriever.namespace, "score": match["score"]},
+        )
+        for match in response["matches"]
+    ]
+
+
+def reciprocal_rank_fusion(result_lists, k=60):
+    """
+    여러 검색 결과를 Reciprocal Rank Fusion 으로 병합합니다.
+    :param result_lists: (list) 네임스페이스별 Document 리스트
+    :param k: (int) RRF 상수
+    :return: (list) 점수 순으로 정렬된 Document 리스트 (중복 제거)
+    """
+    scores = {}
+    documents = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results):
+            key = doc.page_content
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank + 1)
+            documents.setdefault(key, doc)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [documents[key] for key in ranked]
+
+
+class MultiNamespaceRetriever(BaseRetriever):
+    """
+    여러 PineconeKiwiHybridRetriever 를 한 번에 검색하는 검색기입니다.
+    질의 임베딩은 한 번만 계산하고, 각 네임스페이스는 자신의 top_k 로 동시에 조회한 뒤
+    Reciprocal Rank Fusion 으로 결과를 병합합니다.
+    """
+
+    retrievers: List[Any]
+    rrf_k: int = 60
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        dense_vec = self.retrievers[0].embeddings.embed_query(query)
+        futures = [
+            _search_executor.submit(query_namespace, retriever, query, dense_vec)
+            for retriever in self.retrievers
+        ]
+        return reciprocal_rank_fusion([future.result() for future in futures], k=self.rrf_k)
+
+
+def setup_multi_retriever(*retrievers):
+    """
+    주어진 검색기들을 동시에 조회하는 통합 검색기를 생성합니다.
+    """
+    return MultiNamespaceRetriever(retrievers=list(retrievers))
+
+
+# 뉴스 검색: 기사 시각(epoch 초) 메타데이터 키, 후보 배수, 최신성 반감기(시간)
+NEWS_TIMESTAMP_KEY = "published_at"
+NEWS_CANDIDATE_FACTOR = 3
+NEWS_HALF_LIFE_HOURS = float(os.getenv("NEWS_HALF_LIFE_HOURS", "72"))
+
+
+def news_filter(start=None, end=None, keywords=None):
+    """
+    기간과 키워드 조건을 인덱스 메타데이터 필터로 변환합니다.
+    :param start: (float) 시작 시각 (epoch 초, 포함)
+    :param end: (float) 종료 시각 (epoch 초, 포함)
+    :param keywords: (list) 기사 keyword 메타데이터 후보 (하나라도 일치하면 포함)
+    :return: (dict) 메타데이터 필터 (조건이 없으면 None)
+    """
+    conditions = []
+    if start is not None or end is not None:
+        time_range = {}
+        if start is not None:
+            time_range["$gte"] = int(start)
+        if end is not None:
+            time_range["$lte"] = int(end)
+        conditions.append({NEWS_TIMESTAMP_KEY: time_range})
+    if keywords:
+        conditions.append({"keyword": {"$in": list(keywords)}})
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def _published_at(metadata):
+    """
+    문서의 기사 시각(epoch 초)을 반환합니다. 숫자 시각이 없는 예전 벡터는 time 문자열(KST)을 사용합니다.
+    """
+    timestamp = metadata.get(NEWS_TIMESTAMP_KEY)
+    if timestamp:
+        return float(timestamp)
+    try:
+        return datetime.strptime(str(metadata.get("time")), "%Y-%m-%d %H:%M:%S").replace(tzinfo=KST).timestamp()
+    except ValueError:
+        return None
+
+
+def recency_rerank(documents, half_life_hours=NEWS_HALF_LIFE_HOURS, now=None):
+    """
+    검색 점수에 최신성 감쇠(half_life_hours 마다 절반)를 곱해 다시 정렬합니다.
+    시각을 알 수 없는 문서는 감쇠 없이 원래 점수를 사용합니다.
+    """
+    now = now or time.time()
+    scored = []
+    for doc in documents:
+        published = _published_at(doc.metadata)
+        score = doc.metadata.get("score", 0.0)
+        if published is not None and half_life_hours:
+            age_hours = max(now - published, 0) / 3600
+            score *= 0.5 ** (age_hours / half_life_hours)
+        scored.append((score, doc))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [doc for _, doc in scored]
+
+
+def search_news(retriever, query, start=None, end=None, keywords=None, top_k=None,
+                half_life_hours=NEWS_HALF_LIFE_HOURS):
+    """
+    뉴스 네임스페이스를 기간/키워드 필터와 함께 조회하고 최신순 가중치로 다시 정렬합니다.
+    필터는 인덱스에서 적용되므로 조건에 맞지 않는 기사는 후보에 들어오지 않습니다.
+    :param retriever: (PineconeKiwiHybridRetriever) 뉴스 검색기
+    :param start: (float) 시작 시각 (epoch 초)
+    :param end: (float) 종료 시각 (epoch 초)
+    :param keywords: (list) 종목명/별칭 키워드
+    :param top_k: (int) 반환할 문서 수 (기본값: 검색기의 top_k)
+    :return: (list) Document 리스트
+    """
+    top_k = top_k or retriever.top_k
+    dense_vec = retriever.embeddings.embed_query(query)
+    candidates = query_namespace(
+        retriever, query, dense_vec,
+        top_k=top_k * NEWS_CANDIDATE_FACTOR,
+        filter=news_filter(start, end, keywords),
+    )
+    return recency_rerank(candidates, half_life_hours)[:top_k]
@@ -0,0 +1,96 @@
+import re
+import threading
+from datetime import datetime, timedelta
+
+from utils.tickers import get_ticker_resolver, mentions_market_index
+
+# 단순 주가 질문을 나타내는 표현
+PRICE_KEYWORDS = ("주가", "시세", "가격", "얼마", "종가")
+
+# 분석, 기간, 비교 등이 필요한 질문은 에이전트로 보냄
+AGENT_KEYWORDS = (
+    "왜", "이유", "전망", "예상", "뉴스", "리포트", "분석", "추천", "비교", "사야", "팔아", "살까", "팔까",
+    "경기", "지난", "동안", "최근", "주일", "개월", "달", "년", "평균", "변동", "거래량", "인터넷",
+)
+
+
+class RouteStats:
+    """
+    경로별 요청 수와 지연 시간 통계
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, seconds):
+        with self._lock:
+            count, total = self._routes.get(route, (0, 0.0))
+            self._routes[route] = (count + 1, total + seconds)
+
+    def stats(self):
+        with self._lock:
+            requests = sum(count for count, _ in self._routes.values())
+            return {
+                route: {
+                    "requests": count,
+                    "share": count / requests,
+                    "avg_latency": total / count,
+                }
+                for route, (count, total) in self._routes.items()
+            }
+
+
+route_stats = RouteStats()
+
+
+def route_query(user_input):
+    """
+    질문을 처리할 경로를 결정합니다.
+    LLM 검증 없이 바로 답하므로 종목 하나가 정확히 일치할 때만 'price' 로 보냅니다.
+    (퍼지 보정, 여러 종목, 지수 질문은 에이전트로)
+    :return: (tuple) ('price', 종목 코드, 종목명) 또는 ('agent', None, None)
+    """
+    if not any(keyword in user_input for keyword in PRICE_KEYWORDS):
+        return "agent", None, None
+    if any(keyword in user_input for keyword in AGENT_KEYWORDS) or re.search(r"\d+\s*(일|주|월)", user_input):
+        return "agent", None, None
+
+    if mentions_market_index(user_input):
+        return "agent", None, None
+
+    stocks = get_ticker_resolver().find(user_input)
+    if len(stocks) != 1:
+        return "agent", None, None
+    code, name, fuzzy = stocks[0]
+    if fuzzy:
+        return "agent", None, None
+    return "price", code, name
+
+
+def answer_price(code, name):
+    """
+    최근 거래일 종가와 전일 대비 등락을 음성 응답용 문장으로 만듭니다. (LLM 미사용)
+    """
+    # 도구 모듈(LangChain 등)은 시세 조회 시점에 불러옴 (route_query 는 종목 사전만 사용)
+    from tools import get_daily_prices
+
+    today = datetime.now()
+    start_time = (today - timedelta(days=14)).strftime("%Y%m%d")
+    prices = get_daily_prices(code, start_time, today.strftime("%Y%m%d"))
+    if len(prices) == 0:
+        return f"{name}의 최근 주가 정보를 찾지 못했어요."
+
+    date, close = str(prices[-1]["date"]), int(prices[-1]["close"])
+    spoken_date = f"{int(date[4:6])}월 {int(date[6:8])}일"
+    answer = f"{name}의 {spoken_date} 주가는 {close:,}원이에요."
+    if len(prices) >= 2:
+        previous = int(prices[-2]["close"])
+        diff = close - previous
+        if diff == 0:
+            answer += " 전날과 같은 가격이에요."
+        else:
+            direction = "올랐어요" if diff > 0 else "내렸어요"
+            answer += f" 전날보다 {abs(diff):,}원, {abs(diff) / previous * 100:.1f}퍼센트 {direction}."
+    return answer
+
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 모듈을 src 기준으로 import (python -m pytest tests 를 src 에서 실행)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,60 @@
+import pytest
+
+from utils.price_store import PriceStore
+
+HEADER = ['날짜', '시가', '고가', '저가', '종가', '거래량', '외국인소진율']
+
+
+class FakeNaver:
+    """
+    요청 범위의 모든 날짜에 일봉을 돌려주는 fetch 함수. fail 이 참이면 빈 응답을 반환합니다.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, code, start_time, end_time, time_from):
+        self.calls.append((start_time, end_time))
+        if self.fail:
+            return []
+        rows = []
+        day = int(start_time)
+        while day <= int(end_time):
+            rows.append([str(day), 100, 110, 90, 105, 1000, 50.0])
+            day += 1
+        return [HEADER] + rows
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(FakeNaver(), path=str(tmp_path))
+
+
+def test_empty_fetch_does_not_create_files_or_coverage(store, tmp_path):
+    store.fetch.fail = True
+    assert len(store.get("999999", "20240101", "20240105")) == 0
+    assert not list(tmp_path.glob("999999.npy")) and not list(tmp_path.glob("999999.json"))
+
+    # 일시적 오류가 끝나면 같은 구간을 다시 요청
+    store.fetch.fail = False
+    assert len(store.get("999999", "20240101", "20240105")) == 5
+    assert store.fetch.calls == [("20240101", "20240105")] * 2
+
+
+def test_failed_extension_keeps_previous_coverage(store):
+    store.get("005930", "20240110", "20240115")
+
+    store.fetch.fail = True
+    store.get("005930", "20240101", "20240120")
+    assert store._coverage["005930"] == ("20240110", "20240115")
+
+    store.fetch.fail = False
+    assert len(store.get("005930", "20240101", "20240120")) == 20
+    assert store._coverage["005930"] == ("20240101", "20240120")
+
+
+def test_covered_range_is_not_refetched(store):
+    store.get("005930", "20240101", "20240120")
+    store.get("005930", "20240105", "20240110")
+    assert store.fetch.calls == [("20240101", "20240120")]
@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("dotenv")
+
+from router import route_query
+
+
+@pytest.mark.parametrize("query, code", [
+    ("삼성전자 주가 얼마야", "005930"),
+    ("셀트리온 시세 알려줘", "068270"),
+    ("카카오 종가 얼마예요", "035720"),
+])
+def test_exact_single_stock_goes_to_price(query, code):
+    route, stock_code, _ = route_query(query)
+    assert (route, stock_code) == ("price", code)
+
+
+@pytest.mark.parametrize("query", [
+    "오늘 코스피 얼마야?",
+    "코스닥 지수 얼마야",
+    "아파트 가격 얼마야",
+    "삼송전자 주가 얼마야",
+    "삼성전자랑 SK하이닉스 주가 얼마야",
+    "삼성전자 주가 전망 알려줘",
+    "삼성전자 3일 동안 주가",
+])
+def test_fuzzy_index_and_ambiguous_queries_go_to_agent(query):
+    assert route_query(query) == ("agent", None, None)
@@ -0,0 +1,135 @@
+import threading
+from ast import literal_eval
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.request import urlopen
+
+import pytest
+
+from utils.sise_cache import SiseCache, now_kst
+
+HEADER = "[['날짜', '시가', '고가', '저가', '종가', '거래량', '외국인소진율']"
+
+
+def sise_body(start_time, end_time):
+    """
+    네이버 siseJson 과 같은 형식으로 [start_time, end_time] 평일 일봉을 만듭니다.
+    """
+    lines = [HEADER]
+    day = datetime.strptime(start_time, "%Y%m%d")
+    last = datetime.strptime(end_time, "%Y%m%d")
+    while day <= last:
+        if day.weekday() < 5:
+            close = 70000 + day.timetuple().tm_yday * 10
+            lines.append(f'["{day:%Y%m%d}", {close}, {close + 500}, {close - 500}, {close}, 1000000, 55.1]')
+        day += timedelta(days=1)
+    return "\n" + ",\n".join(lines) + "]\n"
+
+
+class _SiseHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        self.server.requests.append(params)
+        body = sise_body(params["startTime"], params["endTime"]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def naver_stub():
+    """
+    로컬 HTTP 서버로 네이버 siseJson 을 대신하고, 받은 요청 파라미터를 기록합니다.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SiseHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fetch_sise(naver_stub):
+    """
+    tools.fetch_sise 와 같은 파라미터로 로컬 서버를 조회하는 fetch 함수
+    (tools 는 LangChain/Pinecone 등을 함께 import 하므로 캐시만 따로 검증)
+    """
+    url = f"http://127.0.0.1:{naver_stub.server_port}/siseJson.naver"
+
+    def fetch(code, start_time, end_time, time_from='day'):
+        query = urlencode({
+            'symbol': code,
+            'requestType': 1,
+            'startTime': start_time,
+            'endTime': end_time,
+            'timeframe': time_from,
+        })
+        with urlopen(f"{url}?{query}", timeout=5) as response:
+            return [list(row) for row in literal_eval(response.read().decode("utf-8").strip())]
+
+    return fetch
+
+
+def test_stub_serves_requested_range(naver_stub, fetch_sise):
+    data = fetch_sise("005930", "20240102", "20240105")
+    assert data[0] == ["날짜", "시가", "고가", "저가", "종가", "거래량", "외국인소진율"]
+    assert [row[0] for row in data[1:]] == ["20240102", "20240103", "20240104", "20240105"]
+    assert naver_stub.requests[0]["symbol"] == "005930"
+
+
+def test_shorter_range_served_from_memory(naver_stub, fetch_sise):
+    cache = SiseCache(fetch_sise)
+    month = cache.get("005930", "20240101", "20240131")
+    week = cache.get("005930", "20240122", "20240128")
+
+    assert len(naver_stub.requests) == 1
+    assert week == [month[0]] + [row for row in month[1:] if "20240122" <= row[0] <= "20240128"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_overlapping_ranges_fetch_only_missing_days(naver_stub, fetch_sise):
+    cache = SiseCache(fetch_sise)
+    cache.get("005930", "20240101", "20240110")
+    merged = cache.get("005930", "20240105", "20240120")
+
+    assert len(naver_stub.requests) == 2
+    assert (naver_stub.requests[1]["startTime"], naver_stub.requests[1]["endTime"]) == ("20240111", "20240120")
+    assert [row[0] for row in merged[1:]] == [
+        row[0] for row in literal_eval(sise_body("20240105", "20240120").strip())[1:]
+    ]
+
+    # 병합된 구간 안의 조회는 더 이상 요청하지 않음
+    cache.get("005930", "20240103", "20240118")
+    assert len(naver_stub.requests) == 2
+
+
+def test_today_candle_expires_after_ttl(naver_stub, fetch_sise):
+    today = now_kst().strftime("%Y%m%d")
+    cache = SiseCache(fetch_sise, today_ttl=3600, closed_ttl=3600)
+    cache.get("005930", today, today)
+    cache.get("005930", today, today)
+    assert len(naver_stub.requests) == 1
+
+    expired = SiseCache(fetch_sise, today_ttl=0, closed_ttl=0)
+    expired.get("005930", today, today)
+    expired.get("005930", today, today)
+    assert len(naver_stub.requests) == 3
+
+
+def test_weekly_lookups_cached_by_exact_key(naver_stub, fetch_sise):
+    cache = SiseCache(fetch_sise)
+    cache.get("005930", "20240101", "20240331", "week")
+    cache.get("005930", "20240101", "20240331", "week")
+    cache.get("005930", "20240101", "20240228", "week")
+
+    assert [request["timeframe"] for request in naver_stub.requests] == ["week", "week"]
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,66 @@
+import csv
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from utils.tickers import STOCK_CODE, TICKER_CSV, TickerResolver, mentions_market_index
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return TickerResolver()
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("셀트리온 주가", "068270"),
+    ("셀트리온주가 알려줘", "068270"),
+    ("셀트리온제약 주가", "068760"),
+    ("카카오의 주가", "035720"),
+    ("카카오게임즈 주가", "293490"),
+    ("에코프로비엠 얼마야", "247540"),
+    ("005930 시세", "005930"),
+    ("삼송전자 주가", "005930"),
+    ("미래에셋증권2우B 주가", "00680K"),
+])
+def test_find_resolves_company(resolver, query, expected):
+    assert [code for code, _, _ in resolver.find(query)] == [expected]
+
+
+@pytest.mark.parametrize("query, fuzzy", [
+    ("삼성전자 주가", False),
+    ("삼송전자 주가", True),
+    ("셀트리옹 주가", True),
+])
+def test_find_flags_fuzzy_matches(resolver, query, fuzzy):
+    assert [match[2] for match in resolver.find(query)] == [fuzzy]
+
+
+@pytest.mark.parametrize("query", [
+    "카카오톡 회사 주가",
+    "0059301",
+    "오늘 코스피 얼마야?",
+    "코스닥 지수 얼마야",
+    "아파트 가격 얼마야",
+])
+def test_find_rejects_partial_names_and_common_words(resolver, query):
+    assert resolver.find(query) == []
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("오늘 코스피 얼마야?", True),
+    ("코스닥 지수 얼마야", True),
+    ("다우기술 주가", False),
+    ("삼성전자 주가", False),
+])
+def test_mentions_market_index(query, expected):
+    assert mentions_market_index(query) is expected
+
+
+def test_listing_codes_are_valid_and_unique():
+    with open(TICKER_CSV, "r", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    codes = [row["code"] for row in rows]
+    assert all(STOCK_CODE.fullmatch(code) for code in codes)
+    assert len(codes) == len(set(codes))
+    assert {row["market"] for row in rows} == {"KOSPI", "KOSDAQ"}
@@ -0,0 +1,42 @@
+import json
+import time
+
+import pytest
+
+from utils.manifest import ChunkManifest
+from utils.upsert import TokenBucket, rate_limiter_from_env
+
+
+def test_token_bucket_below_one_request_per_second_does_not_hang():
+    bucket = TokenBucket(4)
+    slow = TokenBucket(0.5)
+    started = time.monotonic()
+    bucket.acquire()
+    slow.acquire()
+    assert time.monotonic() - started < 1
+
+
+@pytest.mark.parametrize("value", ["abc", "-1", "nan", "inf"])
+def test_rate_limiter_from_env_rejects_invalid_values(monkeypatch, value):
+    monkeypatch.setenv("EMBED_RATE_LIMIT", value)
+    with pytest.raises(ValueError):
+        rate_limiter_from_env("EMBED_RATE_LIMIT")
+
+
+def test_rate_limiter_from_env_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("EMBED_RATE_LIMIT", raising=False)
+    assert rate_limiter_from_env("EMBED_RATE_LIMIT") is None
+
+
+def test_manifest_save_keeps_previous_checkpoint_on_failure(tmp_path):
+    path = tmp_path / "manifest.json"
+    manifest = ChunkManifest(path, "stocknews")
+    manifest.chunks = {"hash-1": "id-1"}
+    manifest.save()
+
+    # 직렬화 도중 실패해도 이전 체크포인트가 남고 임시 파일은 정리됨
+    manifest.chunks = {"hash-2": object()}
+    with pytest.raises(TypeError):
+        manifest.save()
+    assert json.loads(path.read_text(encoding="utf-8"))["chunks"] == {"hash-1": "id-1"}
+    assert [p.name for p in tmp_path.iterdir()] == ["manifest.json"]
@@ -1,16 +1,16 @@
-from langchain.tools.retriever import create_retriever_tool
-
-from langchain_community.tools.tavily_search import TavilySearchResults
-from langchain.tools.retriever import create_retriever_tool
-
-from urllib import parse
-from ast import literal_eval
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
-from langchain.tools import Tool
-from langchain_community.tools.tavily_search import TavilySearchResults
-from langchain_community.vectorstores import FAISS
+from langchain.tools import Tool, StructuredTool
 from langchain.tools.retriever import create_retriever_tool
+from retrievers import setup_multi_retriever, search_news
+from utils.concurrency import run_blocking
+from utils.sise_cache import SiseCache, now_kst, KST
+from utils.tickers import get_ticker_resolver, STOCK_CODE
+from utils.price_store import PriceStore, rows_to_array
+from analytics import describe_prices, format_price_table
 
 
 # 1. 기본 날짜 범위를 계산하는 함수
@@ -24,9 +24,68 @@ def get_default_date_range():
 
 
 # 2. 실시간 주가 및 거래량 데이터를 가져오는 함수
-def get_sise(code, start_time, end_time, time_from='day'):
+SISE_URL = "https://api.finance.naver.com/siseJson.naver"
+SISE_TIMEOUT = (3.05, 10)  # (연결, 읽기) 타임아웃(초)
+
+
+def create_http_session(pool_maxsize=16, retries=3, backoff_factor=0.3):
     """
-    실시간 주가 및 거래량 데이터를 가져오는 함수
+    keep-alive 연결을 재사용하고 실패 시 지수 백오프로 재시도하는 HTTP 세션을 생성합니다.
+    :param pool_maxsize: (int) 호스트당 유지할 최대 연결 수
+    :param retries: (int) 최대 재시도 횟수
+    :param backoff_factor: (float) 재시도 간 대기 시간 계수
+    :return: (requests.Session) HTTP 세션
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# 모듈 전역 HTTP 세션 (연결 풀 공유)
+http_session = create_http_session()
+
+_SISE_HEADER = re.compile(r"\[\s*\[([^\[\]]*)\]")
+_SISE_ROW = re.compile(r'\[\s*"(\d{8})"\s*,([^\[\]]*)\]')
+
+
+def _to_number(value):
+    value = value.strip()
+    if not value or value == "null":
+        return None
+    if "." in value:
+        return float(value)
+    return int(value)
+
+
+def parse_sise(text):
+    """
+    네이버 siseJson 응답 텍스트를 [header, *rows] 형태로 변환합니다.
+    literal_eval 대신 정규식으로 행 단위 파싱하며, 날짜는 문자열, 나머지는 숫자로 변환합니다.
+    :param text: (str) 응답 본문
+    :return: (list) 주가 및 거래량 데이터 (데이터가 없으면 빈 리스트)
+    """
+    header_match = _SISE_HEADER.search(text)
+    if header_match is None:
+        return []
+    header = [column.strip().strip("'\"") for column in header_match.group(1).split(",")]
+
+    rows = [header]
+    for match in _SISE_ROW.finditer(text, header_match.end()):
+        rows.append([match.group(1)] + [_to_number(value) for value in match.group(2).split(",")])
+    return rows
+
+
+def fetch_sise(code, start_time, end_time, time_from='day'):
+    """
+    네이버 금융 API 에서 주가 및 거래량 데이터를 직접 조회합니다. (캐시 미사용)
     :param code: (str) 종목 코드 (e.g., '005930' for 삼성전자)
     :param start_time: (str) 시작 날짜 (YYYYMMDD 형식)
     :param end_time: (str) 종료 날짜 (YYYYMMDD 형식)
@@ -40,33 +99,176 @@ def get_sise(code, start_time, end_time, time_from='day'):
         'endTime': end_time,
         'timeframe': time_from
     }
-    get_param = parse.urlencode(get_param)
-    url = f"https://api.finance.naver.com/siseJson.naver?{get_param}"
-    response = requests.get(url)
-    return literal_eval(response.text.strip())
+    response = http_session.get(SISE_URL, params=get_param, timeout=SISE_TIMEOUT)
+    response.raise_for_status()
+    return parse_sise(response.text)
+
+
+# 시세 캐시 (지난 거래일은 영구 보관, 오늘 일봉은 짧은 TTL)
+sise_cache = SiseCache(fetch_sise)
+
+
+def get_sise(code, start_time, end_time, time_from='day'):
+    """
+    실시간 주가 및 거래량 데이터를 가져오는 함수 (캐시 적용)
+    :param code: (str) 종목 코드 (e.g., '005930' for 삼성전자)
+    :param start_time: (str) 시작 날짜 (YYYYMMDD 형식)
+    :param end_time: (str) 종료 날짜 (YYYYMMDD 형식)
+    :param time_from: (str) 날짜 간격 ('day', 'week', 'month' 중 하나)
+    :return: (list) 주가 및 거래량 데이터
+    """
+    return sise_cache.get(code, start_time, end_time, time_from)
+
+
+# 로컬 일봉 저장소 (확정된 일봉은 디스크에 보관하고 빠진 날짜만 조회)
+price_store = PriceStore(fetch_sise)
+
+
+def get_daily_prices(code, start_time, end_time):
+    """
+    로컬 저장소에서 일봉을 조회합니다. 오늘 일봉은 시세 캐시를 통해 가져옵니다.
+    :return: (np.ndarray) 날짜, 시가, 고가, 저가, 종가, 거래량, 외국인소진율 구조화 배열
+    """
+    today = now_kst().strftime("%Y%m%d")
+    return price_store.get(
+        code, start_time, end_time,
+        today_rows=lambda: get_sise(code, today, today)[1:],
+    )
 
 
 # 3. 실시간 주가 수집 도구
-def real_time_stock_tool(code, start_time=None, end_time=None, time_from='day'):
+def real_time_stock_tool(code: str, start_time: str = None, end_time: str = None, time_from: str = 'day',
+                         columns: str = None):
     """
     Retrieve real-time stock price and volume data.
     If no dates are provided, ask to user.
+    Long ranges are aggregated to weekly/monthly rows and capped at PRICE_MAX_ROWS rows.
     """
     if not start_time or not end_time:
         start_time, end_time = get_default_date_range()
 
-    data = get_sise(code, start_time, end_time, time_from)
-    if not data:
+    # 종목명/별칭이 들어오면 종목 코드로 변환
+    code = code.strip().upper()
+    if not STOCK_CODE.fullmatch(code):
+        resolved = get_ticker_resolver().resolve(code)
+        if resolved is None:
+            return f"Could not find a listed company matching '{code}'."
+        code = resolved
+
+    # 일봉은 로컬 저장소, 주봉/월봉은 시세 캐시에서 조회
+    if time_from == 'day':
+        prices = get_daily_prices(code, start_time, end_time)
+    else:
+        prices = rows_to_array(get_sise(code, start_time, end_time, time_from)[1:])
+    if len(prices) == 0:
         return "No data available for the given stock code and time range."
 
-    # 표 데이터를 문자열로 변환
-    header = data[0]
-    rows = data[1:]
-    formatted_data = [", ".join(map(str, header))]
-    for row in rows:
-        formatted_data.append(", ".join(map(str, row)))
+    # 필요한 컬럼만, 행 수 상한 안에서 표 문자열로 변환 (긴 기간은 주봉/월봉으로 집계)
+    return format_price_table(prices, columns=columns, period=time_from)
+
 
-    return "\n".join(formatted_data)
+# 4. 주가 분석 도구
+def stock_analytics_tool(code: str, start_time: str = None, end_time: str = None):
+    """
+    Summarize returns, moving averages, high/low, volatility and volume change for a period.
+    If no dates are provided, the last 30 days are used.
+    """
+    if not start_time or not end_time:
+        today = datetime.now()
+        start_time = (today - timedelta(days=30)).strftime("%Y%m%d")
+        end_time = today.strftime("%Y%m%d")
+
+    resolver = get_ticker_resolver()
+    code = code.strip().upper()
+    if not STOCK_CODE.fullmatch(code):
+        resolved = resolver.resolve(code)
+        if resolved is None:
+            return f"Could not find a listed company matching '{code}'."
+        code = resolved
+    name = resolver.names.get(code, code)
+
+    return describe_prices(name, get_daily_prices(code, start_time, end_time))
+
+
+async def areal_time_stock_tool(code: str, start_time: str = None, end_time: str = None, time_from: str = 'day',
+                                columns: str = None):
+    """
+    real_time_stock_tool 의 비동기 버전입니다.
+    네이버 API 호출은 블로킹이므로 제한된 스레드 풀에서 실행합니다.
+    """
+    return await run_blocking(real_time_stock_tool, code, start_time, end_time, time_from, columns)
+
+
+async def astock_analytics_tool(code: str, start_time: str = None, end_time: str = None):
+    """
+    stock_analytics_tool 의 비동기 버전입니다.
+    """
+    return await run_blocking(stock_analytics_tool, code, start_time, end_time)
+
+
+# 5. 인터넷 검색 함수
+_tavily_search = None
+
+
+def get_tavily_search():
+    """
+    Tavily 검색 도구를 반환합니다. (처음 사용할 때 import 해서 서버 시작 시간을 줄임)
+    """
+    global _tavily_search
+    if _tavily_search is None:
+        from langchain_community.tools.tavily_search import TavilySearchResults
+
+        _tavily_search = TavilySearchResults(k=6)
+    return _tavily_search
+
+
+def internet_search(input):
+    """
+    Tavily 로 인터넷 검색을 수행합니다.
+    """
+    return get_tavily_search().run(input)
+
+
+async def ainternet_search(input):
+    """
+    Tavily 비동기 클라이언트로 인터넷 검색을 수행합니다.
+    """
+    return await get_tavily_search().arun(input)
+
+
+# 6. 뉴스 검색 함수 (기간/종목 필터 + 최신순 가중치)
+def _kst_timestamp(date, end_of_day=False):
+    """
+    YYYYMMDD 날짜를 KST 기준 epoch 초로 변환합니다.
+    """
+    day = datetime.strptime(date, "%Y%m%d").replace(tzinfo=KST)
+    if end_of_day:
+        day += timedelta(days=1, seconds=-1)
+    return day.timestamp()
+
+
+def news_search_tool(news_retriever, query, start_time=None, end_time=None, keyword=None):
+    """
+    Search stock news, optionally limited to a date range and a company.
+    """
+    start = _kst_timestamp(start_time) if start_time else None
+    end = _kst_timestamp(end_time, end_of_day=True) if end_time else None
+    keywords = get_ticker_resolver().keywords(keyword) if keyword else None
+
+    documents = search_news(news_retriever, query, start=start, end=end, keywords=keywords)
+    if not documents:
+        return "No news found for the given conditions."
+    return "\n\n".join(
+        f"[{doc.metadata.get('time', '')}] {doc.metadata.get('title', '')}\n{doc.page_content}"
+        for doc in documents
+    )
+
+
+async def anews_search_tool(news_retriever, query, start_time=None, end_time=None, keyword=None):
+    """
+    news_search_tool 의 비동기 버전입니다.
+    """
+    return await run_blocking(news_search_tool, news_retriever, query, start_time, end_time, keyword)
 
 
 def setup_tools(cycle_retriever, stock_retriever, news_retriever):
@@ -75,19 +277,24 @@ def setup_tools(cycle_retriever, stock_retriever, news_retriever):
     """
     tools = []
 
-    # 1. 실시간 주가 수집 도구
-    real_time_stock_tool_instance = Tool.from_function(
+    # 1. 실시간 주가 수집 도구 (기간, 봉 단위, 컬럼을 인자로 받도록 구조화 도구 사용)
+    real_time_stock_tool_instance = StructuredTool.from_function(
         func=real_time_stock_tool,
+        coroutine=areal_time_stock_tool,
         name="real_time_stock_data",  # 공백 없는 유효한 이름
         description=(
             "When using the 'real_time_stock_data' tool, only stock prices should be displayed, and no other information should be included in the output."
             "Retrieve accurate and up-to-date stock price and volume data for a given stock. "
             "If no date range is provided, defaults to the last 7 days. "
             "Parameters:\n"
-            "- `code`: Stock code (e.g., Samsung Electronics: '005930').\n"
+            "- `code`: Stock code (e.g., Samsung Electronics: '005930'). "
+            "A company name or common alias (e.g., '삼성전자', '하이닉스') is also accepted and resolved to its code.\n"
             "- `start_time`: Start date in YYYYMMDD format.\n"
             "- `end_time`: End date in YYYYMMDD format.\n"
             "- `time_from`: Timeframe ('day', 'week', 'month').\n"
+            "- `columns`: Comma-separated columns to return ('open', 'high', 'low', 'close', 'volume', 'foreign_ratio'). "
+            "Defaults to 'close,volume'; request only what the question needs.\n"
+            "Long ranges are automatically summarized into weekly or monthly rows, and only the most recent rows are kept.\n"
             "This tool is the most accurate and reliable source for stock data.\n\n"
             "Examples of stock codes for KOSPI top 30 companies:\n"
             "2. SK Hynix (000660)\n"
@@ -101,7 +308,8 @@ def setup_tools(cycle_retriever, stock_retriever, news_retriever):
 
     # 2. Tavily 인터넷 검색 도구
     internet_search_tool = Tool.from_function(
-        func=lambda input: TavilySearchResults(k=6).run(input),  # 람다 함수로 명시적 호출
+        func=internet_search,
+        coroutine=ainternet_search,
         name="real_time_internet_search",  # 공백 없는 유효한 이름
         description=(
             "Use this tool to search for information from the web when relevant data cannot be found in the documents. "
@@ -129,12 +337,57 @@ def setup_tools(cycle_retriever, stock_retriever, news_retriever):
     )
     tools.append(stock_search_tool)
 
-    # 5. News search tool
-    news_search_tool = create_retriever_tool(
-        news_retriever,
+    # 5. News search tool (기간/종목 필터는 인덱스에서 적용하고, 최신 기사에 가중치)
+    def search_stock_news(query: str, start_time: str = None, end_time: str = None, keyword: str = None):
+        return news_search_tool(news_retriever, query, start_time, end_time, keyword)
+
+    async def asearch_stock_news(query: str, start_time: str = None, end_time: str = None, keyword: str = None):
+        return await anews_search_tool(news_retriever, query, start_time, end_time, keyword)
+
+    news_search_tool_instance = StructuredTool.from_function(
+        func=search_stock_news,
+        coroutine=asearch_stock_news,
         name="news_information_search",  # 공백 없는 유효한 이름
-        description="Use this tool to search information about the news related to the stock in question.",
+        description=(
+            "Use this tool to search information about the news related to the stock in question. "
+            "Recent articles are ranked higher. "
+            "Parameters:\n"
+            "- `query`: What to search for.\n"
+            "- `start_time`: Only articles on or after this date, YYYYMMDD (e.g., today's date for '오늘 뉴스').\n"
+            "- `end_time`: Only articles on or before this date, YYYYMMDD.\n"
+            "- `keyword`: Company name or stock code to restrict the news to (e.g., '삼성전자', '005930')."
+        ),
+    )
+    tools.append(news_search_tool_instance)
+
+    # 6. 통합 검색 도구 (세 네임스페이스 동시 검색)
+    multi_search_tool = create_retriever_tool(
+        setup_multi_retriever(cycle_retriever, stock_retriever, news_retriever),
+        name="multi_namespace_search",  # 공백 없는 유효한 이름
+        description=(
+            "Use this tool to search economic cycle reports, stock analyst reports and stock news at once. "
+            "Prefer this tool over calling cycle_search, stock_information_search and news_information_search one by one "
+            "when the question may need more than one of them."
+        ),
+    )
+    tools.append(multi_search_tool)
+
+    # 7. 주가 분석 도구 (수익률, 이동평균, 변동성 등을 서버에서 계산, 기간을 인자로 받도록 구조화 도구 사용)
+    stock_analytics_tool_instance = StructuredTool.from_function(
+        func=stock_analytics_tool,
+        coroutine=astock_analytics_tool,
+        name="stock_price_analytics",  # 공백 없는 유효한 이름
+        description=(
+            "Use this tool when the user asks how a stock performed over a period, e.g. how much it rose or fell, "
+            "its moving average, highest or lowest price, volatility or trading volume trend. "
+            "It returns a short spoken-style summary with the numbers already calculated, "
+            "so do not recompute them from raw prices. "
+            "Parameters:\n"
+            "- `code`: Stock code or company name (e.g., '005930' or '삼성전자').\n"
+            "- `start_time`: Start date in YYYYMMDD format (defaults to 30 days ago).\n"
+            "- `end_time`: End date in YYYYMMDD format (defaults to today)."
+        )
     )
-    tools.append(news_search_tool)
+    tools.append(stock_analytics_tool_instance)
 
     return tools
@@ -0,0 +1,195 @@
+import re
+import threading
+import time
+
+import numpy as np
+
+from utils.embedding_cache import normalize_query
+from utils.tickers import get_ticker_resolver
+
+# 도구별 답변 유효 시간(초): 실시간 데이터일수록 짧게
+TOOL_TTLS = {
+    "real_time_stock_data": 60,
+    "stock_price_analytics": 60,
+    "real_time_internet_search": 600,
+    "news_information_search": 1800,
+    "multi_namespace_search": 1800,
+    "stock_information_search": 6 * 3600,
+    "cycle_search": 24 * 3600,
+}
+
+# 이전 대화에 따라 의미가 달라지는 표현 (이런 질문은 캐시하지 않음)
+CONTEXT_WORDS = (
+    "그거", "그것", "그건", "그게", "이거", "이것", "저거", "그 종목", "그 회사", "이 종목", "이 회사",
+    "거기", "아까", "방금", "위에", "앞에서", "그럼", "그러면", "다시", "더 자세히", "그때",
+)
+
+
+# 기간, 수량 등 답변을 바꾸는 숫자 ("3개월", "1.5%", "10,000원")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def query_entities(query):
+    """
+    임베딩 유사도만으로는 구분되지 않는 질문의 핵심 요소를 추출합니다.
+    ("삼성전자 주가 전망" 과 "SK하이닉스 주가 전망", "3개월" 과 "6개월" 은 유사도가 높아도 다른 질문)
+    :return: (tuple) (언급된 종목 코드, 숫자)
+    """
+    codes = tuple(sorted({code for code, _, _ in get_ticker_resolver().find(query)}))
+    numbers = tuple(number.replace(",", "") for number in _NUMBER.findall(query))
+    return codes, numbers
+
+
+class SemanticAnswerCache:
+    """
+    질의 임베딩 유사도 기반 답변 캐시입니다.
+
+    - 정규화된 질의가 같거나 코사인 유사도가 threshold 이상이면 저장된 답변을 반환합니다.
+    - scope(시간 구간 등)와 질문의 종목/숫자(query_entities)가 같은 항목만 매칭합니다.
+    - 답변 생성에 사용된 도구 중 가장 짧은 TTL 이 지나면 만료됩니다.
+    - 대화 맥락에 의존하는 질문(지시어 등)은 조회/저장하지 않습니다.
+    """
+
+    def __init__(self, embeddings, threshold=0.93, max_entries=1000, tool_ttls=None, default_ttl=300,
+                 entity_extractor=query_entities):
+        """
+        :param embeddings: (Embeddings) 질의 임베딩 모델 (CachedEmbeddings 권장)
+        :param threshold: (float) 캐시 적중으로 판단할 최소 코사인 유사도
+        :param max_entries: (int) 최대 보관 답변 수
+        :param tool_ttls: (dict) 도구 이름 -> 유효 시간(초)
+        :param default_ttl: (int) 도구를 사용하지 않은 답변의 유효 시간(초)
+        :param entity_extractor: (callable) 질문 -> 일치해야 하는 요소 (scope 에 추가)
+        """
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.tool_ttls = tool_ttls or TOOL_TTLS
+        self.default_ttl = default_ttl
+        self.entity_extractor = entity_extractor
+        self._entries = []    # 슬롯별 항목
+        self._matrix = None   # 슬롯별 정규화된 질의 벡터
+        self._exact = {}      # (scope, 정규화된 질의) -> 슬롯
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.saved_seconds = 0.0
+
+    def is_cacheable(self, query):
+        """
+        대화 맥락 없이도 의미가 정해지는 질문이면 True 를 반환합니다.
+        """
+        return not any(word in query for word in CONTEXT_WORDS)
+
+    def ttl_for(self, tools_used):
+        """
+        사용된 도구 중 가장 짧은 유효 시간을 반환합니다.
+        """
+        if not tools_used:
+            return self.default_ttl
+        return min(self.tool_ttls.get(tool, self.default_ttl) for tool in tools_used)
+
+    def _scope(self, query, scope):
+        """
+        호출한 쪽의 scope 에 질문의 종목/숫자를 더해 실제 매칭 범위를 만듭니다.
+        """
+        return scope, self.entity_extractor(query)
+
+    async def _embed(self, query):
+        vector = np.asarray(await self.embeddings.aembed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def alookup(self, query, scope):
+        """
+        캐시된 답변을 반환합니다. 없으면 None.
+        """
+        if not self.is_cacheable(query):
+            self.skipped += 1
+            return None
+
+        now = time.monotonic()
+        scope = self._scope(query, scope)
+        key = (scope, normalize_query(query))
+        with self._lock:
+            slot = self._exact.get(key)
+            if slot is not None and self._entries[slot]["expires_at"] > now:
+                return self._hit(slot, now)
+
+        vector = await self._embed(query)
+        with self._lock:
+            if self._matrix is not None and self._entries:
+                scores = self._matrix[:len(self._entries)] @ vector
+                for slot in np.argsort(-scores):
+                    if scores[slot] < self.threshold:
+                        break
+                    entry = self._entries[slot]
+                    if entry["scope"] == scope and entry["expires_at"] > now:
+                        return self._hit(slot, now)
+            self.misses += 1
+        return None
+
+    def _hit(self, slot, now):
+        entry = self._entries[slot]
+        entry["last_used"] = now
+        self.hits += 1
+        self.saved_seconds += entry["latency"]
+        return entry["output"]
+
+    async def astore(self, query, scope, output, tools_used=(), latency=0.0):
+        """
+        답변을 저장합니다.
+        :param tools_used: (list) 답변 생성에 사용된 도구 이름
+        :param latency: (float) 답변 생성에 걸린 시간(초) - 적중 시 절약 시간 통계에 사용
+        """
+        if not self.is_cacheable(query):
+            return
+        vector = await self._embed(query)
+        now = time.monotonic()
+        scope = self._scope(query, scope)
+        entry = {
+            "key": (scope, normalize_query(query)),
+            "scope": scope,
+            "output": output,
+            "expires_at": now + self.ttl_for(tools_used),
+            "last_used": now,
+            "latency": latency,
+        }
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+            slot = self._exact.get(entry["key"])
+            if slot is None:
+                slot = self._free_slot(now)
+            self._entries[slot] = entry
+            self._matrix[slot] = vector
+            self._exact[entry["key"]] = slot
+
+    def _free_slot(self, now):
+        """
+        빈 슬롯, 만료된 슬롯, 가장 오래 사용되지 않은 슬롯 순으로 자리를 확보합니다.
+        """
+        if len(self._entries) < self.max_entries:
+            self._entries.append(None)
+            return len(self._entries) - 1
+        expired = [i for i, entry in enumerate(self._entries) if entry["expires_at"] <= now]
+        slot = expired[0] if expired else min(range(len(self._entries)), key=lambda i: self._entries[i]["last_used"])
+        self._exact.pop(self._entries[slot]["key"], None)
+        return slot
+
+    def stats(self):
+        """
+        적중률과 절약한 지연 시간 통계를 반환합니다.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "skipped": self.skipped,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_seconds": self.saved_seconds,
+            "avg_saved_seconds": self.saved_seconds / self.hits if self.hits else 0.0,
+            "entries": len(self._entries),
+        }
@@ -0,0 +1,39 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# 블로킹 호출 전용 스레드 풀 (요청마다 이벤트 루프를 막지 않도록 분리)
+_executor = None
+
+
+def get_executor():
+    """
+    블로킹 작업용 스레드 풀을 반환합니다.
+    풀 크기는 BLOCKING_POOL_SIZE 환경 변수로 조정합니다. (기본값: 16)
+    """
+    global _executor
+    if _executor is None:
+        max_workers = int(os.getenv("BLOCKING_POOL_SIZE", "16"))
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="blocking")
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    동기 함수를 제한된 스레드 풀에서 실행하고 결과를 기다립니다.
+    :param func: 실행할 동기 함수
+    :return: 함수 실행 결과
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_executor():
+    """
+    스레드 풀을 종료합니다.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
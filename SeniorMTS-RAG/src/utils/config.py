@@ -1,8 +1,28 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
+# 프로젝트 데이터 디렉토리
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
 def load_environment():
     """
     환경 변수 로드
     """
     load_dotenv()
+
+
+def get_vector_backend():
+    """
+    벡터 인덱스 백엔드를 반환합니다. ('pinecone' 또는 'local')
+    VECTOR_BACKEND 환경 변수로 선택합니다. (기본값: 'pinecone')
+    """
+    return os.getenv("VECTOR_BACKEND", "pinecone").lower()
+
+
+def get_local_index_dir():
+    """
+    로컬 벡터 인덱스 저장 경로를 반환합니다.
+    LOCAL_INDEX_DIR 환경 변수로 변경할 수 있습니다. (기본값: data/local_index)
+    """
+    return Path(os.getenv("LOCAL_INDEX_DIR", DATA_DIR / "local_index"))
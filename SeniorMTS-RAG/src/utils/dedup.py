@@ -0,0 +1,121 @@
+import re
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+
+# 셔플 계수는 고정 시드로 만들어 실행마다 같은 청크가 남도록 함 (매니페스트 증분 업로드와 일관성 유지)
+_SEED = 20241122
+
+
+def shingle_hashes(text, k=5):
+    """
+    공백을 정리한 텍스트의 문자 k-gram 을 64비트 다항식 해시로 변환합니다. (결정적, 벡터 연산)
+    :return: (np.ndarray) 중복이 제거된 uint64 해시 배열
+    """
+    text = _WHITESPACE.sub(" ", text).strip()
+    codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codepoints) < k:
+        codepoints = np.pad(codepoints, (0, k - len(codepoints)))
+    base = np.uint64(1_000_003)
+    hashes = np.zeros(len(codepoints) - k + 1, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for offset in range(k):
+            hashes = hashes * base + codepoints[offset:len(codepoints) - k + 1 + offset]
+    return np.unique(hashes)
+
+
+class MinHashDeduplicator:
+    """
+    MinHash + LSH 밴딩으로 거의 같은 청크를 찾아 제거합니다.
+
+    - 청크마다 문자 k-gram 집합의 MinHash 서명(num_perm 개)을 계산합니다.
+    - 서명을 bands 개 구간으로 나눠 같은 구간 값을 가진 청크만 후보로 비교합니다.
+    - 후보의 추정 Jaccard 유사도가 threshold 이상이면 나중에 나온 청크를 제거합니다. (먼저 나온 청크 유지)
+    """
+
+    def __init__(self, threshold=0.9, num_perm=128, bands=16, k=5):
+        """
+        :param threshold: (float) 중복으로 판단할 최소 Jaccard 유사도
+        :param num_perm: (int) MinHash 해시 함수 수 (bands 로 나누어 떨어져야 함)
+        :param bands: (int) LSH 밴드 수 (많을수록 낮은 유사도도 후보가 됨)
+        :param k: (int) 문자 shingle 길이
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm 은 bands 로 나누어 떨어져야 합니다.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.k = k
+        rng = np.random.default_rng(_SEED)
+        # multiply-shift 해시: (a * x + b) mod 2^64, a 는 홀수
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        """
+        텍스트의 MinHash 서명을 계산합니다.
+        """
+        hashes = shingle_hashes(text, self.k)
+        with np.errstate(over="ignore"):
+            permuted = hashes[:, None] * self._a[None, :] + self._b[None, :]
+        return permuted.min(axis=0)
+
+    def deduplicate(self, contents):
+        """
+        거의 같은 청크를 제거하고 남길 청크의 인덱스를 반환합니다.
+        :param contents: (list) 청크 텍스트 (앞에 나온 청크가 우선)
+        :return: (list) 남길 청크 인덱스 (원래 순서 유지)
+        """
+        buckets = [{} for _ in range(self.bands)]
+        signatures = []
+        kept = []
+        for i, content in enumerate(contents):
+            signature = self.signature(content)
+            band_keys = [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+            # 같은 밴드 값을 가진 남은 청크만 비교
+            candidates = set()
+            for band, key in enumerate(band_keys):
+                candidates.update(buckets[band].get(key, ()))
+            if any(np.mean(signatures[j] == signature) >= self.threshold for j in candidates):
+                signatures.append(None)
+                continue
+
+            signatures.append(signature)
+            kept.append(i)
+            for band, key in enumerate(band_keys):
+                buckets[band].setdefault(key, []).append(i)
+        return kept
+
+
+def deduplicate_chunks(contents, metadatas, threshold=0.9, dimension=4096, **kwargs):
+    """
+    임베딩 전에 거의 같은 청크를 제거하고 절약량을 출력합니다.
+    :param contents: (list) 청크 텍스트
+    :param metadatas: (dict) preprocess_documents 가 반환한 키별 메타데이터 리스트
+    :param threshold: (float) 중복으로 판단할 최소 Jaccard 유사도
+    :param dimension: (int) 임베딩 차원 (절약한 인덱스 용량 계산용)
+    :return: (tuple) (남은 청크 텍스트, 남은 메타데이터, 리포트 dict)
+    """
+    kept = MinHashDeduplicator(threshold=threshold, **kwargs).deduplicate(contents)
+    kept_contents = [contents[i] for i in kept]
+    kept_metadatas = {key: [values[i] for i in kept] for key, values in metadatas.items()}
+
+    kept_set = set(kept)
+    removed = [i for i in range(len(contents)) if i not in kept_set]
+    # 청크 하나당 dense 벡터(float32) + 메타데이터에 저장되는 본문(UTF-8)
+    saved_bytes = sum(dimension * 4 + len(contents[i].encode("utf-8")) for i in removed)
+    report = {
+        "chunks": len(contents),
+        "kept": len(kept),
+        "removed": len(removed),
+        "embeddings_saved": len(removed),
+        "index_bytes_saved": saved_bytes,
+    }
+    print(
+        f"중복 제거: 청크 {report['chunks']}개 -> {report['kept']}개 "
+        f"(임베딩 {report['embeddings_saved']}건, 인덱스 약 {saved_bytes / 2 ** 20:.1f}MB 절약)"
+    )
+    return kept_contents, kept_metadatas, report
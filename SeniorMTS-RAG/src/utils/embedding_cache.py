@@ -0,0 +1,145 @@
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text):
+    """
+    캐시 키로 사용할 수 있도록 질의 텍스트를 정규화합니다.
+    (유니코드 NFC 정규화, 소문자 변환, 공백 축소)
+    """
+    text = unicodedata.normalize("NFC", text)
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+class SQLiteVectorStore:
+    """
+    정규화된 질의 텍스트 -> float32 벡터를 저장하는 SQLite 디스크 캐시
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector FROM query_embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=np.float32)
+
+    def put(self, key, vector):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO query_embeddings (key, vector) VALUES (?, ?)",
+                (key, vector.tobytes()),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    질의 임베딩 결과를 캐시하는 Embeddings 래퍼입니다.
+
+    여러 검색기가 같은 인스턴스를 공유하면, 한 턴 안에서 같은 질의를 여러 네임스페이스에
+    검색하더라도 임베딩 API 는 한 번만 호출됩니다.
+    벡터는 float32 배열로 보관하여 파이썬 float 리스트보다 메모리를 적게 사용합니다.
+    """
+
+    def __init__(self, embeddings, max_entries=1024, store_path=None):
+        """
+        :param embeddings: (Embeddings) 실제 임베딩 모델
+        :param max_entries: (int) 메모리 LRU 에 보관할 최대 벡터 수
+        :param store_path: (str) SQLite 디스크 캐시 경로 (None 이면 메모리만 사용)
+        """
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self.store = SQLiteVectorStore(store_path) if store_path else None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 통계
+        self.calls = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.embed_seconds = 0.0
+
+    def embed_documents(self, texts):
+        """
+        문서 임베딩은 캐시하지 않고 그대로 전달합니다.
+        """
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        """
+        캐시에 있으면 저장된 벡터를, 없으면 임베딩 API 결과를 반환합니다.
+        """
+        key = normalize_query(text)
+
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                self.memory_hits += 1
+                return vector.tolist()
+
+        if self.store is not None:
+            vector = self.store.get(key)
+            if vector is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, vector)
+                return vector.tolist()
+
+        started = time.perf_counter()
+        vector = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.calls += 1
+            self.embed_seconds += elapsed
+            self._remember(key, vector)
+        if self.store is not None:
+            self.store.put(key, vector)
+        return vector.tolist()
+
+    def _remember(self, key, vector):
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def stats(self):
+        """
+        절약한 임베딩 호출 수와 지연 시간 통계를 반환합니다.
+        """
+        saved_calls = self.memory_hits + self.disk_hits
+        avg_latency = self.embed_seconds / self.calls if self.calls else 0.0
+        return {
+            "embedding_calls": self.calls,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "saved_calls": saved_calls,
+            "avg_embed_latency": avg_latency,
+            "saved_latency": saved_calls * avg_latency,
+            "entries": len(self._cache),
+        }
@@ -0,0 +1,144 @@
+import os
+import threading
+from collections import OrderedDict
+
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_openai import ChatOpenAI
+
+_encoding = None
+
+
+def count_tokens(messages):
+    """
+    메시지 리스트의 토큰 수를 계산합니다. (gpt-4o 토크나이저 기준, 메시지당 4토큰 오버헤드 포함)
+    """
+    global _encoding
+    if _encoding is None:
+        import tiktoken
+
+        _encoding = tiktoken.encoding_for_model("gpt-4o")
+    return sum(len(_encoding.encode(str(message.content))) + 4 for message in messages)
+
+
+SUMMARY_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "You maintain a running summary of a conversation between a senior user and a voice stock assistant. "
+            "Update the existing summary with the new messages. Keep the stocks, dates, numbers and user preferences "
+            "that later questions may refer to, and drop small talk. Answer with the updated summary only, in Korean, "
+            "in at most 5 sentences."
+        ),
+        ("human", "Existing summary:\n{summary}\n\nNew messages:\n{messages}"),
+    ]
+)
+
+
+def _format_messages(messages):
+    return "\n".join(f"{message.type}: {message.content}" for message in messages)
+
+
+class HistoryManager:
+    """
+    토큰 예산 안에서 대화 기록을 구성합니다.
+
+    최근 max_turns 턴은 그대로 유지하고(토큰 예산 초과 시 더 적게), 그보다 오래된 메시지는
+    세션별 요약에 누적합니다. 요약은 새로 창 밖으로 밀려난 메시지만 반영해 갱신하므로
+    매 턴마다 전체 기록을 다시 요약하지 않습니다.
+    """
+
+    def __init__(self, llm, max_turns=6, token_budget=2000, max_sessions=10000):
+        """
+        :param llm: 요약에 사용할 LLM
+        :param max_turns: (int) 그대로 유지할 최근 턴 수 (턴 = 사용자 질문 + 응답)
+        :param token_budget: (int) 그대로 유지할 메시지의 최대 토큰 수
+        :param max_sessions: (int) 요약을 보관할 최대 세션 수
+        """
+        self.chain = SUMMARY_PROMPT | llm
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.max_sessions = max_sessions
+        self._summaries = OrderedDict()  # session_id -> (요약된 메시지 수, 요약)
+        self._lock = threading.Lock()
+
+    def split(self, messages):
+        """
+        메시지를 (요약할 오래된 메시지, 그대로 유지할 최근 메시지)로 나눕니다.
+        """
+        start = len(messages)
+        turns = 0
+        tokens = 0
+        while start > 0 and turns < self.max_turns:
+            # 턴의 시작(사용자 메시지)까지 거슬러 올라감
+            turn_start = start - 1
+            while turn_start > 0 and messages[turn_start].type != "human":
+                turn_start -= 1
+            turn_tokens = count_tokens(messages[turn_start:start])
+            if tokens + turn_tokens > self.token_budget:
+                break
+            tokens += turn_tokens
+            turns += 1
+            start = turn_start
+        return messages[:start], messages[start:]
+
+    def _pending(self, session_id, older):
+        """
+        요약에 새로 반영해야 할 메시지와 기존 요약을 반환합니다.
+        """
+        with self._lock:
+            summarized, summary = self._summaries.get(session_id, (0, ""))
+        if summarized > len(older):
+            # 기록이 초기화된 경우 처음부터 다시 요약
+            summarized, summary = 0, ""
+        return older[summarized:], summary
+
+    def _remember(self, session_id, summarized, summary):
+        with self._lock:
+            self._summaries[session_id] = (summarized, summary)
+            self._summaries.move_to_end(session_id)
+            while len(self._summaries) > self.max_sessions:
+                self._summaries.popitem(last=False)
+
+    def _compose(self, summary, recent):
+        if not summary:
+            return list(recent)
+        return [SystemMessage(content=f"Summary of the earlier conversation: {summary}")] + list(recent)
+
+    def build(self, session_id, messages):
+        """
+        프롬프트에 넣을 대화 기록을 반환합니다. ([요약 SystemMessage] + 최근 메시지)
+        """
+        older, recent = self.split(messages)
+        pending, summary = self._pending(session_id, older)
+        if pending:
+            summary = self.chain.invoke({"summary": summary or "(none)", "messages": _format_messages(pending)}).content
+            self._remember(session_id, len(older), summary)
+        return self._compose(summary, recent)
+
+    async def abuild(self, session_id, messages):
+        """
+        build 의 비동기 버전입니다.
+        """
+        older, recent = self.split(messages)
+        pending, summary = self._pending(session_id, older)
+        if pending:
+            response = await self.chain.ainvoke({"summary": summary or "(none)", "messages": _format_messages(pending)})
+            summary = response.content
+            self._remember(session_id, len(older), summary)
+        return self._compose(summary, recent)
+
+
+def setup_history_manager():
+    """
+    환경 변수 설정으로 대화 기록 관리자를 생성합니다.
+    - HISTORY_MAX_TURNS (기본값: 6)
+    - HISTORY_TOKEN_BUDGET (기본값: 2000)
+    - SUMMARY_MODEL (기본값: gpt-4o-mini)
+    """
+    llm = ChatOpenAI(model=os.getenv("SUMMARY_MODEL", "gpt-4o-mini"), temperature=0)
+    return HistoryManager(
+        llm,
+        max_turns=int(os.getenv("HISTORY_MAX_TURNS", "6")),
+        token_budget=int(os.getenv("HISTORY_TOKEN_BUDGET", "2000")),
+    )
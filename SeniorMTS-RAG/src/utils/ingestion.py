@@ -0,0 +1,320 @@
+import glob
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from langchain_teddynote.community.pinecone import preprocess_documents, create_sparse_encoder
+from langchain_teddynote.korean import stopwords
+
+from utils.config import get_vector_backend, get_local_index_dir
+from utils.dedup import deduplicate_chunks
+from utils.local_index import LocalHybridIndex
+from utils.manifest import sync_namespace
+from utils.pdf_pipeline import load_pdf_chunks
+from utils.sparse_store import export_sparse_encoder, load_bm25_encoder
+from utils.text_cleaning import filter_chunk
+from utils.upsert import rate_limiter_from_env
+
+# Pinecone 인덱스 설정 (solar-embedding-1-large 4096차원, 하이브리드 검색은 dotproduct 만 지원)
+INDEX_SPEC = {
+    "name": "seniormts",
+    "dimension": 4096,
+    "metric": "dotproduct",
+    "cloud": "gcp",
+    "region": "us-east1-gcp",
+}
+
+
+class PDFFolderSource:
+    """
+    PDF 폴더 소스: 파일을 프로세스 풀에서 load -> split -> clean/filter 합니다.
+    """
+
+    def __init__(self, path, chunk_size, chunk_overlap, metadata_keys=("source", "page", "author"), filter=None):
+        """
+        :param path: (str) PDF 파일 glob 패턴
+        :param chunk_size: (int) 청크 크기
+        :param chunk_overlap: (int) 청크 중첩 크기
+        :param metadata_keys: (tuple) 저장할 메타데이터 키
+        :param filter: (dict) filter_chunk 설정 (min_length, excluded_words, min_alpha_ratio, replace_content)
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.metadata_keys = list(metadata_keys)
+        # 워커 프로세스로 전달되므로 모듈 최상위 함수에 설정만 묶어서 사용
+        self.chunk_filter = partial(filter_chunk, **(filter or {}))
+
+    def load(self, since=None):
+        """
+        :param since: 사용하지 않음 (PDF 폴더는 매니페스트로 변경분을 판단)
+        :return: (tuple) (청크 텍스트 리스트, 키별 메타데이터 리스트)
+        """
+        files = sorted(glob.glob(self.path))
+        docs = load_pdf_chunks(files, self.chunk_size, self.chunk_overlap, self.chunk_filter)
+        return preprocess_documents(
+            split_docs=docs,
+            metadata_keys=self.metadata_keys,
+            min_length=5,
+            use_basename=True,
+        )
+
+
+class NewsCSVSource:
+    """
+    뉴스 CSV 소스: 기사 본문을 청크로 나누고 기사 메타데이터를 붙입니다.
+    CSV 는 read_chunksize 행씩 읽고, since 가 주어지면 그 이후 기사만 처리합니다.
+    """
+
+    def __init__(self, path, chunk_size, chunk_overlap, metadata_keys=("title", "time", "url", "keyword"),
+                 text_column="content", time_column="time", timestamp_key="published_at", read_chunksize=5000):
+        """
+        :param path: (str) CSV 파일 경로
+        :param chunk_size: (int) 청크 크기
+        :param chunk_overlap: (int) 청크 중첩 크기
+        :param metadata_keys: (tuple) 메타데이터로 저장할 컬럼
+        :param text_column: (str) 본문 컬럼
+        :param time_column: (str) 기사 시각 컬럼 (증분 수집 기준, KST)
+        :param timestamp_key: (str) 기간 필터용 숫자 시각(epoch 초)을 저장할 메타데이터 키 (None 이면 저장 안 함)
+        :param read_chunksize: (int) 한 번에 읽을 행 수
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.metadata_keys = list(metadata_keys)
+        self.text_column = text_column
+        self.time_column = time_column
+        self.timestamp_key = timestamp_key
+        self.read_chunksize = read_chunksize
+        self.watermark = None  # 처리한 기사 중 가장 최근 시각
+
+    def load(self, since=None):
+        """
+        :param since: (str) 이 시각 이후(같은 시각 포함)의 기사만 처리 (None 이면 전체)
+        :return: (tuple) (청크 텍스트 리스트, 키별 메타데이터 리스트)
+        """
+        import pandas as pd
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+        text_splitter = RecursiveCharacterTextSplitter(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+        since = pd.Timestamp(since) if since else None
+        columns = list(dict.fromkeys([self.text_column, self.time_column, *self.metadata_keys]))
+        metadata_keys = self.metadata_keys + ([self.timestamp_key] if self.timestamp_key else [])
+
+        articles = 0
+        split_docs = []
+        for frame in pd.read_csv(self.path, usecols=columns, chunksize=self.read_chunksize, encoding="utf-8-sig"):
+            # 1. 본문이 없는 행과 지난 실행 이전 기사 제외
+            frame = frame.dropna(subset=[self.text_column])
+            times = pd.to_datetime(frame[self.time_column], errors="coerce")
+            if since is not None:
+                # 기준 시각과 같은 기사도 다시 읽음 (같은 시각에 늦게 수집된 기사 포함, 이미 올린 청크는 매니페스트 해시로 제외)
+                newer = (times >= since).to_numpy()
+                frame, times = frame[newer], times[newer]
+            if frame.empty:
+                continue
+            if times.notna().any() and (self.watermark is None or times.max() > self.watermark):
+                self.watermark = times.max()
+
+            # 2. 기간 필터용 숫자 시각 추가 (Pinecone 범위 필터는 숫자 메타데이터만 지원)
+            if self.timestamp_key:
+                epoch = (times.dt.tz_localize("Asia/Seoul") - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+                frame = frame.assign(**{self.timestamp_key: epoch.fillna(0).astype("int64")})
+
+            # 3. 메타데이터를 컬럼 단위로 만들고 기사들을 한 번에 분할
+            split_docs.extend(text_splitter.create_documents(
+                frame[self.text_column].tolist(),
+                metadatas=frame[metadata_keys].to_dict("records"),
+            ))
+            articles += len(frame)
+        print(f"기사 {articles}개 -> 청크 {len(split_docs)}개" + (f" ({since} 이후)" if since is not None else ""))
+
+        return preprocess_documents(
+            split_docs=split_docs,
+            metadata_keys=metadata_keys,
+            min_length=5,
+            use_basename=False,
+        )
+
+
+# 소스 어댑터가 아닌 엔진에서 사용하는 설정 키
+ENGINE_KEYS = ("type", "batch_size", "max_workers", "dedup_threshold", "incremental")
+
+# 설정의 type 값 -> 소스 어댑터
+SOURCE_TYPES = {
+    "pdf": PDFFolderSource,
+    "news_csv": NewsCSVSource,
+}
+
+
+def create_source(config):
+    """
+    네임스페이스 설정으로 소스 어댑터를 생성합니다.
+    :param config: (dict) {"type": ..., 나머지는 어댑터 생성자 인자}
+    """
+    options = {key: value for key, value in config.items() if key not in ENGINE_KEYS}
+    return SOURCE_TYPES[config["type"]](**options)
+
+
+def open_index():
+    """
+    VECTOR_BACKEND 설정에 따라 모든 네임스페이스가 공유할 인덱스 연결을 엽니다.
+    Pinecone 인덱스가 없으면 INDEX_SPEC 으로 생성합니다.
+    """
+    if get_vector_backend() == "local":
+        return LocalHybridIndex(get_local_index_dir())
+
+    from pinecone import Pinecone, ServerlessSpec
+
+    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+    if INDEX_SPEC["name"] not in pc.list_indexes().names():
+        pc.create_index(
+            name=INDEX_SPEC["name"],
+            dimension=INDEX_SPEC["dimension"],
+            metric=INDEX_SPEC["metric"],
+            spec=ServerlessSpec(cloud=INDEX_SPEC["cloud"], region=INDEX_SPEC["region"]),
+        )
+        print(f"Created Pinecone index: {INDEX_SPEC['name']}")
+    return pc.Index(INDEX_SPEC["name"])
+
+
+def _load_state(path):
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_state(path, state):
+    """
+    수집 상태를 임시 파일에 쓴 뒤 os.replace 로 교체합니다. (중단되어도 이전 기준 시각 유지)
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _load_fitted_encoder(path):
+    """
+    이전 실행에서 학습한 sparse encoder 를 불러옵니다. (증분 수집은 기존 BM25 통계를 그대로 사용)
+    """
+    from langchain_teddynote.community.pinecone import KiwiBM25Tokenizer
+
+    sparse_encoder = load_bm25_encoder(str(path))
+    sparse_encoder._tokenizer = KiwiBM25Tokenizer(stop_words=stopwords())
+    return sparse_encoder
+
+
+def ingest_namespace(namespace, config, index, embedder, output_dir, embed_limiter=None, index_limiter=None,
+                     full=False):
+    """
+    네임스페이스 하나를 수집합니다.
+    1. 소스 어댑터로 청크와 메타데이터 생성 (incremental 설정이면 지난 실행 이후 데이터만)
+    2. dedup_threshold 가 설정되어 있으면 거의 같은 청크 제거 (MinHash/LSH)
+    3. 네임스페이스 전용 BM25 sparse encoder 학습 및 .bm25 저장 (증분 수집은 기존 encoder 재사용)
+    4. 매니페스트 기준 증분 업로드 (임베딩/인덱스 연결과 속도 제한은 다른 네임스페이스와 공유)
+    :param full: (bool) True 이면 incremental 설정을 무시하고 전체를 다시 수집
+    :return: (dict) 업로드/삭제/유지 청크 수와 소요 시간
+    """
+    started = time.perf_counter()
+    output_dir = Path(output_dir)
+    encoder_path = output_dir / f"{namespace}_sparse_encoder.bm25"
+    state_path = output_dir / f"{namespace}_state.json"
+
+    # 1. 청크 생성
+    since = None
+    if config.get("incremental") and not full and encoder_path.exists():
+        since = _load_state(state_path).get("watermark")
+    source = create_source(config)
+    contents, metadatas = source.load(since=since)
+    print(f"[{namespace}] 청크 {len(contents)}개")
+    if since is not None and not contents:
+        return {"upserted": 0, "deleted": 0, "unchanged": 0, "since": since}
+
+    # 2. 중복 청크 제거 (임베딩 전에 제거해 임베딩 호출과 인덱스 용량 절약)
+    dedup_report = None
+    if config.get("dedup_threshold"):
+        contents, metadatas, dedup_report = deduplicate_chunks(
+            contents, metadatas, threshold=config["dedup_threshold"], dimension=INDEX_SPEC["dimension"]
+        )
+
+    # 3. 한글 불용어 사전 + Kiwi 형태소 분석기로 sparse encoder 학습
+    if since is not None:
+        sparse_encoder = _load_fitted_encoder(encoder_path)
+    else:
+        sparse_encoder = create_sparse_encoder(stopwords(), mode="kiwi")
+        sparse_encoder.fit(contents)
+        export_sparse_encoder(sparse_encoder, str(encoder_path))
+
+    # 4. 변경된 청크만 증분 업로드 (새 데이터만 읽은 경우 기존 청크는 삭제하지 않음)
+    result = sync_namespace(
+        index=index,
+        namespace=namespace,
+        contents=contents,
+        metadatas=metadatas,
+        sparse_encoder=sparse_encoder,
+        embedder=embedder,
+        manifest_path=str(output_dir / f"{namespace}_manifest.json"),
+        batch_size=config.get("batch_size", 64),
+        max_workers=config.get("max_workers", 30),
+        embed_limiter=embed_limiter,
+        index_limiter=index_limiter,
+        prune=since is None,
+    )
+
+    # 로컬 인덱스는 변경된 경우에만 디스크에 저장
+    if isinstance(index, LocalHybridIndex) and (result["upserted"] or result["deleted"]):
+        index.save(namespace)
+
+    # 다음 실행의 기준 시각 기록
+    watermark = getattr(source, "watermark", None)
+    if watermark is not None:
+        _save_state(state_path, {"watermark": str(watermark)})
+
+    result["since"] = since
+    result["dedup"] = dedup_report
+    result["seconds"] = round(time.perf_counter() - started, 2)
+    return result
+
+
+def run_ingestion(configs, output_dir, max_concurrency=None, full=False):
+    """
+    여러 네임스페이스를 동시에 수집합니다.
+    인덱스 연결, 임베딩 클라이언트, 속도 제한기는 하나씩만 만들어 모든 네임스페이스가 공유합니다.
+    :param configs: (dict) namespace -> 설정
+    :param output_dir: (str) sparse encoder 와 매니페스트를 저장할 디렉토리
+    :param max_concurrency: (int) 동시에 수집할 네임스페이스 수 (기본값: 전체)
+    :param full: (bool) True 이면 증분 설정을 무시하고 전체를 다시 수집
+    :return: (dict) namespace -> 결과 (실패한 경우 {"error": ...})
+    """
+    from langchain_upstage import UpstageEmbeddings
+
+    index = open_index()
+    embedder = UpstageEmbeddings(model="solar-embedding-1-large-passage")
+    embed_limiter = rate_limiter_from_env("EMBED_RATE_LIMIT")
+    index_limiter = rate_limiter_from_env("UPSERT_RATE_LIMIT")
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_concurrency or len(configs), thread_name_prefix="ingest") as executor:
+        futures = {
+            namespace: executor.submit(
+                ingest_namespace, namespace, config, index, embedder, output_dir, embed_limiter, index_limiter, full
+            )
+            for namespace, config in configs.items()
+        }
+        for namespace, future in futures.items():
+            try:
+                results[namespace] = future.result()
+            except Exception as e:
+                print(f"[{namespace}] 수집 실패: {e}")
+                results[namespace] = {"error": str(e)}
+    return results
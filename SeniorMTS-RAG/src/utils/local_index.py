@@ -0,0 +1,320 @@
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+
+
+def match_filter(metadata, filter):
+    """
+    Pinecone 메타데이터 필터 문법의 일부($eq, $ne, $in, $nin, $gt, $gte, $lt, $lte, $and, $or)를 평가합니다.
+    """
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(match_filter(metadata, sub) for sub in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(match_filter(metadata, sub) for sub in condition):
+                return False
+            continue
+
+        value = metadata.get(key)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, operand in condition.items():
+            if op == "$eq" and value != operand:
+                return False
+            if op == "$ne" and value == operand:
+                return False
+            if op == "$in" and value not in operand:
+                return False
+            if op == "$nin" and value in operand:
+                return False
+            if op in ("$gt", "$gte", "$lt", "$lte"):
+                if value is None:
+                    return False
+                if op == "$gt" and not value > operand:
+                    return False
+                if op == "$gte" and not value >= operand:
+                    return False
+                if op == "$lt" and not value < operand:
+                    return False
+                if op == "$lte" and not value <= operand:
+                    return False
+    return True
+
+
+class QueryRecord(dict):
+    """
+    Pinecone 응답 객체처럼 속성(match.metadata)과 키(match["metadata"]) 모두로 조회할 수 있는 dict 입니다.
+    (PineconeKiwiHybridRetriever 는 r.metadata 처럼 속성으로 읽음)
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def _atomic_write(path, write):
+    """
+    같은 디렉토리의 임시 파일에 쓴 뒤 os.replace 로 교체합니다.
+    기존 파일을 메모리 맵으로 연 프로세스는 교체 전 파일(inode)을 계속 읽으므로 잘린 파일을 보지 않습니다.
+    :param write: (callable) 열린 바이너리 파일 객체를 받아 내용을 쓰는 함수
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class _Namespace:
+    """
+    네임스페이스 하나의 벡터, 메타데이터, sparse 역색인
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.positions = {}       # id -> 행 번호
+        self.dense = []           # 행별 float32 벡터
+        self.sparse = []          # 행별 {"indices": [...], "values": [...]}
+        self.metadata = []
+        self._matrix = None
+        self._inverted = None
+
+    def invalidate(self):
+        self._matrix = None
+        self._inverted = None
+
+    def matrix(self):
+        """
+        dense 벡터 행렬 (필요할 때 한 번만 구성)
+        """
+        if self._matrix is None:
+            self._matrix = np.vstack(self.dense) if self.dense else np.zeros((0, 0), dtype=np.float32)
+        return self._matrix
+
+    def inverted(self):
+        """
+        sparse 토큰 인덱스 -> (행 번호 배열, 값 배열) 역색인
+        """
+        if self._inverted is None:
+            postings = {}
+            for row, vector in enumerate(self.sparse):
+                for index, value in zip(vector["indices"], vector["values"]):
+                    postings.setdefault(index, ([], []))
+                    postings[index][0].append(row)
+                    postings[index][1].append(value)
+            self._inverted = {
+                index: (np.asarray(rows, dtype=np.int64), np.asarray(values, dtype=np.float32))
+                for index, (rows, values) in postings.items()
+            }
+        return self._inverted
+
+
+class LocalHybridIndex:
+    """
+    Pinecone Index 와 같은 방식으로 사용할 수 있는 로컬 하이브리드 벡터 인덱스입니다.
+
+    dense 벡터는 NumPy 행렬 곱으로 전수 검색하고, BM25 sparse 벡터는 역색인으로 점수를 더합니다.
+    (Pinecone dotproduct 하이브리드 점수와 동일: dense·q + sparse·q)
+    upsert/query/delete/describe_index_stats 를 지원하므로
+    langchain_teddynote 의 upsert_documents_parallel, delete_namespace,
+    PineconeKiwiHybridRetriever 를 그대로 사용할 수 있습니다.
+    """
+
+    def __init__(self, path=None):
+        """
+        :param path: (str) 인덱스 저장 디렉토리 (있으면 기존 데이터를 불러옵니다)
+        """
+        self.path = Path(path) if path else None
+        self._namespaces = {}
+        self._dirty = set()  # 마지막 load/save 이후 변경된 네임스페이스
+        self._lock = threading.RLock()
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def _namespace(self, namespace):
+        return self._namespaces.setdefault(namespace or "", _Namespace())
+
+    def upsert(self, vectors, namespace=None, **kwargs):
+        """
+        벡터를 추가하거나 같은 id 의 벡터를 교체합니다.
+        :param vectors: (list) {"id", "values", "sparse_values", "metadata"} 딕셔너리 리스트
+        """
+        with self._lock:
+            ns = self._namespace(namespace)
+            for vector in vectors:
+                dense = np.asarray(vector["values"], dtype=np.float32)
+                sparse = vector.get("sparse_values") or {"indices": [], "values": []}
+                sparse = {"indices": list(sparse["indices"]), "values": list(sparse["values"])}
+                metadata = dict(vector.get("metadata") or {})
+                position = ns.positions.get(vector["id"])
+                if position is None:
+                    ns.positions[vector["id"]] = len(ns.ids)
+                    ns.ids.append(vector["id"])
+                    ns.dense.append(dense)
+                    ns.sparse.append(sparse)
+                    ns.metadata.append(metadata)
+                else:
+                    ns.dense[position] = dense
+                    ns.sparse[position] = sparse
+                    ns.metadata[position] = metadata
+            ns.invalidate()
+            self._dirty.add(namespace or "")
+        return {"upserted_count": len(vectors)}
+
+    def delete(self, ids=None, delete_all=False, namespace=None, filter=None, **kwargs):
+        """
+        id 목록, 필터 또는 네임스페이스 전체 단위로 벡터를 삭제합니다.
+        """
+        with self._lock:
+            if delete_all:
+                if self._namespaces.pop(namespace or "", None) is not None:
+                    self._dirty.add(namespace or "")
+                return {}
+            ns = self._namespace(namespace)
+            remove = set(ids or [])
+            if filter:
+                remove.update(
+                    _id for _id, metadata in zip(ns.ids, ns.metadata) if match_filter(metadata, filter)
+                )
+            if not remove:
+                return {}
+            keep = [i for i, _id in enumerate(ns.ids) if _id not in remove]
+            ns.ids = [ns.ids[i] for i in keep]
+            ns.dense = [ns.dense[i] for i in keep]
+            ns.sparse = [ns.sparse[i] for i in keep]
+            ns.metadata = [ns.metadata[i] for i in keep]
+            ns.positions = {_id: i for i, _id in enumerate(ns.ids)}
+            ns.invalidate()
+            self._dirty.add(namespace or "")
+        return {}
+
+    def query(self, vector=None, sparse_vector=None, top_k=10, namespace=None,
+              filter=None, include_metadata=True, include_values=False, **kwargs):
+        """
+        하이브리드 점수 상위 top_k 개의 결과를 반환합니다.
+        :return: (QueryRecord) {"matches": [QueryRecord("id", "score", "metadata")], "namespace": namespace}
+        """
+        with self._lock:
+            ns = self._namespaces.get(namespace or "")
+            if ns is None or not ns.ids:
+                return QueryRecord(matches=[], namespace=namespace)
+            scores = np.zeros(len(ns.ids), dtype=np.float32)
+            if vector is not None:
+                scores += ns.matrix() @ np.asarray(vector, dtype=np.float32)
+            if sparse_vector:
+                inverted = ns.inverted()
+                for index, value in zip(sparse_vector["indices"], sparse_vector["values"]):
+                    posting = inverted.get(index)
+                    if posting is not None:
+                        scores[posting[0]] += posting[1] * value
+
+            candidates = np.arange(len(ns.ids))
+            if filter:
+                candidates = np.asarray(
+                    [i for i in candidates if match_filter(ns.metadata[i], filter)], dtype=np.int64
+                )
+                if candidates.size == 0:
+                    return QueryRecord(matches=[], namespace=namespace)
+
+            top_k = min(top_k, candidates.size)
+            candidate_scores = scores[candidates]
+            top = np.argpartition(-candidate_scores, top_k - 1)[:top_k]
+            top = top[np.argsort(-candidate_scores[top])]
+
+            matches = []
+            for i in candidates[top]:
+                match = QueryRecord(id=ns.ids[i], score=float(scores[i]))
+                if include_metadata:
+                    match["metadata"] = ns.metadata[i]
+                if include_values:
+                    match["values"] = ns.dense[i].tolist()
+                matches.append(match)
+        return QueryRecord(matches=matches, namespace=namespace)
+
+    def fetch_ids(self, namespace=None):
+        """
+        네임스페이스에 저장된 id 목록을 반환합니다.
+        """
+        with self._lock:
+            ns = self._namespaces.get(namespace or "")
+            return list(ns.ids) if ns else []
+
+    def describe_index_stats(self, **kwargs):
+        """
+        Pinecone 과 같은 형식의 네임스페이스별 벡터 수를 반환합니다.
+        """
+        with self._lock:
+            namespaces = {
+                name: {"vector_count": len(ns.ids)} for name, ns in self._namespaces.items()
+            }
+        return QueryRecord(
+            namespaces={name: QueryRecord(stats) for name, stats in namespaces.items()},
+            total_vector_count=sum(ns["vector_count"] for ns in namespaces.values()),
+        )
+
+    def save(self, namespace=None):
+        """
+        네임스페이스(없으면 전체) 중 마지막 load/save 이후 변경된 것만 디스크에 저장합니다.
+        dense 행렬은 .npy, id/메타데이터/sparse 벡터는 JSON 으로 저장합니다.
+        서버가 기존 dense.npy 를 메모리 맵으로 열고 있을 수 있으므로 임시 파일에 쓴 뒤 교체합니다.
+        :return: (list) 저장한 네임스페이스
+        """
+        if self.path is None:
+            raise ValueError("저장 경로가 지정되지 않았습니다.")
+        with self._lock:
+            names = [namespace or ""] if namespace is not None else list(self._dirty)
+            saved = []
+            for name in names:
+                if name not in self._dirty:
+                    continue
+                ns = self._namespaces.get(name)
+                directory = self.path / (name or "_default")
+                directory.mkdir(parents=True, exist_ok=True)
+                if ns is None or not ns.ids:
+                    for file in directory.glob("*"):
+                        file.unlink()
+                else:
+                    matrix = ns.matrix()
+                    _atomic_write(directory / "dense.npy", lambda f: np.save(f, matrix))
+                    records = json.dumps(
+                        {"ids": ns.ids, "sparse": ns.sparse, "metadata": ns.metadata}, ensure_ascii=False
+                    ).encode("utf-8")
+                    _atomic_write(directory / "records.json", lambda f: f.write(records))
+                self._dirty.discard(name)
+                saved.append(name)
+            return saved
+
+    def load(self):
+        """
+        디스크에 저장된 모든 네임스페이스를 불러옵니다. dense 행렬은 메모리 맵으로 엽니다.
+        """
+        with self._lock:
+            self._namespaces = {}
+            self._dirty = set()
+            for directory in sorted(p for p in self.path.iterdir() if p.is_dir()):
+                records_path = directory / "records.json"
+                if not records_path.exists():
+                    continue
+                with records_path.open("r", encoding="utf-8") as f:
+                    records = json.load(f)
+                matrix = np.load(directory / "dense.npy", mmap_mode="r")
+                ns = _Namespace()
+                ns.ids = records["ids"]
+                ns.positions = {_id: i for i, _id in enumerate(ns.ids)}
+                ns.dense = list(matrix)
+                ns.sparse = records["sparse"]
+                ns.metadata = records["metadata"]
+                ns._matrix = matrix
+                name = "" if directory.name == "_default" else directory.name
+                self._namespaces[name] = ns
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from utils.upsert import iter_batches, rate_limiter_from_env, stream_upsert
+
+
+def chunk_hash(content, metadata):
+    """
+    청크 내용과 메타데이터로 콘텐츠 해시를 계산합니다.
+    """
+    payload = json.dumps({"content": content, "metadata": metadata}, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ChunkManifest:
+    """
+    네임스페이스에 올라간 청크의 콘텐츠 해시 -> 벡터 ID 기록
+
+    재실행 시 새로 추가/변경된 청크만 임베딩하고, 사라진 청크만 삭제할 수 있도록 합니다.
+    """
+
+    def __init__(self, path, namespace):
+        self.path = Path(path)
+        self.namespace = namespace
+        self.chunks = {}
+        self.exists = self.path.exists()
+        if self.exists:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("namespace") == namespace:
+                self.chunks = data["chunks"]
+
+    def diff(self, hashes):
+        """
+        현재 청크 해시 목록과 기록을 비교합니다.
+        :return: (tuple) (새로 올릴 해시 집합, 삭제할 벡터 ID 리스트)
+        """
+        current = set(hashes)
+        new = current - set(self.chunks)
+        removed = [vector_id for h, vector_id in self.chunks.items() if h not in current]
+        return new, removed
+
+    def save(self):
+        """
+        매니페스트를 임시 파일에 쓴 뒤 os.replace 로 교체합니다.
+        쓰는 도중 중단되어도 이전 체크포인트가 그대로 남으므로 다음 실행이 이어서 업로드합니다.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"namespace": self.namespace, "chunks": self.chunks}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def sync_namespace(index, namespace, contents, metadatas, sparse_encoder, embedder,
+                   manifest_path, batch_size=64, max_workers=30, checkpoint_every=10,
+                   embed_limiter=None, index_limiter=None, prune=True):
+    """
+    매니페스트를 기준으로 네임스페이스를 증분 동기화합니다.
+    1. 새로 추가되거나 변경된 청크만 임베딩하여 업로드합니다.
+    2. 업로드가 끝난 뒤 더 이상 존재하지 않는 청크만 삭제합니다. (검색 중 빈 네임스페이스가 생기지 않음)
+    3. 매니페스트가 없는 첫 실행에서는 기존 순번 ID(doc-N) 벡터를 정리하기 위해 네임스페이스를 비운 뒤 전체 업로드합니다.
+    4. 업로드는 stream_upsert 로 배치 단위 스트리밍하며, checkpoint_every 배치마다 매니페스트를 저장하므로
+       중단된 실행을 다시 시작하면 남은 청크만 업로드합니다.
+    임베딩/인덱스 호출 속도는 EMBED_RATE_LIMIT, UPSERT_RATE_LIMIT 환경 변수(초당 요청 수)로 제한합니다.
+
+    :param contents: (list) 청크 텍스트
+    :param metadatas: (dict) preprocess_documents 가 반환한 키별 메타데이터 리스트
+    :param manifest_path: (str) 매니페스트 JSON 경로
+    :param embed_limiter: (TokenBucket) 여러 네임스페이스가 공유할 임베딩 속도 제한기 (기본값: 환경 변수 기준으로 생성)
+    :param index_limiter: (TokenBucket) 여러 네임스페이스가 공유할 인덱스 속도 제한기 (기본값: 환경 변수 기준으로 생성)
+    :param prune: (bool) False 이면 contents 에 없는 기존 청크를 삭제하지 않습니다. (새 데이터만 전달하는 증분 수집용)
+    :return: (dict) 업로드/삭제/유지 청크 수
+    """
+    manifest = ChunkManifest(manifest_path, namespace)
+    keys = list(metadatas.keys())
+
+    records = {}
+    for i, content in enumerate(contents):
+        metadata = {key: metadatas[key][i] for key in keys}
+        records.setdefault(chunk_hash(content, metadata), (content, metadata))
+
+    new, removed = manifest.diff(records)
+    if not prune:
+        removed = []
+
+    if not manifest.exists:
+        namespaces = index.describe_index_stats()["namespaces"]
+        if namespace in namespaces:
+            index.delete(delete_all=True, namespace=namespace)
+
+    new_hashes = sorted(new)
+    hash_by_id = {h[:32]: h for h in new_hashes}
+    completed_batches = 0
+
+    def on_batch_done(ids):
+        nonlocal completed_batches
+        for vector_id in ids:
+            manifest.chunks[hash_by_id[vector_id]] = vector_id
+        completed_batches += 1
+        if completed_batches % checkpoint_every == 0:
+            manifest.save()
+
+    try:
+        stream_upsert(
+            index=index,
+            namespace=namespace,
+            records=((h[:32], records[h][0], records[h][1]) for h in new_hashes),
+            sparse_encoder=sparse_encoder,
+            embedder=embedder,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            embed_limiter=embed_limiter or rate_limiter_from_env("EMBED_RATE_LIMIT"),
+            index_limiter=index_limiter or rate_limiter_from_env("UPSERT_RATE_LIMIT"),
+            on_batch_done=on_batch_done,
+        )
+    finally:
+        # 실패하더라도 완료된 배치까지는 기록
+        manifest.save()
+
+    for batch in iter_batches(removed, 1000):
+        index.delete(ids=batch, namespace=namespace)
+    removed_set = set(removed)
+    manifest.chunks = {h: vector_id for h, vector_id in manifest.chunks.items() if vector_id not in removed_set}
+    manifest.save()
+
+    result = {
+        "upserted": len(new_hashes),
+        "deleted": len(removed),
+        "unchanged": len(records) - len(new_hashes),
+    }
+    print(f"[{namespace}] 업로드: {result['upserted']}, 삭제: {result['deleted']}, 유지: {result['unchanged']}")
+    return result
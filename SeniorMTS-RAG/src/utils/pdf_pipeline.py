@@ -0,0 +1,83 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from langchain_community.document_loaders import PyMuPDFLoader
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+STAGES = ("load", "split", "filter")
+
+
+def _process_file(args):
+    """
+    PDF 파일 하나를 load -> split -> clean/filter 순서로 처리합니다. (워커 프로세스에서 실행)
+    :return: (tuple) (필터링된 청크 리스트, 분할된 청크 수, 단계별 소요 시간)
+    """
+    file, chunk_size, chunk_overlap, chunk_filter = args
+    timings = {}
+
+    started = time.perf_counter()
+    pages = PyMuPDFLoader(file).load()
+    timings["load"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunks = text_splitter.split_documents(pages)
+    timings["split"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    kept = []
+    for chunk in chunks:
+        chunk = chunk_filter(chunk)
+        if chunk is not None:
+            kept.append(chunk)
+    timings["filter"] = time.perf_counter() - started
+
+    return kept, len(chunks), timings
+
+
+def iter_pdf_chunks(files, chunk_size, chunk_overlap, chunk_filter, max_workers=None, stats=None):
+    """
+    PDF 파일들을 프로세스 풀에서 병렬 처리하며, 파일 순서대로 청크를 하나씩 반환합니다.
+
+    :param files: (list) PDF 파일 경로 리스트 (결과는 이 순서를 그대로 따름)
+    :param chunk_size: (int) 청크 크기
+    :param chunk_overlap: (int) 청크 중첩 크기
+    :param chunk_filter: (callable) chunk_filter(doc) -> 정리된 Document 또는 None (모듈 최상위 함수 또는 그 functools.partial)
+    :param max_workers: (int) 워커 프로세스 수 (기본값: INGEST_WORKERS 환경 변수 또는 CPU 수)
+    :param stats: (dict) 전달하면 파일/청크 수와 단계별 누적 시간(초)을 기록합니다.
+    """
+    max_workers = max_workers or int(os.getenv("INGEST_WORKERS", os.cpu_count() or 1))
+    stats = stats if stats is not None else {}
+    stats.update({"files": 0, "chunks": 0, "kept": 0, **{stage: 0.0 for stage in STAGES}})
+
+    started = time.perf_counter()
+    tasks = ((file, chunk_size, chunk_overlap, chunk_filter) for file in files)
+    # 다른 네임스페이스의 업로드 스레드가 도는 중에 호출되므로 fork 대신 spawn 으로 워커 생성
+    # (fork 는 다른 스레드가 잡고 있던 잠금까지 복사해 워커가 멈출 수 있음)
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+        # map 은 입력 순서대로 결과를 돌려주므로 실행 순서와 무관하게 결과가 결정적
+        for kept, total, timings in executor.map(_process_file, tasks):
+            stats["files"] += 1
+            stats["chunks"] += total
+            stats["kept"] += len(kept)
+            for stage in STAGES:
+                stats[stage] += timings[stage]
+            yield from kept
+    stats["wall"] = time.perf_counter() - started
+
+
+def load_pdf_chunks(files, chunk_size, chunk_overlap, chunk_filter, max_workers=None):
+    """
+    iter_pdf_chunks 결과를 리스트로 모으고 단계별 소요 시간을 출력합니다.
+    """
+    stats = {}
+    docs = list(iter_pdf_chunks(files, chunk_size, chunk_overlap, chunk_filter, max_workers, stats))
+    print(
+        f"파일 {stats['files']}개, 청크 {stats['chunks']}개 -> {stats['kept']}개 "
+        f"(load {stats['load']:.2f}s, split {stats['split']:.2f}s, "
+        f"clean/filter {stats['filter']:.2f}s, 전체 {stats['wall']:.2f}s)"
+    )
+    return docs
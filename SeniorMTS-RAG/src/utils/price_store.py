@@ -0,0 +1,224 @@
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from utils.config import DATA_DIR
+from utils.sise_cache import now_kst, DATE_FORMAT
+
+# 네이버 siseJson 일봉 컬럼과 같은 순서
+SISE_HEADER = ['날짜', '시가', '고가', '저가', '종가', '거래량', '외국인소진율']
+
+PRICE_DTYPE = np.dtype([
+    ("date", "<i4"),
+    ("open", "<i8"),
+    ("high", "<i8"),
+    ("low", "<i8"),
+    ("close", "<i8"),
+    ("volume", "<i8"),
+    ("foreign_ratio", "<f4"),
+])
+
+
+def rows_to_array(rows):
+    """
+    siseJson 행 리스트를 구조화 배열로 변환합니다.
+    """
+    return np.array(
+        [
+            (int(row[0]), row[1], row[2], row[3], row[4], row[5], np.nan if row[6] is None else row[6])
+            for row in rows
+        ],
+        dtype=PRICE_DTYPE,
+    )
+
+
+def array_to_rows(array):
+    """
+    구조화 배열을 siseJson 과 같은 [header, *rows] 형식으로 변환합니다.
+    """
+    return [SISE_HEADER] + [
+        [str(row["date"]), int(row["open"]), int(row["high"]), int(row["low"]), int(row["close"]),
+         int(row["volume"]), float(row["foreign_ratio"])]
+        for row in array
+    ]
+
+
+@contextmanager
+def file_lock(path):
+    """
+    여러 워커 프로세스 사이의 배타적 파일 잠금 (POSIX 는 flock, Windows 는 msvcrt.locking)
+    """
+    with open(path, "a+b") as f:
+        try:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        except ImportError:
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _atomic_write(path, write):
+    """
+    같은 디렉토리의 고유한 임시 파일에 쓴 뒤 교체합니다. (동시에 쓰는 워커끼리 임시 파일이 겹치지 않음)
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class PriceStore:
+    """
+    종목별 일봉을 메모리 맵 NumPy 파일(.npy)로 보관하는 로컬 시계열 저장소입니다.
+
+    - 확정된(오늘 이전) 일봉만 저장하고, 저장된 구간 밖의 날짜만 네이버에서 받아 이어 붙입니다.
+    - 날짜 범위 조회는 메모리 맵 배열의 슬라이스이므로 복사 없이 반환됩니다.
+    - 파일은 고유한 임시 파일에 쓴 뒤 교체하므로 여러 워커가 같은 디렉토리를 읽어도 안전합니다.
+    - 보충은 종목별 잠금(스레드) + 종목별 파일 잠금(워커) 안에서 디스크의 최신 구간을 다시 읽고 병합합니다.
+      다른 종목 조회는 기다리지 않고, 오래된 캐시를 가진 워커가 더 긴 기록을 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, fetch, path=None):
+        """
+        :param fetch: (callable) fetch(code, start_time, end_time, time_from) -> [header, *rows] (캐시 미사용 조회)
+        :param path: (str) 저장 디렉토리 (기본값: PRICE_STORE_DIR 환경 변수 또는 data/price_store)
+        """
+        self.fetch = fetch
+        self.path = path or os.getenv("PRICE_STORE_DIR", str(DATA_DIR / "price_store"))
+        self._arrays = {}
+        self._coverage = {}
+        self._locks = {}  # 종목 코드 -> threading.Lock
+        self._locks_guard = threading.Lock()
+
+    def _files(self, code):
+        return os.path.join(self.path, f"{code}.npy"), os.path.join(self.path, f"{code}.json")
+
+    def _code_lock(self, code):
+        with self._locks_guard:
+            return self._locks.setdefault(code, threading.Lock())
+
+    def _read(self, code):
+        """
+        디스크에서 종목 배열(메모리 맵)과 저장된 날짜 구간을 읽어 캐시를 갱신합니다.
+        """
+        array_path, meta_path = self._files(code)
+        array, coverage = np.zeros(0, dtype=PRICE_DTYPE), None
+        if os.path.exists(array_path) and os.path.exists(meta_path):
+            # 구간 파일은 배열보다 나중에 교체되므로 구간을 먼저 읽으면 배열이 항상 구간을 포함
+            with open(meta_path, "r", encoding="utf-8") as f:
+                coverage = tuple(json.load(f)["coverage"])
+            array = np.load(array_path, mmap_mode="r")
+        self._arrays[code], self._coverage[code] = array, coverage
+        return array, coverage
+
+    def _load(self, code):
+        """
+        종목 배열과 저장된 날짜 구간을 반환합니다. (메모리 맵, 프로세스 캐시)
+        """
+        if code not in self._arrays:
+            return self._read(code)
+        return self._arrays[code], self._coverage[code]
+
+    def _save(self, code, array, coverage):
+        array_path, meta_path = self._files(code)
+        _atomic_write(array_path, lambda f: np.save(f, array))
+        meta = json.dumps({"coverage": list(coverage)}).encode("utf-8")
+        _atomic_write(meta_path, lambda f: f.write(meta))
+        self._arrays[code] = np.load(array_path, mmap_mode="r")
+        self._coverage[code] = coverage
+
+    def _fetch_array(self, code, start_time, end_time):
+        data = self.fetch(code, start_time, end_time, 'day')
+        return rows_to_array(data[1:]) if data else np.zeros(0, dtype=PRICE_DTYPE)
+
+    def refresh(self, code, start_time, end_time):
+        """
+        [start_time, end_time] 중 저장되지 않은 확정 일봉만 받아 저장합니다.
+        저장 구간은 실제로 행을 받은 요청 범위만큼만 넓힙니다.
+        """
+        yesterday = (now_kst() - timedelta(days=1)).strftime(DATE_FORMAT)
+        end_time = min(end_time, yesterday)
+        if start_time > end_time:
+            return
+        _, coverage = self._load(code)
+        if coverage is not None and coverage[0] <= start_time and end_time <= coverage[1]:
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        with self._code_lock(code), file_lock(os.path.join(self.path, f"{code}.lock")):
+            # 다른 워커가 그 사이 구간을 늘렸을 수 있으므로 디스크에서 다시 읽고 남은 날짜만 받음
+            array, coverage = self._read(code)
+            # 빈 응답(일시적 오류, 잘못된 코드 등)으로 받은 구간은 저장된 것으로 표시하지 않음 (다음 조회 때 다시 요청)
+            if coverage is None:
+                fetched = self._fetch_array(code, start_time, end_time)
+                if len(fetched) == 0:
+                    return
+                parts, new_coverage = [fetched], (start_time, end_time)
+            else:
+                parts, new_coverage = [array], coverage
+                if start_time < coverage[0]:
+                    before = self._fetch_array(code, start_time, self._day(coverage[0], -1))
+                    if len(before):
+                        parts.insert(0, before)
+                        new_coverage = (start_time, new_coverage[1])
+                if end_time > coverage[1]:
+                    after = self._fetch_array(code, self._day(coverage[1], 1), end_time)
+                    if len(after):
+                        parts.append(after)
+                        new_coverage = (new_coverage[0], end_time)
+                if new_coverage == coverage:
+                    return
+            coverage = new_coverage
+            merged = np.concatenate(parts)
+            merged = merged[np.unique(merged["date"], return_index=True)[1]]
+            self._save(code, merged, coverage)
+
+    @staticmethod
+    def _day(date, offset):
+        return (datetime.strptime(date, DATE_FORMAT) + timedelta(days=offset)).strftime(DATE_FORMAT)
+
+    def range(self, code, start_time, end_time):
+        """
+        저장된 일봉 중 날짜 범위에 해당하는 구간을 복사 없이(메모리 맵 슬라이스) 반환합니다.
+        """
+        array, _ = self._load(code)
+        dates = array["date"]
+        lo = np.searchsorted(dates, int(start_time), side="left")
+        hi = np.searchsorted(dates, int(end_time), side="right")
+        return array[lo:hi]
+
+    def get(self, code, start_time, end_time, today_rows=None):
+        """
+        필요한 날짜만 보충한 뒤 일봉 구간을 반환합니다.
+        :param today_rows: (callable) 범위에 오늘이 포함될 때 오늘 일봉 행을 반환하는 함수 (짧은 TTL 캐시 사용)
+        :return: (np.ndarray) PRICE_DTYPE 구조화 배열
+        """
+        self.refresh(code, start_time, end_time)
+        array = self.range(code, start_time, end_time)
+        today = now_kst().strftime(DATE_FORMAT)
+        if end_time >= today and today_rows is not None:
+            rows = [row for row in today_rows() if row[0] == today]
+            if rows:
+                array = np.concatenate([array, rows_to_array(rows)])
+        return array
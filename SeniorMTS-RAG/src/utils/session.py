@@ -1,12 +1,322 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
 from langchain_community.chat_message_histories import ChatMessageHistory
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import messages_from_dict, message_to_dict
+
+
+class InMemorySessionStore:
+    """
+    프로세스 메모리 세션 저장소 (LRU + 유휴 시간 만료)
+    """
+
+    def __init__(self, max_sessions=10000, idle_ttl=3600):
+        """
+        :param max_sessions: (int) 보관할 최대 세션 수 (초과 시 가장 오래 사용하지 않은 세션 제거)
+        :param idle_ttl: (int) 이 시간(초) 동안 사용하지 않은 세션은 제거
+        """
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._sessions = OrderedDict()  # session_id -> (ChatMessageHistory, 마지막 사용 시각)
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            history = entry[0] if entry and now - entry[1] <= self.idle_ttl else ChatMessageHistory()
+            self._sessions[session_id] = (history, now)
+            self._evict(now)
+            return history
+
+    def _evict(self, now):
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        # 가장 오래된 항목부터 유휴 시간 초과 여부 확인
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used <= self.idle_ttl:
+                break
+            del self._sessions[session_id]
+
+    def acquire_lease(self, session_id, owner, ttl):
+        """
+        프로세스 내부 저장소이므로 프로세스 간 잠금이 필요 없습니다. (get_session_lock 으로 충분)
+        """
+        return True
+
+    def release_lease(self, session_id, owner):
+        pass
+
+    def __contains__(self, session_id):
+        return session_id in self._sessions
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SQLiteChatMessageHistory(BaseChatMessageHistory):
+    """
+    SQLite 테이블에 저장되는 대화 기록
+    """
+
+    def __init__(self, store, session_id):
+        self.store = store
+        self.session_id = session_id
+
+    @property
+    def messages(self):
+        rows = self.store.execute(
+            "SELECT message FROM messages WHERE session_id = ? ORDER BY id", (self.session_id,)
+        )
+        return messages_from_dict([json.loads(row[0]) for row in rows])
+
+    def add_message(self, message):
+        self.add_messages([message])
+
+    def add_messages(self, messages):
+        """
+        한 턴의 메시지를 한 트랜잭션으로 저장합니다.
+        """
+        now = time.time()
+        self.store.executemany(
+            "INSERT INTO messages (session_id, message, created_at) VALUES (?, ?, ?)",
+            [(self.session_id, json.dumps(message_to_dict(m), ensure_ascii=False), now) for m in messages],
+        )
+
+    def clear(self):
+        self.store.execute("DELETE FROM messages WHERE session_id = ?", (self.session_id,), commit=True)
+
+
+class SQLiteSessionStore:
+    """
+    SQLite(WAL 모드) 세션 저장소. 재시작 후에도 기록이 유지되고 같은 파일을 여러 워커가 공유할 수 있습니다.
+    """
+
+    def __init__(self, path, idle_ttl=None, purge_interval=300):
+        """
+        :param path: (str) SQLite 파일 경로
+        :param idle_ttl: (int) 설정하면 마지막 메시지 이후 이 시간(초)이 지난 세션을 삭제
+        :param purge_interval: (int) 만료 세션 정리 주기(초). get 호출 시 주기가 지났으면 정리합니다.
+        """
+        self.idle_ttl = idle_ttl
+        self.purge_interval = purge_interval
+        self._last_purge = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, "
+            "message TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_session ON messages (session_id, id)")
+        # 워커 간 세션 잠금 (만료 시각이 지난 임대는 다른 워커가 가져갈 수 있음)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS session_leases ("
+            "session_id TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def execute(self, sql, params=(), commit=False):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            if commit:
+                self._conn.commit()
+            return rows
+
+    def executemany(self, sql, rows):
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+
+    def _execute_count(self, sql, params=()):
+        """
+        변경 쿼리를 실행하고 커밋한 뒤 변경된 행 수를 반환합니다.
+        """
+        with self._lock:
+            count = self._conn.execute(sql, params).rowcount
+            self._conn.commit()
+            return count
+
+    def get(self, session_id):
+        if self.idle_ttl and time.monotonic() - self._last_purge >= self.purge_interval:
+            self.purge_expired()
+        return SQLiteChatMessageHistory(self, session_id)
+
+    def purge_expired(self):
+        """
+        마지막 메시지 이후 idle_ttl 이 지난 세션의 메시지를 삭제합니다.
+        :return: (int) 삭제한 메시지 수
+        """
+        self._last_purge = time.monotonic()
+        if not self.idle_ttl:
+            return 0
+        return self._execute_count(
+            "DELETE FROM messages WHERE session_id IN ("
+            "SELECT session_id FROM messages GROUP BY session_id HAVING MAX(created_at) < ?)",
+            (time.time() - self.idle_ttl,),
+        )
+
+    def acquire_lease(self, session_id, owner, ttl):
+        """
+        세션 임대를 얻으면 True 를 반환합니다. (비어 있거나 만료된 임대만 가져감)
+        """
+        now = time.time()
+        return self._execute_count(
+            "INSERT INTO session_leases (session_id, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(session_id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE session_leases.expires_at < ?",
+            (session_id, owner, now + ttl, now),
+        ) > 0
+
+    def release_lease(self, session_id, owner):
+        self._execute_count("DELETE FROM session_leases WHERE session_id = ? AND owner = ?", (session_id, owner))
+
+
+class RedisChatMessageHistory(BaseChatMessageHistory):
+    """
+    Redis 리스트에 저장되는 대화 기록
+    """
+
+    def __init__(self, client, session_id, key_prefix="session:", ttl=None):
+        self.client = client
+        self.key = f"{key_prefix}{session_id}"
+        self.ttl = ttl
+
+    @property
+    def messages(self):
+        items = self.client.lrange(self.key, 0, -1)
+        return messages_from_dict([json.loads(item) for item in items])
+
+    def add_message(self, message):
+        self.add_messages([message])
+
+    def add_messages(self, messages):
+        self.client.rpush(self.key, *[json.dumps(message_to_dict(m), ensure_ascii=False) for m in messages])
+        if self.ttl:
+            self.client.expire(self.key, self.ttl)
+
+    def clear(self):
+        self.client.delete(self.key)
+
+
+# 임대를 가진 워커만 키를 삭제 (compare-and-delete)
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisSessionStore:
+    """
+    Redis 호환 세션 저장소. 클라이언트는 lrange/rpush/expire/delete/set/eval 만 있으면 되므로
+    테스트에서는 로컬 대체 구현을 넘길 수 있습니다.
+    """
+
+    def __init__(self, client, idle_ttl=3600, key_prefix="session:"):
+        self.client = client
+        self.idle_ttl = idle_ttl
+        self.key_prefix = key_prefix
+
+    def get(self, session_id):
+        return RedisChatMessageHistory(self.client, session_id, self.key_prefix, self.idle_ttl)
+
+    def acquire_lease(self, session_id, owner, ttl):
+        """
+        세션 임대를 얻으면 True 를 반환합니다. (SET NX PX, 만료되면 자동 해제)
+        """
+        return bool(self.client.set(f"{self.key_prefix}{session_id}:lease", owner, nx=True, px=int(ttl * 1000)))
+
+    def release_lease(self, session_id, owner):
+        self.client.eval(_RELEASE_SCRIPT, 1, f"{self.key_prefix}{session_id}:lease", owner)
+
+
+def create_session_store():
+    """
+    SESSION_BACKEND 환경 변수에 따라 세션 저장소를 생성합니다.
+    - memory (기본값): SESSION_MAX / SESSION_IDLE_TTL
+    - sqlite: SESSION_DB_PATH (기본값: sessions.db)
+    - redis: REDIS_URL (redis 패키지 필요)
+    """
+    backend = os.getenv("SESSION_BACKEND", "memory").lower()
+    idle_ttl = int(os.getenv("SESSION_IDLE_TTL", "3600"))
+    if backend == "sqlite":
+        return SQLiteSessionStore(os.getenv("SESSION_DB_PATH", "sessions.db"), idle_ttl=idle_ttl)
+    if backend == "redis":
+        import redis
+
+        return RedisSessionStore(redis.Redis.from_url(os.environ["REDIS_URL"]), idle_ttl=idle_ttl)
+    return InMemorySessionStore(max_sessions=int(os.getenv("SESSION_MAX", "10000")), idle_ttl=idle_ttl)
+
+
+# 세션 기록 저장소
+store = None
+
+# 워커 간 세션 임대 유효 시간(초). 한 턴(스트리밍 포함)보다 길어야 하며, 워커가 죽으면 이 시간 뒤 해제됨
+LEASE_TTL = float(os.getenv("SESSION_LEASE_TTL", "300"))
+
+# 세션별 잠금 (사용 중인 세션만 유지)
+_session_locks = weakref.WeakValueDictionary()
+
+
+def get_store():
+    """
+    세션 저장소를 반환합니다. (처음 호출 시 생성)
+    """
+    global store
+    if store is None:
+        store = create_session_store()
+    return store
 
-# 세션 기록 저장 딕셔너리
-store = {}
 
 def get_session_history(session_id):
     """
     세션 ID로 기록 관리
     """
-    if session_id not in store:
-        store[session_id] = ChatMessageHistory()
-    return store[session_id]
+    return get_store().get(session_id)
+
+
+def get_session_lock(session_id):
+    """
+    같은 세션 ID 의 동시 요청이 대화 기록을 섞어 쓰지 않도록 세션별 asyncio.Lock 을 반환합니다.
+    """
+    lock = _session_locks.get(session_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _session_locks[session_id] = lock
+    return lock
+
+
+@asynccontextmanager
+async def session_lock(session_id, poll_interval=0.05, max_poll_interval=1.0):
+    """
+    같은 세션의 턴을 순서대로 실행하도록 잠급니다.
+    1. 프로세스 안에서는 세션별 asyncio.Lock 으로 대기
+    2. sqlite/redis 저장소는 여러 워커가 공유하므로 저장소의 세션 임대를 얻을 때까지 대기 (지수 백오프)
+    """
+    from utils.concurrency import run_blocking
+
+    async with get_session_lock(session_id):
+        session_store = get_store()
+        owner = uuid.uuid4().hex
+        delay = poll_interval
+        while not await run_blocking(session_store.acquire_lease, session_id, owner, LEASE_TTL):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+        try:
+            yield
+        finally:
+            await run_blocking(session_store.release_lease, session_id, owner)
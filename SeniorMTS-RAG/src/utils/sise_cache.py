@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, time as dtime
+from zoneinfo import ZoneInfo
+
+# 한국 증시 기준 시간
+KST = ZoneInfo("Asia/Seoul")
+MARKET_OPEN = dtime(9, 0)
+MARKET_CLOSE = dtime(15, 30)
+
+DATE_FORMAT = "%Y%m%d"
+
+
+def now_kst():
+    """
+    현재 한국 시간을 반환합니다.
+    """
+    return datetime.now(KST)
+
+
+def is_market_open(now=None):
+    """
+    정규장 시간(평일 09:00 ~ 15:30)이면 True 를 반환합니다.
+    """
+    now = now or now_kst()
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() <= MARKET_CLOSE
+
+
+def _to_date(value):
+    return datetime.strptime(value, DATE_FORMAT).date()
+
+
+def _to_str(value):
+    return value.strftime(DATE_FORMAT)
+
+
+def merge_intervals(intervals):
+    """
+    (시작일, 종료일) 구간 목록을 정렬하고 겹치거나 맞닿은 구간을 병합합니다.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and _to_date(start) <= _to_date(merged[-1][1]) + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_intervals(intervals, start, end):
+    """
+    [start, end] 구간 중 intervals 로 덮이지 않은 구간 목록을 반환합니다.
+    """
+    missing = []
+    cursor = _to_date(start)
+    last = _to_date(end)
+    for covered_start, covered_end in intervals:
+        covered_start, covered_end = _to_date(covered_start), _to_date(covered_end)
+        if covered_end < cursor:
+            continue
+        if covered_start > last:
+            break
+        if covered_start > cursor:
+            missing.append((_to_str(cursor), _to_str(covered_start - timedelta(days=1))))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > last:
+            break
+    if cursor <= last:
+        missing.append((_to_str(cursor), _to_str(last)))
+    return missing
+
+
+class _DailySeries:
+    """
+    종목 하나의 일봉 데이터와 캐시된 날짜 구간
+    """
+
+    def __init__(self):
+        self.header = None
+        self.rows = {}          # 날짜(YYYYMMDD) -> 행
+        self.intervals = []     # 확정된(오늘 이전) 날짜 구간
+        self.today = None       # (날짜, 조회 시각) - 오늘 일봉의 조회 시점
+
+    def slice(self, start, end):
+        if self.header is None:
+            return []
+        dates = sorted(date for date in self.rows if start <= date <= end)
+        return [self.header] + [self.rows[date] for date in dates]
+
+
+class SiseCache:
+    """
+    네이버 시세(siseJson) 조회 결과를 위한 LRU + TTL 캐시입니다.
+
+    - 일봉(day)은 종목별로 날짜 구간을 병합해 저장하므로, 30일 조회 후 7일 조회는 메모리에서 처리됩니다.
+    - 오늘 이전의 일봉은 바뀌지 않으므로 만료 없이 보관합니다.
+    - 오늘 일봉은 장중에는 today_ttl, 장 마감 후에는 closed_ttl 동안만 유효합니다.
+    - 주봉/월봉은 (code, start, end, timeframe) 키 단위로 같은 만료 규칙을 적용합니다.
+    """
+
+    def __init__(self, fetch, max_entries=256, today_ttl=30, closed_ttl=600):
+        """
+        :param fetch: (callable) fetch(code, start_time, end_time, time_from) -> [header, *rows]
+        :param max_entries: (int) 보관할 최대 항목 수 (LRU 방식으로 제거)
+        :param today_ttl: (int) 장중 오늘 데이터 유효 시간(초)
+        :param closed_ttl: (int) 장 마감 후 오늘 데이터 유효 시간(초)
+        """
+        self.fetch = fetch
+        self.max_entries = max_entries
+        self.today_ttl = today_ttl
+        self.closed_ttl = closed_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, code, start_time, end_time, time_from='day'):
+        """
+        캐시를 거쳐 시세 데이터를 반환합니다. 반환 형식은 fetch 결과와 같습니다.
+        """
+        if time_from == 'day':
+            return self._get_daily(code, start_time, end_time)
+        return self._get_exact(code, start_time, end_time, time_from)
+
+    def stats(self):
+        """
+        캐시 적중/미스 통계를 반환합니다.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def clear(self):
+        """
+        캐시와 통계를 초기화합니다.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _ttl(self):
+        return self.today_ttl if is_market_open() else self.closed_ttl
+
+    def _touch(self, key, default=None):
+        """
+        LRU 순서를 갱신하고 항목을 반환합니다. 없으면 default 를 등록합니다.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            if default is None:
+                return None
+            entry = self._entries[key] = default
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def _get_exact(self, code, start_time, end_time, time_from):
+        key = (code, start_time, end_time, time_from)
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        data = self.fetch(code, start_time, end_time, time_from)
+
+        # 오늘이 포함된 구간만 만료 시간을 둠
+        today = _to_str(now_kst())
+        expires_at = time.monotonic() + self._ttl() if end_time >= today else None
+        with self._lock:
+            self._entries.pop(key, None)
+            self._touch(key, (data, expires_at))
+        return data
+
+    def _get_daily(self, code, start_time, end_time):
+        key = (code, 'day')
+        now = now_kst()
+        today = _to_str(now)
+        yesterday = _to_str(now - timedelta(days=1))
+
+        with self._lock:
+            series = self._touch(key, _DailySeries())
+            gaps = missing_intervals(series.intervals, start_time, min(end_time, yesterday)) \
+                if start_time <= yesterday else []
+            need_today = end_time >= today and not (
+                series.today is not None
+                and series.today[0] == today
+                and series.today[1] + self._ttl() > time.monotonic()
+            )
+            if not gaps and not need_today:
+                self.hits += 1
+                return series.slice(start_time, end_time)
+            self.misses += 1
+
+        # 비어 있는 구간을 한 번의 요청으로 조회
+        fetch_start = gaps[0][0] if gaps else today
+        fetch_end = end_time if need_today else gaps[-1][1]
+        data = self.fetch(code, start_time=fetch_start, end_time=fetch_end, time_from='day')
+
+        with self._lock:
+            series = self._touch(key, _DailySeries())
+            if fetch_end >= today:
+                series.rows.pop(today, None)
+                series.today = (today, time.monotonic())
+            if data:
+                series.header = series.header or data[0]
+                for row in data[1:]:
+                    series.rows[str(row[0])] = row
+            if fetch_start <= yesterday:
+                series.intervals = merge_intervals(
+                    series.intervals + [(fetch_start, min(fetch_end, yesterday))]
+                )
+            return series.slice(start_time, end_time)
@@ -0,0 +1,165 @@
+import json
+import os
+import struct
+from collections.abc import Mapping
+
+import numpy as np
+
+# 파일 형식: MAGIC(8) + 형식 버전(uint32) + 헤더 길이(uint32) + JSON 헤더 + 정렬 패딩
+#           + 토큰 해시(uint32, 오름차순) + 문서 빈도(float32)
+MAGIC = b"SMTSBM25"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+SPARSE_ENCODER_SUFFIX = ".bm25"
+
+_PREFIX = struct.Struct("<8sII")
+
+
+def _library_version():
+    try:
+        from importlib.metadata import version
+
+        return version("pinecone-text")
+    except Exception:
+        return None
+
+
+class DocFreqTable(Mapping):
+    """
+    BM25 문서 빈도 테이블을 메모리 맵 배열로 조회하는 읽기 전용 dict 입니다.
+
+    BM25Encoder 는 doc_freq.get(token_hash, 1) 로만 조회하므로 dict 대신 사용할 수 있습니다.
+    배열은 파일을 메모리 맵으로 열기 때문에 같은 파일을 여는 uvicorn 워커들이 페이지 캐시를 공유합니다.
+    """
+
+    def __init__(self, indices, values):
+        """
+        :param indices: (np.ndarray) 오름차순 정렬된 토큰 해시 (uint32)
+        :param values: (np.ndarray) 토큰별 문서 빈도 (float32)
+        """
+        self.indices = indices
+        self.values = values
+
+    def _position(self, key):
+        position = int(np.searchsorted(self.indices, key))
+        if position < len(self.indices) and self.indices[position] == key:
+            return position
+        return None
+
+    def __getitem__(self, key):
+        position = self._position(key)
+        if position is None:
+            raise KeyError(key)
+        return float(self.values[position])
+
+    def get(self, key, default=None):
+        position = self._position(key)
+        return default if position is None else float(self.values[position])
+
+    def __contains__(self, key):
+        return self._position(key) is not None
+
+    def __iter__(self):
+        return (int(index) for index in self.indices)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def lookup(self, keys, default=1.0):
+        """
+        여러 토큰 해시의 문서 빈도를 한 번에 조회합니다.
+        """
+        keys = np.asarray(keys, dtype=np.uint32)
+        positions = np.searchsorted(self.indices, keys)
+        positions = np.minimum(positions, len(self.indices) - 1)
+        found = self.indices[positions] == keys
+        return np.where(found, self.values[positions], default)
+
+
+def export_sparse_encoder(sparse_encoder, path):
+    """
+    학습된 BM25Encoder 의 파라미터와 문서 빈도 테이블을 메모리 맵 가능한 파일로 저장합니다.
+    토크나이저(Kiwi)는 저장하지 않으며, 불러올 때 다시 설정합니다.
+    :param sparse_encoder: (BM25Encoder) 학습된 인코더
+    :param path: (str) 저장 경로 (.bm25)
+    :return: (str) 저장 경로
+    """
+    doc_freq = sparse_encoder.doc_freq
+    if doc_freq is None:
+        raise ValueError("BM25 must be fit before export")
+
+    indices = np.fromiter(doc_freq.keys(), dtype=np.uint32, count=len(doc_freq))
+    values = np.fromiter(doc_freq.values(), dtype=np.float32, count=len(doc_freq))
+    order = np.argsort(indices)
+    indices, values = indices[order], values[order]
+
+    header = json.dumps({
+        "avgdl": float(sparse_encoder.avgdl),
+        "n_docs": int(sparse_encoder.n_docs),
+        "b": float(sparse_encoder.b),
+        "k1": float(sparse_encoder.k1),
+        "vocab_size": int(len(indices)),
+        "pinecone_text": _library_version(),
+    }).encode("utf-8")
+    data_offset = -(-(_PREFIX.size + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_offset - _PREFIX.size - len(header)))
+        f.write(indices.tobytes())
+        f.write(values.tobytes())
+    os.replace(tmp_path, path)
+    print(f"[export_sparse_encoder]\nSaved Sparse Encoder to: {path} ({len(indices):,} terms)")
+    return path
+
+
+def read_sparse_encoder(path):
+    """
+    export_sparse_encoder 로 저장한 파일을 읽습니다. 문서 빈도 배열은 복사 없이 메모리 맵으로 엽니다.
+    :param path: (str) .bm25 파일 경로
+    :return: (tuple) (헤더 dict, DocFreqTable)
+    """
+    with open(path, "rb") as f:
+        magic, version, header_size = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' 는 sparse encoder 파일이 아닙니다.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 sparse encoder 형식 버전입니다: {version} (지원: {FORMAT_VERSION})")
+        header = json.loads(f.read(header_size).decode("utf-8"))
+
+    data_offset = -(-(_PREFIX.size + header_size) // ALIGNMENT) * ALIGNMENT
+    size = header["vocab_size"]
+    indices = np.memmap(path, dtype=np.uint32, mode="r", offset=data_offset, shape=(size,))
+    values = np.memmap(path, dtype=np.float32, mode="r", offset=data_offset + 4 * size, shape=(size,))
+    return header, DocFreqTable(indices, values)
+
+
+def load_bm25_encoder(path):
+    """
+    .bm25 파일에서 BM25Encoder 를 복원합니다. (토크나이저는 호출한 쪽에서 설정)
+    BM25Encoder.__init__ 은 영어 토크나이저를 만들기 때문에 생성자를 거치지 않고 속성만 채웁니다.
+    """
+    from pinecone_text.sparse import BM25Encoder
+
+    header, doc_freq = read_sparse_encoder(path)
+    encoder = BM25Encoder.__new__(BM25Encoder)
+    encoder.b = header["b"]
+    encoder.k1 = header["k1"]
+    encoder.avgdl = header["avgdl"]
+    encoder.n_docs = header["n_docs"]
+    encoder.doc_freq = doc_freq
+    encoder._tokenizer = None
+    return encoder
+
+
+if __name__ == "__main__":
+    # 기존 pickle 인코더 변환: python -m utils.sparse_store cyclereports_sparse_encoder.pkl ...
+    import pickle
+    import sys
+
+    for pickle_path in sys.argv[1:]:
+        with open(pickle_path, "rb") as f:
+            encoder = pickle.load(f)
+        export_sparse_encoder(encoder, os.path.splitext(pickle_path)[0] + SPARSE_ENCODER_SUFFIX)
@@ -0,0 +1,107 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# 줄바꿈 앞뒤 공백과 연속 줄바꿈을 줄바꿈 하나로 축소
+_NEWLINE_RUN = re.compile(r" *\n+ *")
+# 두 글자 이상 연속된 공백 문자를 공백 하나로 축소
+_WHITESPACE_RUN = re.compile(r"\s{2,}")
+
+
+def clean_and_filter_text(content):
+    """
+    텍스트를 정리하면서 불필요한 줄바꿈 및 공백을 제거합니다.
+    1. 줄바꿈 앞뒤 공백을 제거하고 연속된 줄바꿈을 하나로 축소.
+    2. 여러 공백을 하나로 축소.
+    3. 텍스트 양 끝 공백 제거.
+    (기존의 '3번 이상 반복되는 줄바꿈 축소' 단계는 1번 결과에 흡수되므로 결과는 같습니다.)
+    """
+    content = _NEWLINE_RUN.sub("\n", content)
+    content = _WHITESPACE_RUN.sub(" ", content)
+    return content.strip()
+
+
+_digit_table = None
+
+
+def _get_digit_table():
+    """
+    기본 다국어 평면(BMP) 코드 포인트별 str.isdigit 결과 테이블을 반환합니다. (처음 호출 시 생성)
+    """
+    global _digit_table
+    if _digit_table is None:
+        _digit_table = np.array([chr(cp).isdigit() for cp in range(0x10000)], dtype=bool)
+    return _digit_table
+
+
+def digit_ratio(content):
+    """
+    전체 문자 중 숫자(str.isdigit) 비율을 계산합니다.
+    문자열을 코드 포인트 배열로 바꿔 테이블 조회 한 번으로 셉니다.
+    """
+    if not content:
+        return 0.0
+    codepoints = np.frombuffer(content.encode("utf-32-le"), dtype=np.uint32)
+    in_bmp = codepoints < 0x10000
+    digits = int(np.count_nonzero(_get_digit_table()[codepoints[in_bmp]]))
+    # BMP 밖의 문자(이모지, 수학 기호 등)는 드물어 개별 확인
+    if not in_bmp.all():
+        digits += sum(chr(cp).isdigit() for cp in codepoints[~in_bmp].tolist())
+    return digits / len(codepoints)
+
+
+def is_alpha_dominant(content, threshold=0.85):
+    """
+    숫자가 아닌 문자가 전체에서 특정 비율(threshold) 이상인 경우 True를 반환합니다.
+
+    Args:
+        content (str): 문서 내용
+        threshold (float): 문자가 차지하는 최소 비율
+
+    Returns:
+        bool: 조건을 만족하면 True, 그렇지 않으면 False (내용이 비어있는 경우 False)
+    """
+    if not content:
+        return False
+    return 1.0 - digit_ratio(content) >= threshold
+
+
+@lru_cache(maxsize=32)
+def compile_phrases(phrases):
+    """
+    문구 목록을 하나의 정규식(긴 문구 우선 alternation)으로 컴파일합니다.
+    :param phrases: (tuple) 찾을 문구
+    """
+    return re.compile("|".join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True)))
+
+
+def contains_any(content, phrases):
+    """
+    content 에 phrases 중 하나라도 포함되어 있는지 한 번의 스캔으로 확인합니다.
+    """
+    if not phrases:
+        return False
+    return compile_phrases(tuple(phrases)).search(content) is not None
+
+
+def filter_chunk(doc, min_length=200, excluded_words=(), min_alpha_ratio=None, replace_content=True):
+    """
+    청크 텍스트를 한 번만 정리한 뒤 필터링 조건을 적용합니다.
+    (PDF 파이프라인 워커에서 청크마다 한 번 호출되므로 functools.partial 로 설정을 묶어 전달)
+    1. 줄바꿈을 제외한 정리된 텍스트 길이가 min_length 이상
+    2. excluded_words 중 어떤 문구도 포함하지 않음
+    3. min_alpha_ratio 가 지정되면 숫자가 아닌 문자 비율이 그 이상
+    :param replace_content: (bool) True 이면 정리된 텍스트로 청크 내용을 교체
+    :return: (Document) 조건을 통과한 청크 또는 None
+    """
+    content = clean_and_filter_text(doc.page_content)
+    if len(content) - content.count("\n") < min_length:
+        return None
+    if contains_any(content, excluded_words):
+        return None
+    if min_alpha_ratio is not None and not is_alpha_dominant(content, threshold=min_alpha_ratio):
+        return None
+    if replace_content:
+        doc.page_content = content
+    return doc
@@ -0,0 +1,362 @@
+import csv
+import os
+import re
+from collections import deque
+
+from utils.config import DATA_DIR
+
+# KRX 종목 목록 (종목 코드, 종목명, 시장, 시가총액(억원) - 시가총액 순, ETF/ETN 제외)
+# python -m utils.tickers 로 KRX 전종목 시세에서 KOSPI/KOSDAQ 전체를 다시 생성합니다.
+# (현재 파일은 KOSPI 전체 + 주요 KOSDAQ 종목만 포함하므로 배포 전에 한 번 갱신해야 합니다.)
+TICKER_CSV = DATA_DIR / "krx_tickers.csv"
+# 별칭, 영문명, 자주 쓰는 줄임말
+ALIAS_CSV = DATA_DIR / "krx_ticker_aliases.csv"
+
+# KRX 단축 코드: 숫자 5자리 + 숫자 또는 영문 1자리 (신형 우선주는 '00680K' 처럼 영문으로 끝남)
+STOCK_CODE = re.compile(r"\d{5}[0-9A-Z]")
+
+_IGNORED = re.compile(r"[\s\-\.·&']")
+# 음성 인식 결과에서 종목명 뒤에 붙는 조사 등
+_SUFFIXES = ("으로", "에서", "하고", "이랑", "주가", "랑", "은", "는", "이", "가", "을", "를", "의", "도", "요")
+# 종목명 바로 뒤에 붙어도 다른 종목명의 일부가 아닌 말 (조사 + 자주 붙여 말하는 단어)
+_BOUNDARY_SUFFIXES = _SUFFIXES + (
+    "와", "과", "에", "로", "만", "까지", "부터", "보다", "처럼", "한테",
+    "주식", "시세", "종가", "현재가", "목표가", "전망", "실적", "뉴스", "배당",
+)
+
+
+def normalize(text):
+    """
+    매칭용으로 소문자 변환 후 공백과 일부 기호를 제거합니다.
+    """
+    return _IGNORED.sub("", text.lower())
+
+
+# 시장 지수 이름 (종목이 아니므로 단순 주가 응답 대상에서 제외)
+INDEX_WORDS = (
+    "코스피", "코스닥", "코넥스", "kospi", "kosdaq", "krx", "나스닥", "nasdaq", "다우존스", "다우지수", "s&p", "에스앤피",
+    "니케이", "항셍", "상해종합", "지수",
+)
+_INDEX_KEYS = tuple(normalize(word) for word in INDEX_WORDS)
+# 퍼지 매칭하면 종목명으로 잘못 보정되는 일상어 ('아파트' -> '파트론', '코스피' -> '코아스')
+_FUZZY_DENYLIST = frozenset(normalize(word) for word in INDEX_WORDS + (
+    "아파트", "부동산", "집값", "전세", "월세", "금리", "환율", "달러", "엔화", "유로", "위안",
+    "유가", "금값", "은값", "비트코인", "코인", "가상화폐", "채권", "국채", "펀드", "증시", "주식",
+    "시장", "오늘", "내일", "어제", "요즘", "지금", "가격", "시세", "종가", "얼마야", "얼마예요",
+))
+
+
+def mentions_market_index(text):
+    """
+    문장에 시장 지수 이름('코스피', '코스닥 지수' 등)이 있으면 True 를 반환합니다.
+    """
+    normalized = normalize(text)
+    return any(word in normalized for word in _INDEX_KEYS)
+
+
+def _normalize_with_offsets(text):
+    """
+    normalize 결과와 결과의 각 글자가 원문에서 차지하는 위치를 함께 반환합니다.
+    """
+    chars = []
+    offsets = []
+    for i, char in enumerate(text):
+        if _IGNORED.match(char):
+            continue
+        for lowered in char.lower():
+            chars.append(lowered)
+            offsets.append(i)
+    return "".join(chars), offsets
+
+
+def _is_hangul(char):
+    return "\uac00" <= char <= "\ud7a3" or "\u3131" <= char <= "\u318e"
+
+
+def _is_word_boundary(text, match_end):
+    """
+    원문 text 의 match_end 위치에서 종목명이 끝날 수 있으면 True 를 반환합니다.
+    - 한글이 이어지면 조사/접미어(_BOUNDARY_SUFFIXES)인 경우만 허용 ('셀트리온제약' 의 '셀트리온' 제외)
+    - 영문/숫자로 끝난 이름 뒤에 영문/숫자가 이어지면 제외 ('005930' 이 '0059301' 에 매칭되지 않도록)
+    """
+    if match_end >= len(text):
+        return True
+    last, following = text[match_end - 1], text[match_end]
+    if _is_hangul(following):
+        return text.startswith(_BOUNDARY_SUFFIXES, match_end)
+    return not (last.isascii() and last.isalnum() and following.isascii() and following.isalnum())
+
+
+class AhoCorasick:
+    """
+    여러 키워드를 한 번의 순회로 찾는 Aho-Corasick 자동자
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]   # 상태별 (키 길이, 값) 리스트
+
+    def add(self, key, value):
+        state = 0
+        for char in key:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(key), value))
+
+    def build(self):
+        """
+        실패 링크를 구성합니다. 키워드를 모두 추가한 뒤 한 번 호출합니다.
+        """
+        # 루트의 자식 상태는 실패 시 루트로 돌아감
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter(self, text):
+        """
+        텍스트에서 찾은 (시작 위치, 끝 위치, 값) 을 반환합니다.
+        """
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._output[state]:
+                yield end - length, end, value
+
+
+def _deletions(key):
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+def _one_edit(token, key):
+    """
+    token 이 key 와 한 글자 차이면 오류 종류('substitution', 'insertion', 'deletion')를, 아니면 None 을 반환합니다.
+    """
+    if len(token) == len(key):
+        diff = [i for i, (a, b) in enumerate(zip(token, key)) if a != b]
+        return "substitution" if len(diff) == 1 else None
+    if len(token) == len(key) + 1 and key in _deletions(token):
+        return "insertion"
+    if len(token) + 1 == len(key) and token in _deletions(key):
+        return "deletion"
+    return None
+
+
+def _fuzzy_allowed(key, edit):
+    """
+    이름 길이에 따라 허용하는 오류를 제한합니다. 짧은 이름일수록 한 글자 차이로 다른 말과 겹치기 쉽습니다.
+    - 3글자 이하: 퍼지 매칭하지 않음
+    - 4글자: 같은 자리의 한 글자 치환만 허용 ('삼송전자')
+    - 5글자 이상: 한 글자 삽입/삭제/치환 허용
+    """
+    if len(key) <= 3:
+        return False
+    if len(key) == 4:
+        return edit == "substitution"
+    return edit is not None
+
+
+class TickerResolver:
+    """
+    문장에서 언급된 종목을 찾는 종목 사전입니다.
+
+    종목명, 별칭, 영문명, 종목 코드를 하나의 Aho-Corasick 자동자로 묶어 문장을 한 번만 훑고,
+    정확히 일치하는 종목이 없으면 한 글자 오류(삽입/삭제/치환)까지 허용하는 퍼지 매칭으로
+    음성 인식 오류('삼송전자' 등)를 보정합니다. 지수 이름과 일상어는 퍼지 매칭하지 않고,
+    짧은 이름은 더 엄격하게 비교합니다. (_fuzzy_allowed)
+    """
+
+    def __init__(self, ticker_path=TICKER_CSV, alias_path=ALIAS_CSV):
+        self.names = {}   # 종목 코드 -> 종목명
+        self.rank = {}    # 종목 코드 -> 시가총액 순위 (모호할 때 우선순위)
+        keys = []
+        with open(ticker_path, "r", encoding="utf-8") as f:
+            for rank, row in enumerate(csv.DictReader(f)):
+                self.names[row["code"]] = row["name"]
+                self.rank[row["code"]] = rank
+                keys.append((row["name"], row["code"]))
+                keys.append((row["code"], row["code"]))
+        self.aliases = {}  # 종목 코드 -> 별칭 리스트
+        if alias_path is not None and alias_path.exists():
+            with open(alias_path, "r", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    if row["code"] in self.names:
+                        keys.append((row["alias"], row["code"]))
+                        self.aliases.setdefault(row["code"], []).append(row["alias"])
+
+        self._automaton = AhoCorasick()
+        self._keys = set()  # 정규화된 이름/별칭/코드
+        self._fuzzy = {}    # 삭제 변형 -> (정규화된 이름, 종목 코드) 집합
+        for key, code in keys:
+            key = normalize(key)
+            self._keys.add(key)
+            self._automaton.add(key, code)
+            if len(key) >= 4 and not key.isdigit():
+                for variant in _deletions(key) | {key}:
+                    self._fuzzy.setdefault(variant, set()).add((key, code))
+        self._automaton.build()
+
+    def find(self, text):
+        """
+        문장에 언급된 종목을 등장 순서대로 반환합니다. (겹치는 경우 가장 긴 이름 우선)
+        이름 뒤에 조사가 아닌 한글이 이어지면 다른 종목명의 일부로 보고 제외합니다.
+        :return: (list) (종목 코드, 종목명, 퍼지 매칭 여부) 리스트
+        """
+        normalized, offsets = _normalize_with_offsets(text)
+        matches = sorted(self._automaton.iter(normalized), key=lambda m: (m[0], m[0] - m[1]))
+        found = []
+        covered_until = 0
+        for start, end, code in matches:
+            if start < covered_until or not _is_word_boundary(text, offsets[end - 1] + 1):
+                continue
+            covered_until = end
+            if code not in found:
+                found.append(code)
+        if found:
+            return [(code, self.names[code], False) for code in found]
+        return [(code, self.names[code], True) for code in self._find_fuzzy(text)]
+
+    def _find_fuzzy(self, text):
+        found = []
+        for token in text.split():
+            token = normalize(token)
+            for suffix in _SUFFIXES:
+                if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+                    token = token[:-len(suffix)]
+                    break
+            if len(token) < 4 or any(word in token for word in _FUZZY_DENYLIST):
+                continue
+            candidates = set()
+            for variant in _deletions(token) | {token}:
+                # 이름 뒤에 한 글자가 붙은 토큰은 find 의 경계 검사에서 이미 제외된 것 ('카카오톡' 의 '카카오')
+                if variant != token and token.startswith(variant) and variant in self._keys:
+                    continue
+                # 삭제 변형이 겹쳐도 두 글자 차이일 수 있으므로 실제 오류 종류를 확인
+                candidates |= {
+                    code for key, code in self._fuzzy.get(variant, ())
+                    if _fuzzy_allowed(key, _one_edit(token, key))
+                }
+            if candidates:
+                best = min(candidates, key=self.rank.get)
+                if best not in found:
+                    found.append(best)
+        return found
+
+    def resolve(self, text):
+        """
+        문장 또는 종목명에서 가장 먼저 언급된 종목 코드를 반환합니다. 없으면 None.
+        """
+        found = self.find(text)
+        return found[0][0] if found else None
+
+    def keywords(self, text):
+        """
+        입력(종목명, 별칭, 코드)과 해당 종목의 정식 이름, 별칭을 모두 반환합니다.
+        뉴스 keyword 메타데이터가 '네이버'처럼 별칭으로 저장된 경우에도 필터가 맞도록 사용합니다.
+        :return: (list) 중복 없는 키워드 리스트 (종목을 찾지 못하면 입력만 반환)
+        """
+        code = self.resolve(text)
+        if code is None:
+            return [text]
+        return list(dict.fromkeys([text, self.names[code], *self.aliases.get(code, [])]))
+
+
+_resolver = None
+
+
+def get_ticker_resolver():
+    """
+    종목 사전을 반환합니다. (처음 호출 시 로드)
+    """
+    global _resolver
+    if _resolver is None:
+        _resolver = TickerResolver()
+    return _resolver
+
+
+# KRX 정보데이터시스템 전종목 시세 (ETF/ETN 을 제외한 주식만 반환)
+KRX_LISTING_URL = "http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd"
+KRX_MARKETS = {"STK": "KOSPI", "KSQ": "KOSDAQ"}
+
+
+def fetch_krx_listing(trade_date):
+    """
+    KRX 전종목 시세에서 KOSPI/KOSDAQ 상장 종목을 가져옵니다.
+    :param trade_date: (str) 기준 거래일 (YYYYMMDD)
+    :return: (list) 시가총액 순 {"code", "name", "market", "market_cap"(억원)} 리스트
+    """
+    import requests
+
+    rows = []
+    for market_id, market in KRX_MARKETS.items():
+        response = requests.post(
+            KRX_LISTING_URL,
+            data={
+                "bld": "dbms/MDC/STAT/standard/MDCSTAT01501",
+                "mktId": market_id,
+                "trdDd": trade_date,
+                "share": "1",
+                "money": "1",
+                "csvxls_isNo": "false",
+            },
+            headers={
+                "User-Agent": "Mozilla/5.0",
+                "Referer": "http://data.krx.co.kr/contents/MDC/MDI/mdiLoader/index.cmd",
+            },
+            timeout=(3.05, 30),
+        )
+        response.raise_for_status()
+        for item in response.json()["OutBlock_1"]:
+            rows.append({
+                "code": item["ISU_SRT_CD"],
+                "name": item["ISU_ABBRV"],
+                "market": market,
+                "market_cap": int(item["MKTCAP"].replace(",", "")) // 10 ** 8,
+            })
+    if not rows:
+        raise ValueError(f"{trade_date} 의 상장 종목을 가져오지 못했습니다. (휴장일이면 다른 거래일 지정)")
+    return sorted(rows, key=lambda row: -row["market_cap"])
+
+
+def write_listing(rows, path=TICKER_CSV):
+    """
+    종목 목록을 검증한 뒤 CSV 로 저장합니다. (코드 형식과 중복 확인, 임시 파일 작성 후 교체)
+    """
+    codes = [row["code"] for row in rows]
+    invalid = [code for code in codes if not STOCK_CODE.fullmatch(code)]
+    if invalid:
+        raise ValueError(f"잘못된 종목 코드: {invalid[:10]}")
+    if len(set(codes)) != len(codes):
+        raise ValueError("중복된 종목 코드가 있습니다.")
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["code", "name", "market", "market_cap"], lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, path)
+    print(f"Saved {len(rows)} tickers to: {path}")
+
+
+if __name__ == "__main__":
+    # 종목 목록 갱신: python -m utils.tickers [기준 거래일 YYYYMMDD]
+    import sys
+    from datetime import datetime, timedelta
+
+    trade_date = sys.argv[1] if len(sys.argv) > 1 else (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
+    write_listing(fetch_krx_listing(trade_date))
@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+
+class TokenBucket:
+    """
+    초당 rate 개의 토큰이 채워지는 토큰 버킷 속도 제한기
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        :param rate: (float) 초당 허용 요청 수
+        :param capacity: (float) 한 번에 몰아서 쓸 수 있는 최대 토큰 수 (기본값: rate, 최소 1)
+        """
+        if rate <= 0:
+            raise ValueError(f"rate 는 0보다 커야 합니다: {rate}")
+        self.rate = rate
+        # acquire() 는 한 번에 토큰 1개가 필요하므로 용량이 1 미만이면 영원히 대기함 (rate=0.5 등)
+        self.capacity = max(capacity or rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        토큰을 얻을 때까지 대기합니다.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait_seconds = (tokens - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+def rate_limiter_from_env(env_name):
+    """
+    환경 변수에 초당 요청 수가 지정되어 있으면 TokenBucket 을 생성합니다. (없거나 0 이면 제한 없음)
+    """
+    value = os.getenv(env_name, "0")
+    try:
+        rate = float(value)
+    except ValueError:
+        raise ValueError(f"{env_name} 는 초당 요청 수(숫자)여야 합니다: {value!r}") from None
+    if rate < 0 or rate != rate or rate == float("inf"):
+        raise ValueError(f"{env_name} 는 0 이상의 유한한 값이어야 합니다: {value!r}")
+    return TokenBucket(rate) if rate > 0 else None
+
+
+def _acquire(limiter):
+    if limiter is not None:
+        limiter.acquire()
+
+
+def iter_batches(items, batch_size):
+    """
+    반복 가능한 객체를 batch_size 크기의 리스트로 나눠 순서대로 반환합니다.
+    """
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def stream_upsert(index, namespace, records, sparse_encoder, embedder, batch_size=64, max_workers=8,
+                  max_pending=None, embed_limiter=None, index_limiter=None, retries=3, on_batch_done=None):
+    """
+    (id, content, metadata) 레코드를 배치 단위로 임베딩하고 업로드합니다.
+
+    - records 는 제너레이터로 받아 필요한 만큼만 읽습니다.
+    - 진행 중인 배치 수를 max_pending 으로 제한하여(backpressure) 메모리 사용량이 코퍼스 크기와 무관하게 유지됩니다.
+    - embed_limiter / index_limiter(TokenBucket)로 임베딩 API 와 인덱스 API 호출 속도를 제한합니다.
+    - 배치가 끝날 때마다 on_batch_done(ids) 을 호출하므로 진행 상황을 체크포인트로 남길 수 있습니다.
+
+    :return: (int) 업로드한 벡터 수
+    """
+    max_pending = max_pending or max_workers * 2
+
+    def upsert_batch(batch):
+        ids = [record[0] for record in batch]
+        contents = [record[1] for record in batch]
+        for attempt in range(retries + 1):
+            try:
+                _acquire(embed_limiter)
+                dense_embeds = embedder.embed_documents(contents)
+                sparse_embeds = sparse_encoder.encode_documents(contents)
+                vectors = [
+                    {
+                        "id": _id,
+                        "values": dense,
+                        "sparse_values": sparse,
+                        "metadata": {"context": content, **metadata},
+                    }
+                    for (_id, content, metadata), dense, sparse in zip(batch, dense_embeds, sparse_embeds)
+                ]
+                _acquire(index_limiter)
+                index.upsert(vectors=vectors, namespace=namespace)
+                return ids
+            except Exception:
+                if attempt == retries:
+                    raise
+                time.sleep(2 ** attempt)
+
+    upserted = 0
+    errors = []
+    pending = deque()
+
+    def drain(block):
+        nonlocal upserted
+        if not pending:
+            return
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED, timeout=None if block else 0)
+        for future in done:
+            pending.remove(future)
+            try:
+                ids = future.result()
+            except Exception as e:
+                errors.append(e)
+                continue
+            upserted += len(ids)
+            if on_batch_done is not None:
+                on_batch_done(ids)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch in iter_batches(records, batch_size):
+            while len(pending) >= max_pending:
+                drain(block=True)
+            pending.append(executor.submit(upsert_batch, batch))
+            drain(block=False)
+        while pending:
+            drain(block=True)
+
+    if errors:
+        raise RuntimeError(f"{len(errors)}개 배치 업로드 실패 (완료된 배치는 체크포인트에 기록됨): {errors[0]}")
+    return upserted